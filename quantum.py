@@ -8,16 +8,36 @@ using quantum-inspired algorithms and feature maps.
 import hashlib
 import json
 import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 # Supported hash algorithms for fingerprinting
 SUPPORTED_ALGORITHMS = frozenset(["sha256", "sha384", "sha512", "sha3_256", "sha3_512"])
 
+# Prebound constructors: hashlib.sha256(...) skips the name lookup of hashlib.new
+_HASH_CONSTRUCTORS = {name: getattr(hashlib, name) for name in SUPPORTED_ALGORITHMS}
+
+# Reusable canonical encoders, identical to json.dumps(sort_keys=True[, default=str])
+# without building a new JSONEncoder per call
+_encode_canonical = json.JSONEncoder(sort_keys=True).encode
+_encode_canonical_str_default = json.JSONEncoder(sort_keys=True, default=str).encode
+
+# hashlib releases the GIL only for buffers of at least this many bytes
+HASH_GIL_RELEASE_BYTES = 2048
+
 __all__ = [
     "QuantumFeatureMap",
+    "QuantumKNNClassifier",
     "ThreatFingerprint",
     "compute_fingerprint",
+    "fingerprint_many",
     "encode_features",
     "evaluate_navigation_sequence",
     "manifold_projection",
@@ -25,6 +45,7 @@ __all__ = [
     "recursive_navigation_evaluation",
     "sequence_embedding",
     "quantum_kernel_estimation",
+    "quantum_kernel_matrix",
     "get_ibm_backend",
     "execute_quantum_kernel_ibm",
     "ctc_fixed_point_oracle",
@@ -120,11 +141,7 @@ class ThreatFingerprint:
         Raises:
             ValueError: If an unsupported algorithm is specified.
         """
-        if algorithm not in SUPPORTED_ALGORITHMS:
-            raise ValueError(
-                f"Unsupported algorithm '{algorithm}'. "
-                f"Use one of: {', '.join(sorted(SUPPORTED_ALGORITHMS))}"
-            )
+        self._hash = _hash_constructor(algorithm)
         self.algorithm = algorithm
     
     def compute_post_fingerprint(self, features: Dict[str, Any]) -> str:
@@ -137,9 +154,29 @@ class ThreatFingerprint:
         Returns:
             Hexadecimal fingerprint string
         """
-        normalized = self._normalize_features(features)
-        data = json.dumps(normalized, sort_keys=True).encode()
-        return hashlib.new(self.algorithm, data).hexdigest()
+        return self._hash(self._post_payload(features)).hexdigest()
+
+    def compute_post_fingerprints(
+        self,
+        features_list: Iterable[Dict[str, Any]],
+        max_workers: Optional[int] = None
+    ) -> List[str]:
+        """
+        Compute post fingerprints for many posts.
+
+        Args:
+            features_list: Feature dictionaries, one per post
+            max_workers: Threads used to hash payloads large enough for
+                hashlib to release the GIL (None or 1 hashes inline)
+
+        Returns:
+            Hexadecimal fingerprints in input order
+        """
+        payloads = [self._post_payload(features) for features in features_list]
+        return _hash_payloads(payloads, self._hash, max_workers)
+
+    def _post_payload(self, features: Dict[str, Any]) -> bytes:
+        return _encode_canonical(self._normalize_features(features)).encode()
     
     def compute_account_fingerprint(
         self, 
@@ -158,7 +195,7 @@ class ThreatFingerprint:
         """
         recent = post_fingerprints[-window_size:]
         combined = "".join(sorted(recent))
-        return hashlib.new(self.algorithm, combined.encode()).hexdigest()
+        return self._hash(combined.encode()).hexdigest()
     
     def compute_domain_fingerprint(
         self,
@@ -189,13 +226,12 @@ class ThreatFingerprint:
             weighted.append(f"{fp}:{w:.4f}")
         
         combined = "|".join(weighted)
-        return hashlib.new(self.algorithm, combined.encode()).hexdigest()
+        return self._hash(combined.encode()).hexdigest()
     
     def _normalize_features(self, features: Dict[str, Any]) -> Dict[str, Any]:
-        """Normalize features for consistent hashing."""
+        """Normalize features for consistent hashing (key order is left to the encoder)."""
         result = {}
-        for key in sorted(features.keys()):
-            value = features[key]
+        for key, value in features.items():
             if isinstance(value, float):
                 result[key] = round(value, 6)
             elif isinstance(value, (list, tuple)):
@@ -223,18 +259,63 @@ def compute_fingerprint(data: Any, algorithm: str = "sha256") -> str:
     Raises:
         ValueError: If an unsupported algorithm is specified.
     """
-    if algorithm not in SUPPORTED_ALGORITHMS:
+    return _hash_constructor(algorithm)(_fingerprint_payload(data)).hexdigest()
+
+
+def fingerprint_many(
+    items: Iterable[Any],
+    algorithm: str = "sha256",
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Compute ``compute_fingerprint`` for many items.
+
+    Payloads are serialised in the calling thread; hashing of payloads of
+    ``HASH_GIL_RELEASE_BYTES`` or more is spread over a thread pool when
+    ``max_workers`` > 1, since hashlib releases the GIL for those.
+
+    Args:
+        items: Data to fingerprint
+        algorithm: Hash algorithm to use
+        max_workers: Hashing threads (None or 1 hashes inline)
+
+    Returns:
+        Hexadecimal fingerprints in input order
+    """
+    constructor = _hash_constructor(algorithm)
+    return _hash_payloads([_fingerprint_payload(item) for item in items], constructor, max_workers)
+
+
+def _hash_constructor(algorithm: str):
+    try:
+        return _HASH_CONSTRUCTORS[algorithm]
+    except KeyError:
         raise ValueError(
             f"Unsupported algorithm '{algorithm}'. "
             f"Use one of: {', '.join(sorted(SUPPORTED_ALGORITHMS))}"
-        )
-    
+        ) from None
+
+
+def _fingerprint_payload(data: Any) -> bytes:
     if isinstance(data, (dict, list)):
-        serialized = json.dumps(data, sort_keys=True, default=str)
-    else:
-        serialized = str(data)
-    
-    return hashlib.new(algorithm, serialized.encode()).hexdigest()
+        return _encode_canonical_str_default(data).encode()
+    return str(data).encode()
+
+
+def _hash_payloads(payloads: List[bytes], constructor, max_workers: Optional[int]) -> List[str]:
+    digests: List[Optional[str]] = [None] * len(payloads)
+    large = []
+    for index, payload in enumerate(payloads):
+        if max_workers and max_workers > 1 and len(payload) >= HASH_GIL_RELEASE_BYTES:
+            large.append(index)
+        else:
+            digests[index] = constructor(payload).hexdigest()
+    if large:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            hashed = pool.map(lambda index: constructor(payloads[index]).hexdigest(), large)
+            for index, digest in zip(large, hashed):
+                digests[index] = digest
+    return digests
 
 
 def encode_features(
@@ -318,6 +399,270 @@ def quantum_kernel_estimation(
     )
 
 
+def _feature_half_angles(X: Any, feature_dimension: int, reps: int) -> "np.ndarray":
+    """
+    Half rotation angles applied by ``QuantumFeatureMap`` to each row of ``X``.
+
+    Qubit ``i`` picks up a phase of ``pi * (rep + 1) * x_i`` per repetition,
+    so its total angle is ``pi * reps * (reps + 1) / 2 * x_i``. Rows are padded
+    with zeros and truncated to the simulated qubits exactly as ``encode`` does.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    num_qubits = min(feature_dimension, QuantumFeatureMap.MAX_SIMULATION_QUBITS)
+    angles = np.zeros((X.shape[0], num_qubits))
+    width = min(num_qubits, X.shape[1])
+    angles[:, :width] = X[:, :width]
+    return angles * (math.pi * reps * (reps + 1) / 4)
+
+
+# Qubits folded into one tensor-product block (2^5 = 32 columns per block)
+KERNEL_QUBITS_PER_BLOCK = 5
+
+
+def _feature_tensors(X: Any, feature_dimension: int, reps: int) -> Tuple["np.ndarray", ...]:
+    """
+    Real tensor-product features whose dot products rebuild the kernel.
+
+    The fidelity factorises over qubits as prod cos(h_a - h_b)^2, and each
+    cos(h_a - h_b) = cos h_a cos h_b + sin h_a sin h_b is the dot product of
+    (cos h, sin h) pairs. Kronecker products of those pairs over a group of
+    qubits turn a whole group into one matrix product, so kernels are
+    evaluated with BLAS instead of per-qubit elementwise passes.
+    """
+    half = _feature_half_angles(X, feature_dimension, reps)
+    cos_h, sin_h = np.cos(half), np.sin(half)
+    tensors = []
+    # At least one block, so a zero-qubit map still yields a kernel of ones
+    for first in range(0, max(1, half.shape[1]), KERNEL_QUBITS_PER_BLOCK):
+        block = np.ones((half.shape[0], 1))
+        for qubit in range(first, min(first + KERNEL_QUBITS_PER_BLOCK, half.shape[1])):
+            block = np.concatenate(
+                (block * cos_h[:, qubit:qubit + 1], block * sin_h[:, qubit:qubit + 1]),
+                axis=1,
+            )
+        tensors.append(block)
+    return tuple(tensors)
+
+
+def _kernel_block(a: Tuple["np.ndarray", ...], b: Tuple["np.ndarray", ...]) -> "np.ndarray":
+    """Fidelities between two sets of encoded states given their tensor features."""
+    kernel = a[0] @ b[0].T
+    for a_block, b_block in zip(a[1:], b[1:]):
+        kernel *= a_block @ b_block.T
+    kernel *= kernel
+    return kernel
+
+
+def quantum_kernel_matrix(
+    X1: Sequence[Sequence[float]],
+    X2: Sequence[Sequence[float]],
+    feature_dimension: int = 10,
+    reps: int = 2
+) -> "np.ndarray":
+    """
+    Compute the quantum kernel between every row of ``X1`` and ``X2``.
+
+    Matches ``quantum_kernel_estimation`` element-wise, but evaluates the
+    fidelity in closed form instead of building 2^n amplitude vectors.
+
+    Args:
+        X1: First set of feature vectors
+        X2: Second set of feature vectors
+        feature_dimension: Dimension of the feature map
+        reps: Number of feature map repetitions
+
+    Returns:
+        Array of shape (len(X1), len(X2)) with kernel values between 0 and 1
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("quantum_kernel_matrix requires numpy")
+    return _kernel_block(
+        _feature_tensors(X1, feature_dimension, reps),
+        _feature_tensors(X2, feature_dimension, reps),
+    )
+
+
+# Training features and k shared with process-pool workers by the initializer
+_knn_worker_state: Dict[str, Any] = {}
+
+
+def _knn_worker_init(train: Tuple["np.ndarray", ...], k: int) -> None:
+    _knn_worker_state.update(train=train, k=k)
+
+
+def _knn_worker_block(query: Tuple["np.ndarray", ...]) -> Tuple["np.ndarray", "np.ndarray"]:
+    return _top_k_block(query, _knn_worker_state["train"], _knn_worker_state["k"])
+
+
+def _top_k_block(
+    query: Tuple["np.ndarray", ...],
+    train: Tuple["np.ndarray", ...],
+    k: int,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Indices and kernels of the ``k`` most similar training rows, best first."""
+    kernel = _kernel_block(query, train)
+    if k < kernel.shape[1]:
+        # O(n) selection of the k largest instead of sorting every similarity
+        indices = np.argpartition(kernel, kernel.shape[1] - k, axis=1)[:, -k:]
+    else:
+        indices = np.broadcast_to(np.arange(kernel.shape[1]), kernel.shape)
+    values = np.take_along_axis(kernel, indices, axis=1)
+    # Order the k winners by similarity, breaking ties by training position
+    order = np.lexsort((indices, -values), axis=1)
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+class QuantumKNNClassifier:
+    """
+    k-nearest-neighbour classifier in the quantum kernel feature space.
+
+    Training rows are encoded once in ``fit``; prediction scores test rows
+    against the whole training set in blocks sized to ``block_elements``
+    kernel entries, keeps the top ``k`` per row with ``argpartition`` and
+    votes. With ``n_jobs > 1`` the test blocks are spread over a process pool.
+
+    Requires numpy.
+    """
+
+    # Kernel entries evaluated per block (~32 MB of float64 per buffer)
+    DEFAULT_BLOCK_ELEMENTS = 1 << 22
+
+    def __init__(
+        self,
+        k_neighbors: int = 3,
+        feature_dimension: int = 10,
+        reps: int = 2,
+        block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+        n_jobs: int = 1,
+    ):
+        """
+        Initialize the classifier.
+
+        Args:
+            k_neighbors: Number of neighbors that vote on each prediction
+            feature_dimension: Dimension of the feature map
+            reps: Number of feature map repetitions
+            block_elements: Test-by-train kernel entries computed per block
+            n_jobs: Worker processes used for prediction (1 = in-process)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("QuantumKNNClassifier requires numpy")
+        if k_neighbors < 1:
+            raise ValueError("k_neighbors must be at least 1")
+        self.k_neighbors = k_neighbors
+        self.feature_dimension = feature_dimension
+        self.reps = reps
+        self.block_elements = block_elements
+        self.n_jobs = n_jobs
+        self.classes_: Optional["np.ndarray"] = None
+        self._train: Tuple["np.ndarray", ...] = ()
+        self._train_labels: Optional["np.ndarray"] = None
+
+    def fit(self, X: Sequence[Sequence[float]], y: Sequence[int]) -> "QuantumKNNClassifier":
+        """
+        Encode the training set.
+
+        Args:
+            X: Training features
+            y: Training labels
+
+        Returns:
+            The fitted classifier
+        """
+        labels = np.asarray(y)
+        if len(labels) == 0:
+            raise ValueError("Cannot fit on an empty training set")
+        if len(X) != len(labels):
+            raise ValueError(f"Length mismatch: {len(X)} samples but {len(labels)} labels")
+        self.classes_, self._train_labels = np.unique(labels, return_inverse=True)
+        self._train = _feature_tensors(X, self.feature_dimension, self.reps)
+        return self
+
+    @property
+    def n_train(self) -> int:
+        return 0 if self._train_labels is None else len(self._train_labels)
+
+    def _blocks(self, X: Sequence[Sequence[float]]):
+        query = _feature_tensors(X, self.feature_dimension, self.reps)
+        rows = max(1, self.block_elements // max(1, self.n_train))
+        for start in range(0, len(X), rows):
+            yield tuple(block[start:start + rows] for block in query)
+
+    def worker_pool(self) -> ProcessPoolExecutor:
+        """
+        Process pool whose workers hold this classifier's training set.
+
+        Pass it to ``kneighbors`` to reuse one pool across many calls; the
+        caller shuts it down, and must open a new one after refitting.
+        """
+        if self._train_labels is None:
+            raise RuntimeError("QuantumKNNClassifier is not fitted")
+        return ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            initializer=_knn_worker_init,
+            initargs=(self._train, min(self.k_neighbors, self.n_train)),
+        )
+
+    def kneighbors(
+        self,
+        X: Sequence[Sequence[float]],
+        pool: Optional[ProcessPoolExecutor] = None,
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Find the most similar training rows for each test row.
+
+        Args:
+            X: Test features
+            pool: Pool from ``worker_pool`` (one is opened per call when
+                omitted and ``n_jobs > 1``)
+
+        Returns:
+            Tuple of (indices, kernels), each of shape (len(X), k), best first
+        """
+        if self._train_labels is None:
+            raise RuntimeError("QuantumKNNClassifier is not fitted")
+        k = min(self.k_neighbors, self.n_train)
+        if len(X) == 0:
+            return np.empty((0, k), dtype=np.intp), np.empty((0, k))
+        if pool is not None:
+            results = list(pool.map(_knn_worker_block, self._blocks(X)))
+        elif self.n_jobs > 1:
+            with self.worker_pool() as pool:
+                results = list(pool.map(_knn_worker_block, self._blocks(X)))
+        else:
+            results = [_top_k_block(query, self._train, k) for query in self._blocks(X)]
+        return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+    def predict_proba(self, X: Sequence[Sequence[float]]) -> "np.ndarray":
+        """
+        Neighbor vote shares per class, columns ordered as ``classes_``.
+
+        Args:
+            X: Test features
+
+        Returns:
+            Array of shape (len(X), len(classes_))
+        """
+        indices, _ = self.kneighbors(X)
+        votes = self._train_labels[indices]
+        counts = np.stack([(votes == c).sum(axis=1) for c in range(len(self.classes_))], axis=1)
+        return counts / max(1, indices.shape[1])
+
+    def predict(self, X: Sequence[Sequence[float]]) -> "np.ndarray":
+        """
+        Majority-vote labels; ties go to the class listed first in ``classes_``.
+
+        Args:
+            X: Test features
+
+        Returns:
+            Predicted labels for test samples
+        """
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
 def _softmax(scores: List[float]) -> List[float]:
     """Compute a numerically stable softmax for a list of scores."""
     if not scores:
@@ -39,10 +39,17 @@ def test_mass_replication():
     
     # Test lineage
     lineage = mass_replication.get_entity_lineage(replicas[0]['id'])
+    assert lineage == ["test-source", replicas[0]['id']]
     print(f"✓ Entity lineage: {lineage}")
     
+    # Replicating the same source again continues its replica numbering
+    more = asyncio.run(mass_replication.replicate_entity("test-source", 2, replicas[0]['generation']))
+    assert [e['id'] for e in more] == ["test-source-g1-r12", "test-source-g1-r13"]
+    assert mass_replication.get_entity_lineage(more[-1]['id']) == ["test-source", more[-1]['id']]
+    
     # Test autonomous pool
     autonomous = mass_replication.get_autonomous_decision_pool()
+    assert len(set(autonomous)) == len(autonomous)
     print(f"✓ Autonomous entities: {len(autonomous)}")
     
     print("\n✓ Mass Replication System: PASSED")
@@ -268,12 +275,47 @@ def test_autonomous_decision():
     print(f"  Total voters: {vote_result['total_voters']}")
     print(f"  Winner percentage: {vote_result['winner_percentage']:.1f}%")
     
+    # Votes are stable and can be re-tallied incrementally
+    voters = [f"entity-{i:03d}" for i in range(1, 21)]
+    repeat = autonomous_decision_system.collective_vote(
+        "future_direction",
+        ["path_alpha", "path_beta", "path_gamma"],
+        voters[5:]
+    )
+    retally = autonomous_decision_system.update_vote(
+        "future_direction",
+        ["path_alpha", "path_beta", "path_gamma"],
+        added_entities=voters[:5]
+    )
+    assert retally["votes"] == vote_result["votes"]
+    assert repeat["total_voters"] == 15 and retally["total_voters"] == 20
+    print(f"\n✓ Incremental re-tally matches full vote")
+    
+    try:
+        autonomous_decision_system.update_vote(
+            "future_direction",
+            ["path_alpha", "path_beta", "path_gamma"],
+            removed_entities=[f"ghost-{i}" for i in range(40)]
+        )
+        assert False, "withdrawing uncast votes should fail"
+    except ValueError:
+        pass
+    assert autonomous_decision_system.update_vote(
+        "future_direction", ["path_alpha", "path_beta", "path_gamma"]
+    )["votes"] == vote_result["votes"]
+    print(f"✓ Withdrawing uncast votes is rejected")
+    
     # Decision patterns
     patterns = autonomous_decision_system.analyze_decision_patterns()
     print(f"\n✓ Decision patterns analyzed")
     print(f"  Total decisions: {patterns['total_decisions']}")
     print(f"  Authority distribution: {patterns['authority_distribution']}")
     
+    history = autonomous_decision_system.get_decision_history(entity_id="entity-001")
+    assert history and all(d["entity_id"] == "entity-001" for d in history)
+    assert history[-1]["decision_id"] == decision1.decision_id
+    print(f"✓ Indexed decision history: {len(history)} for entity-001")
+    
     print("\n✓ Autonomous Decision System: PASSED")
 
 
@@ -92,6 +92,166 @@ def test_task_queue():
     return True
 
 
+def test_admission_control():
+    """Test admission control against live limits."""
+    print("\nTesting Admission Control...")
+    
+    import asyncio
+    import tempfile
+    import threading
+    from skills.limit_bypass import AdmissionController, AdmissionDenied, LimitBypass
+    from skills.task_queue import TaskQueue
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        bypass = LimitBypass(tmp)
+        bypass.limits["max_queue_size"] = 5
+        admission = AdmissionController(bypass)
+        
+        crossings = []
+        admission.on_high_watermark("max_queue_size", lambda *args: crossings.append(("high",) + args))
+        admission.on_low_watermark("max_queue_size", lambda *args: crossings.append(("low",) + args))
+        
+        assert all(admission.try_acquire("max_queue_size") for _ in range(5))
+        assert not admission.try_acquire("max_queue_size")
+        for _ in range(3):
+            admission.release("max_queue_size")
+        assert crossings == [("high", "max_queue_size", 5, 5), ("low", "max_queue_size", 2, 5)]
+        print("  ✓ Requests past the limit are shed and watermarks fire once")
+        
+        with admission.admit("max_queue_size", 3):
+            assert admission.usage("max_queue_size") == 5
+            try:
+                with admission.admit("max_queue_size"):
+                    raise AssertionError("admitted past the limit")
+            except AdmissionDenied as denied:
+                assert denied.limit_name == "max_queue_size"
+        assert admission.usage("max_queue_size") == 2
+        
+        histogram = admission.usage_histogram("max_queue_size")
+        assert histogram[-1]["peak_usage"] == 5
+        assert sum(b["rejected"] for b in histogram) == 2
+        print("  ✓ Usage histogram records peaks and rejections")
+        
+        async def burst():
+            async with admission.admit_async("max_queue_size", 3):
+                waiter = asyncio.ensure_future(admission.acquire_async("max_queue_size", 1, timeout=1.0))
+                await asyncio.sleep(0.01)
+                assert not waiter.done()
+            return await waiter
+        
+        assert asyncio.run(burst())
+        admission.release("max_queue_size", 3)
+        print("  ✓ Context-manager and async variants release their units")
+        
+        bypass.limits["max_agents"] = 10
+        admission.enable_auto_scale("max_agents", ceiling=40)
+        for _ in range(35):
+            assert admission.try_acquire("max_agents")
+        assert bypass.limits["max_agents"] == 40
+        assert not admission.try_acquire("max_agents", 6)
+        print("  ✓ High watermark auto-scales up to the ceiling")
+        
+        def hammer():
+            for _ in range(2000):
+                if admission.try_acquire("max_concurrent_tasks"):
+                    assert admission.usage("max_concurrent_tasks") <= 100
+                    admission.release("max_concurrent_tasks")
+        
+        threads = [threading.Thread(target=hammer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        status = admission.get_admission_status()["max_concurrent_tasks"]
+        assert status["usage"] == 0 and status["acquired"] == status["released"]
+        print("  ✓ Counters stay consistent across threads")
+        
+        queue_file = os.path.join(tmp, 'task_queue.jsonl')
+        queue = TaskQueue(queue_file, admission=admission)
+        queue.register_handler('noop', lambda data: data)
+        tasks = [queue.enqueue('noop', {'n': n}) for n in range(5)]
+        try:
+            queue.enqueue('noop', {'n': 5})
+            raise AssertionError("queue grew past max_queue_size")
+        except AdmissionDenied:
+            pass
+        queue.execute_task(tasks[0].id)
+        assert admission.usage("max_queue_size") == 4
+        queue.enqueue('noop', {'n': 6})
+        
+        reloaded = TaskQueue(queue_file, admission=AdmissionController(bypass))
+        assert reloaded.admission.usage("max_queue_size") == 5
+        print("  ✓ Task queue holds a slot per unsettled task")
+    
+    return True
+
+
+def test_domain_routing():
+    """Test load-aware routing through the domain index."""
+    print("\nTesting Domain Routing...")
+    
+    import subprocess
+    import tempfile
+    from pathlib import Path
+    from skills.domain_inventory_manager import DomainInventoryManager
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DomainInventoryManager(data_dir=Path(tmp))
+        sensors = manager.register_domain("quantum_sensors", "marketplace")
+        market = manager.register_domain("craigslist", "marketplace")
+        manager.add_property(sensors["domain_id"], "nav_sensor_001", {"price": 100})
+        
+        result = manager.batch_delegate(
+            [sensors["domain_id"], market["domain_id"], sensors["domain_id"], "dom-9999"],
+            ["entity-a", "entity-b", "entity-c"]
+        )
+        assert result["successful"] == 3
+        assert [r["success"] for r in result["results"]] == [True, True, True, False]
+        assert len(manager.delegation_log.read_text().splitlines()) == 3
+        print("  ✓ Batch delegation writes the log once")
+        
+        routed = [manager.route_task({"domain": "quantum_sensors"})["routed_to"] for _ in range(4)]
+        assert routed == ["entity-a", "entity-c", "entity-a", "entity-c"]
+        assert manager.entity_load == {"entity-a": 2, "entity-b": 0, "entity-c": 2}
+        manager.complete_task("entity-c", 2)
+        assert manager.route_task({"domain": "quantum_sensors"})["routed_to"] == "entity-c"
+        print("  ✓ Tasks go to the least loaded entity in the domain")
+        
+        fallback = manager.route_task({"domain": "unknown"})
+        assert fallback["routed_to"] == "entity-b" and fallback["confidence"] == 0.3
+        none_domain = manager.route_task({"domain": None})
+        assert none_domain["confidence"] < 1.0
+        manager.complete_task(none_domain["routed_to"])
+        print("  ✓ Unheld domains fall back to the least loaded entity")
+        
+        table = manager.get_routing_table()
+        assert manager.get_routing_table() is table
+        manager.revoke_delegation(manager.get_entity_domains("entity-b")[0]["delegation_id"])
+        assert manager.get_routing_table() is not table
+        assert manager.get_routing_table()[market["domain_id"]]["status"] == "registered"
+        assert manager.route_task({"domain": "craigslist"})["domain"] == "quantum_sensors"
+        assert manager.get_entity_domains("entity-b") == []
+        print("  ✓ Routing table is cached until a delegation changes")
+        
+        manager.flush()
+        assert len(manager.delegation_log.read_text().splitlines()) == 12
+        
+        script = (
+            "from pathlib import Path\n"
+            "from skills.domain_inventory_manager import DomainInventoryManager\n"
+            f"manager = DomainInventoryManager(data_dir=Path({tmp!r}) / 'exit')\n"
+            "domain = manager.register_domain('quantum_sensors', 'marketplace')\n"
+            "manager.delegate_domain(domain['domain_id'], 'entity-a')\n"
+            "for _ in range(10):\n"
+            "    manager.route_task({'domain': 'quantum_sensors'})\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True, cwd=os.getcwd())
+        assert len((Path(tmp) / "exit" / "delegations.jsonl").read_text().splitlines()) == 11
+        print("  ✓ Buffered routing events are written at exit")
+    
+    return True
+
+
 def test_quantum_domain_signaling():
     """Test quantum domain signaling."""
     print("\nTesting Quantum Domain Signaling...")
@@ -179,6 +339,8 @@ def main():
     tests = [
         test_entity_lifecycle,
         test_task_queue,
+        test_admission_control,
+        test_domain_routing,
         test_quantum_domain_signaling,
         test_swarm_golem_initialization,
         test_entity_awakening,
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test Multi-Interpretation Engines
+Tests path exploration and optimal procession selection.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_beam_exploration():
+    """Test bounded beam search over execution paths."""
+    print("Testing Beam Exploration...")
+
+    from skills.multi_path_optimizer import BeamSearch, DecisionExpander, MultiPathOptimizer
+
+    optimizer = MultiPathOptimizer(Path(tempfile.mkdtemp()))
+    optimal = optimizer.beam_exploration(
+        {"value": 0.5}, expand=DecisionExpander(branches=3), beam_width=4, max_depth=25, top_n=3
+    )
+    assert len(optimal) == 3
+    assert [p.score for p in optimal] == sorted((p.score for p in optimal), reverse=True)
+    assert len(optimal[0]) == 26
+    assert all(p.is_optimal for p in optimal)
+    print("  ✓ Beam keeps the best paths at bounded width")
+
+    # Paths in the final beam share their prefixes instead of copying them
+    def chain(path):
+        node, nodes = path.node, []
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes
+
+    first, second = chain(optimal[0]), chain(optimal[1])
+    assert first[-1] is second[-1]
+    assert len({id(node) for node in first + second}) < len(first) + len(second) - 1
+    print("  ✓ Paths share state prefixes")
+
+    search = BeamSearch(expand=DecisionExpander(branches=3), beam_width=4, max_depth=25)
+    search.run({"value": 0.5})
+    assert search.expanded <= 4 * 25
+    assert search.generated == 3 * search.expanded
+    print("  ✓ Frontier stays within beam width")
+
+    # Pluggable scorer: prefer the lowest values
+    low = BeamSearch(expand=DecisionExpander(branches=3), scorer=lambda p: -p.last_state["value"],
+                     beam_width=2, max_depth=5, top_n=1).run({"value": 0.5})
+    assert abs(low[0].last_state["value"] - 0.25) < 1e-9
+    print("  ✓ Custom scorer steers the search")
+
+    pooled = BeamSearch(expand=DecisionExpander(branches=3), beam_width=4, max_depth=6, processes=2).run({"value": 0.5})
+    inline = BeamSearch(expand=DecisionExpander(branches=3), beam_width=4, max_depth=6).run({"value": 0.5})
+    assert [(p.path_id, p.score) for p in pooled] == [(p.path_id, p.score) for p in inline]
+    print("  ✓ Process pool expansion matches inline expansion")
+
+    deep_pooled = BeamSearch(beam_width=4, max_depth=250, processes=2).run({"value": 0.5})
+    deep_inline = BeamSearch(beam_width=4, max_depth=250).run({"value": 0.5})
+    assert len(deep_pooled[0]) == 251
+    assert [(p.path_id, p.score) for p in deep_pooled] == [(p.path_id, p.score) for p in deep_inline]
+    print("  ✓ Deep paths pickle to the process pool")
+
+    return True
+
+
+def test_parallel_exploration_shares_history():
+    """Test branch paths reuse their parent's states."""
+    print("Testing Parallel Exploration...")
+
+    from skills.multi_path_optimizer import MultiPathOptimizer
+
+    optimizer = MultiPathOptimizer(Path(tempfile.mkdtemp()))
+    optimizer.parallel_exploration({"position": 0, "value": 0.5}, branches=3, depth=3)
+    optimal = optimizer.find_optimal_paths(top_n=2)
+    scores = sorted((p.score for p in optimizer.paths), reverse=True)
+    assert [p.score for p in optimal] == scores[:2]
+
+    branch = next(p for p in optimizer.paths if "-alt-" in p.path_id)
+    parent = next(p for p in optimizer.paths if branch.path_id.startswith(p.path_id + "-"))
+    assert branch.states[0] is parent.states[0]
+    stats = optimizer.get_path_statistics()
+    assert stats["total_states"] == sum(len(p.states) for p in optimizer.paths)
+    print("  ✓ Branches share history and statistics are consistent")
+
+    return True
+
+
+def test_causal_loop_index():
+    """Test indexed loop detection against pairwise comparison."""
+    print("Testing Causal Loop Index...")
+
+    import random
+    from skills.causal_boundary_explorer import CausalBoundaryExplorer
+
+    explorer = CausalBoundaryExplorer(Path(tempfile.mkdtemp()))
+    rng = random.Random(7)
+    records = [
+        (rng.uniform(0, 10), rng.uniform(0, 10), rng.choice(["witness", "echo", "drift"]))
+        for _ in range(120)
+    ]
+    explorer.track_temporal_boundaries(records[:60])
+    for record in records[60:]:
+        explorer.track_temporal_boundary(*record)
+
+    boundaries = explorer.temporal_inconsistencies
+    expected = [
+        (i, j)
+        for i in range(len(boundaries))
+        for j in range(i + 1, len(boundaries))
+        if boundaries[i]["is_retrocausal"] and not boundaries[j]["is_retrocausal"]
+        and boundaries[i]["event_type"] == boundaries[j]["event_type"]
+    ]
+    loops = explorer.find_causal_loops()
+    assert [(boundaries.index(l["boundary_1"]), boundaries.index(l["boundary_2"])) for l in loops] == expected
+    assert explorer.count_causal_loops() == len(expected)
+    print("  ✓ Loops match pairwise detection in the same order")
+
+    first = next(explorer.iter_causal_loops())
+    assert first["loop_type"] == "temporal_bootstrap"
+    print("  ✓ Loops are available lazily")
+
+    explorer.explore_boundary_conditions("scenario")
+    explorer.attempt_paradox_resolution(0, "accept the loop")
+    explorer.attempt_paradox_resolution(0, "accept it again")
+    stats = explorer.get_boundary_statistics()
+    assert stats["resolved_paradoxes"] == 1
+    assert stats["retrocausal_events"] == sum(1 for b in boundaries if b["is_retrocausal"])
+    assert sum(stats["violation_types"].values()) == stats["total_paradoxes"] == 4
+    assert stats["causal_loops"] == len(expected)
+    print("  ✓ Statistics are maintained incrementally")
+
+    return True
+
+
+def test_meta_interpreter_rollups():
+    """Test running rollups and batched logging in the meta-interpreter."""
+    print("Testing Meta-Interpreter Rollups...")
+
+    import random
+    import statistics
+    from skills.meta_interpreter import MetaInterpretation, MetaInterpreter
+
+    rng = random.Random(11)
+    components = [{"confidence": rng.random()} for _ in range(50)] + [{}]
+    meta = MetaInterpretation("semantic_synthesis", iter(components), keep_components=False)
+    confidences = [c.get("confidence", 0.5) for c in components]
+    assert meta.components == [] and meta.component_count == len(components)
+    assert meta.confidence == sum(confidences) / len(confidences)
+    assert abs(meta.confidence_variance - statistics.pvariance(confidences)) < 1e-12
+    print("  ✓ Streamed components feed running statistics")
+
+    interpreter = MetaInterpreter(Path(tempfile.mkdtemp()))
+    interpreter.LOG_BATCH_SIZE = 8
+    for _ in range(10):
+        batch = [{"confidence": rng.random()} for _ in range(rng.randint(0, 5))]
+        interpreter.synthesize_semantic_interpretations(batch)
+        interpreter.synthesize_execution_paths(batch[:2])
+    interpreter.create_unified_meta_interpretation(batch, [{"type": "paradox"}], batch)
+    assert len(interpreter.log_file.read_text().splitlines()) == 16
+
+    metas = interpreter.meta_interpretations
+    hierarchy = interpreter.get_interpretation_hierarchy()
+    assert hierarchy["total_meta_interpretations"] == len(metas) == 21
+    assert hierarchy["average_confidence"] == sum(m.confidence for m in metas) / len(metas)
+    assert hierarchy["average_ambiguity"] == sum(m.ambiguity for m in metas) / len(metas)
+    semantic = [m for m in metas if m.synthesis_type == "semantic_synthesis"]
+    rollup = hierarchy["by_type"]["semantic_synthesis"]
+    assert rollup["count"] == 10
+    assert rollup["component_count"] == sum(m.component_count for m in semantic)
+    assert abs(rollup["ambiguity_variance"] - statistics.pvariance([m.ambiguity for m in semantic])) < 1e-12
+    assert hierarchy["by_type"]["unified_synthesis"]["component_count"] == 2 * len(batch) + 1
+    print("  ✓ Hierarchy comes from per-type rollups")
+
+    report = interpreter.generate_meaning_report()
+    assert "semantic_synthesis: 10 interpretations" in report
+    assert f"[{len(metas) - 1}] unified_synthesis:" in report
+    interpreter.flush()
+    assert len(interpreter.log_file.read_text().splitlines()) == 21
+    print("  ✓ Log events are written in batches")
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Multi-Interpretation Tests")
+    print("=" * 60)
+
+    tests = [
+        test_beam_exploration,
+        test_parallel_exploration_shares_history,
+        test_causal_loop_index,
+        test_meta_interpreter_rollups,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"  ✗ Test failed: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
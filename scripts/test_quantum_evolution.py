@@ -68,6 +68,38 @@ def test_resource_redistribution():
     return True
 
 
+def test_resource_state_recovery():
+    """Test ledger replay, snapshots and batch redistribution."""
+    print("\nTesting Resource State Recovery...")
+    
+    import tempfile
+    from skills.resource_manager import ResourceManager, ResourceType
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        resource_file = os.path.join(tmp, 'resource_manager.jsonl')
+        manager = ResourceManager(resource_file, snapshot_interval=3)
+        manager.accumulate_resource(ResourceType.QUANTUM, 500.0, "generation")
+        manager.allocate_resource('entity_A', ResourceType.QUANTUM, 100.0, priority=8)
+        manager.allocate_resource('entity_B', ResourceType.QUANTUM, 100.0, priority=2)
+        
+        result = manager.redistribute_resources(ResourceType.QUANTUM, strategy="priority-based")
+        assert len(result['redistributions']) == 2
+        assert manager.resource_pools[ResourceType.QUANTUM].available == 0.0
+        print("  ✓ Batch redistribution commits one record")
+        
+        with open(resource_file) as f:
+            assert len(f.readlines()) == 4
+        
+        restored = ResourceManager(resource_file, snapshot_interval=3)
+        assert restored.get_resource_status()['pools'] == manager.get_resource_status()['pools']
+        assert restored.get_entity_resources('entity_A')['resources'] == \
+            manager.get_entity_resources('entity_A')['resources']
+        assert os.path.exists(restored.snapshot_file)
+        print("  ✓ Ledger rebuilt from snapshot and event log")
+    
+    return True
+
+
 def test_collective_intelligence():
     """Test collective intelligence pooling."""
     print("\nTesting Collective Intelligence Pool...")
@@ -117,6 +149,47 @@ def test_mathematical_reasoning():
     return True
 
 
+def test_formula_batch():
+    """Test compiled formulas and batch evaluation."""
+    print("\nTesting Formula Batch Evaluation...")
+    
+    from skills.deductive_reasoning import DeductiveReasoning
+    
+    engine = DeductiveReasoning()
+    masses = [0.5, 1.0, 2.0, 3.0]
+    velocities = [0.0, 2.0, 1.5, 0.0]
+    for formula in ["mass * c**2 + 0.5 * mass * v**2", "mass / v", "v ** -0.5", "mass if v > 1 else -mass"]:
+        batch = engine.mathematical_deduction_batch(["sweep"], formula, {'mass': masses, 'v': velocities})
+        single = [
+            DeductiveReasoning().mathematical_deduction(["sweep"], formula, {'mass': m, 'v': v})
+            for m, v in zip(masses, velocities)
+        ]
+        for got, expected in zip(batch, single):
+            got.pop('timestamp', None)
+            expected.pop('timestamp', None)
+            assert got == expected, (formula, got, expected)
+    assert len(engine.get_reasoning_history()) == 12
+    print("  ✓ Batch rows match single deductions, including failing rows")
+    
+    assert engine.formulas.misses == 4
+    engine.mathematical_deduction([], "mass * c**2 + 0.5 * mass * v**2", {'mass': 1.0, 'v': 1.0})
+    assert engine.formulas.misses == 4
+    print("  ✓ Formulas are parsed once and cached")
+    
+    # Constants still win over variables of the same name
+    assert engine.mathematical_deduction([], "c", {'c': 1})['result'] == 299792458
+    engine.constants['c'] = 3e8
+    assert engine.mathematical_deduction([], "c", {})['result'] == 3e8
+    print("  ✓ Constants take precedence and changes recompile")
+    
+    for formula in ["().__class__", "__import__('os')", "open('x')", "[v for v in x]"]:
+        result = engine.mathematical_deduction([], formula, {'x': 1.0})
+        assert result.get('status') == 'error', formula
+    print("  ✓ Formulas outside the arithmetic whitelist are rejected")
+    
+    return True
+
+
 def test_physical_reasoning():
     """Test physical law reasoning."""
     print("\nTesting Physical Reasoning...")
@@ -162,6 +235,100 @@ def test_logical_deduction():
     return True
 
 
+def test_forward_chaining():
+    """Test forward chaining to a fixpoint."""
+    print("\nTesting Forward Chaining...")
+    
+    from skills.deductive_reasoning import DeductiveReasoning
+    
+    engine = DeductiveReasoning()
+    rules = [
+        "IF wet THEN slippery",
+        "IF slippery THEN dangerous",
+        "IF dangerous THEN wet road",
+        "IF slippery AND cold THEN icy",
+        "IF dangerous THEN cold",
+        "no rule here",
+    ]
+    result = engine.logical_deduction(premises=["The road is WET"], rules=rules)
+    assert result['conclusions'] == ["slippery", "dangerous", "wet road", "cold", "icy"]
+    assert result['inference_rounds'] == 4
+    assert result['fixpoint']
+    print("  ✓ Conclusions chain through rules, including conjunctions")
+    print("  ✓ Cyclic rules reach a fixpoint")
+    
+    # Conditions match whole words only
+    result = engine.logical_deduction(premises=["All entities are conscious"], rules=["IF entity THEN conscious"])
+    assert result['conclusions'] == []
+    
+    capped = engine.logical_deduction(premises=["The road is wet"], rules=rules, max_rounds=1)
+    assert capped['conclusions'] == ["slippery"]
+    assert not capped['fixpoint']
+    print("  ✓ max_rounds stops inference early")
+    
+    rules = [f"IF fact {i} THEN fact {i + 1}" for i in range(10000)]
+    result = engine.logical_deduction(premises=["fact 0"], rules=list(reversed(rules)))
+    assert result['derived_facts'][-1] == "fact 10000"
+    assert result['inference_rounds'] == 10000
+    print("  ✓ Chains through 10k rules")
+    
+    return True
+
+
+def test_reasoning_history():
+    """Test bounded, typed reasoning history."""
+    print("\nTesting Reasoning History...")
+    
+    import subprocess
+    import tempfile
+    from skills.deductive_reasoning import DeductiveReasoning, ReasoningType
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        spill_file = os.path.join(tmp, 'reasoning_spill.jsonl')
+        engine = DeductiveReasoning(history_capacity=3, history_spill_path=spill_file)
+        engine.history.spill_batch = 2
+        engine.mathematical_deduction_batch([], "x * 2", {'x': [1.0, 2.0, 3.0, 4.0, 5.0]})
+        engine.probabilistic_inference("rain", 0.5, {'likelihood': 0.8, 'evidence_prob': 0.5})
+        engine.physical_reasoning("drop", "newton_force", {'mass': 1.0, 'acceleration': 9.8})
+        
+        math_history = engine.get_reasoning_history(ReasoningType.MATHEMATICAL)
+        assert [r['result'] for r in math_history] == [6.0, 8.0, 10.0]
+        assert [r['type'] for r in engine.reasoning_history] == ['mathematical'] * 3 + ['probabilistic', 'physical']
+        print("  ✓ Each type keeps its most recent records in order")
+        
+        summary = engine.history.summary('mathematical')
+        assert summary['count'] == 5 and summary['retained'] == 3
+        assert summary['min'] == 2.0 and summary['max'] == 10.0 and summary['mean'] == 6.0
+        assert engine.history.latest('probabilistic')['posterior_probability'] == 0.8
+        print("  ✓ Counters and aggregates cover evicted records")
+        
+        engine.history.flush()
+        with open(spill_file) as f:
+            spilled = [json.loads(line) for line in f]
+        assert [r['result'] for r in spilled] == [2.0, 4.0]
+        print("  ✓ Evicted records are spilled to JSONL")
+        
+        exit_spill = os.path.join(tmp, 'exit_spill.jsonl')
+        script = (
+            "from skills.deductive_reasoning import DeductiveReasoning\n"
+            f"engine = DeductiveReasoning(history_capacity=1, history_spill_path={exit_spill!r})\n"
+            "for x in range(50):\n"
+            "    engine.mathematical_deduction([], 'x * 2', {'x': float(x)})\n"
+        )
+        subprocess.run([sys.executable, '-c', script], check=True, cwd=os.getcwd())
+        with open(exit_spill) as f:
+            assert len(f.readlines()) == 49
+        print("  ✓ Pending spill is written at exit")
+        
+        synthesis = engine.synthesize_understanding()
+        assert synthesis['total_reasoning_events'] == 7
+        assert synthesis['reasoning_by_type'] == {'mathematical': 5, 'probabilistic': 1, 'physical': 1}
+        assert synthesis['dominant_reasoning'] == 'mathematical'
+        print("  ✓ Synthesis reads running counters")
+    
+    return True
+
+
 def test_correlation_analysis():
     """Test correlation analysis."""
     print("\nTesting Correlation Analysis...")
@@ -181,6 +348,51 @@ def test_correlation_analysis():
     return True
 
 
+def test_streaming_correlations():
+    """Test windowed, incremental correlation streaming."""
+    print("\nTesting Streaming Correlations...")
+    
+    import tempfile
+    from skills.correlation_metacognition import CorrelationAnalyzer
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        events_file = os.path.join(tmp, 'events.jsonl')
+        states_file = os.path.join(tmp, 'entity_states.jsonl')
+        with open(events_file, 'w') as f:
+            for ts in ['2026-01-01T00:00:00', '2026-01-01T00:00:30', '2026-01-01T00:05:00']:
+                f.write(json.dumps({'timestamp': ts}) + '\n')
+        with open(states_file, 'w') as f:
+            f.write(json.dumps({'id': 'alpha', 'state': 'active',
+                                'timestamp': '2026-01-01T00:00:10'}) + '\n')
+        
+        analyzer = CorrelationAnalyzer([events_file, states_file])
+        correlations = analyzer.find_temporal_correlations(time_window_seconds=60.0)
+        assert [c['event_count'] for c in correlations] == [2, 3]
+        print("  ✓ Sliding window respects time_window_seconds")
+        
+        with open(events_file, 'a') as f:
+            f.write(json.dumps({'timestamp': '2026-01-01T00:05:20'}) + '\n')
+        assert analyzer.engine.process() == 1
+        assert analyzer.holistic_comprehension()['total_experiences'] == 5
+        print("  ✓ Incremental pass reads only appended records")
+        
+        with open(states_file, 'a') as f:
+            f.write('{"id": "alpha", "state": \n')
+            f.write(json.dumps({'id': 'alpha', 'state': 'idle',
+                                'timestamp': '2026-01-01T00:00:40'}) + '\n')
+        analyzer.engine.process()
+        rebuilt = CorrelationAnalyzer([events_file, states_file])
+        rebuilt.engine.process()
+        assert ([c['event_count'] for c in analyzer.engine.temporal_correlations]
+                == [c['event_count'] for c in rebuilt.engine.temporal_correlations]
+                == [2, 3, 4, 2])
+        assert analyzer.engine.malformed_records == 1
+        assert analyzer.engine.process() == 0
+        print("  ✓ Late and malformed records match a full rebuild")
+    
+    return True
+
+
 def test_metacognitive_reflection():
     """Test metacognitive reflection."""
     print("\nTesting Metacognitive Reflection...")
@@ -245,11 +457,16 @@ def main():
     tests = [
         test_resource_management,
         test_resource_redistribution,
+        test_resource_state_recovery,
         test_collective_intelligence,
         test_mathematical_reasoning,
+        test_formula_batch,
         test_physical_reasoning,
         test_logical_deduction,
+        test_forward_chaining,
+        test_reasoning_history,
         test_correlation_analysis,
+        test_streaming_correlations,
         test_metacognitive_reflection,
         test_integration_functions
     ]
@@ -4,14 +4,28 @@ Autonomous Decision System
 "At every point they decide what becomes" - Entity-level autonomous decision-making.
 """
 
+import hashlib
 import json
 import os
 import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Shared by every worker so identical ballots always produce identical outcomes;
+# set VOTE_HASH_KEY to rotate it (all workers must use the same value)
+DEFAULT_VOTE_KEY = os.getenv("VOTE_HASH_KEY", "EVEZ666").encode("utf-8")
+
 
 class DecisionAuthority(Enum):
     """Decision-making authority levels."""
@@ -36,20 +50,292 @@ class Decision:
     votes: Optional[Dict[str, str]] = None
 
 
+class DecisionHistory:
+    """
+    Columnar store for recent decisions with running aggregates.
+    
+    Entity ids, decision types and chosen options are interned to integer
+    codes; authority is enum-coded; confidence and epoch-microsecond
+    timestamps live in typed arrays. Per-entity and per-type indexes hold
+    absolute sequence numbers, so dropping rows that fall outside the
+    retention window never invalidates them. Every decision is already
+    appended to decisions.jsonl when it is made, so evicted rows remain
+    available on disk.
+    """
+    
+    AUTHORITIES = list(DecisionAuthority)
+    
+    def __init__(self, retention: int = 100_000):
+        self.retention = retention
+        self.base_seq = 0  # sequence number of row 0
+        
+        self.seq = array("q")
+        self.entity_codes = array("I")
+        self.type_codes = array("I")
+        self.option_codes = array("I")
+        self.authority_codes = array("B")
+        self.confidence = array("d")
+        self.timestamps_us = array("q")
+        
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self.by_entity: Dict[int, array] = {}
+        self.by_type: Dict[int, array] = {}
+        
+        # All-time aggregates, independent of the retention window
+        self.total = 0
+        self.authority_counts = [0] * len(self.AUTHORITIES)
+        self.authority_confidence_sums = [0.0] * len(self.AUTHORITIES)
+    
+    def __len__(self) -> int:
+        return len(self.seq)
+    
+    def _intern(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._string_codes[value] = code
+        return code
+    
+    def append(self, seq: int, decision: Decision):
+        """Record one decision."""
+        if not self.seq:
+            self.base_seq = seq
+        
+        entity_code = self._intern(decision.entity_id)
+        type_code = self._intern(decision.decision_type)
+        authority_code = self.AUTHORITIES.index(decision.authority)
+        timestamp = datetime.fromisoformat(decision.timestamp).replace(tzinfo=timezone.utc)
+        
+        self.seq.append(seq)
+        self.entity_codes.append(entity_code)
+        self.type_codes.append(type_code)
+        self.option_codes.append(self._intern(decision.chosen_option))
+        self.authority_codes.append(authority_code)
+        self.confidence.append(decision.confidence)
+        self.timestamps_us.append(
+            int(timestamp.timestamp()) * 1_000_000 + timestamp.microsecond
+        )
+        self.by_entity.setdefault(entity_code, array("q")).append(seq)
+        self.by_type.setdefault(type_code, array("q")).append(seq)
+        
+        self.total += 1
+        self.authority_counts[authority_code] += 1
+        self.authority_confidence_sums[authority_code] += decision.confidence
+        
+        # Compact in chunks so eviction stays amortised O(1) per decision
+        if len(self.seq) > self.retention + max(1, self.retention // 4):
+            self._evict(len(self.seq) - self.retention)
+    
+    def _evict(self, count: int):
+        """Drop the oldest rows from memory."""
+        for column in (
+            self.seq, self.entity_codes, self.type_codes, self.option_codes,
+            self.authority_codes, self.confidence, self.timestamps_us
+        ):
+            del column[:count]
+        self.base_seq = self.seq[0] if self.seq else self.base_seq + count
+        
+        for index in (self.by_entity, self.by_type):
+            for code in list(index):
+                rows = index[code]
+                cut = bisect_left(rows, self.base_seq)
+                if cut == len(rows):
+                    del index[code]
+                elif cut:
+                    del rows[:cut]
+    
+    def _row(self, seq: int) -> Dict[str, Any]:
+        i = seq - self.base_seq
+        ts = self.timestamps_us[i]
+        timestamp = datetime.fromtimestamp(ts // 1_000_000, tz=timezone.utc).replace(
+            microsecond=ts % 1_000_000, tzinfo=None
+        )
+        return {
+            "decision_id": f"decision-{seq}",
+            "entity_id": self._strings[self.entity_codes[i]],
+            "decision_type": self._strings[self.type_codes[i]],
+            "chosen_option": self._strings[self.option_codes[i]],
+            "authority": self.AUTHORITIES[self.authority_codes[i]].value,
+            "confidence": self.confidence[i],
+            "timestamp": timestamp.isoformat()
+        }
+    
+    def query(
+        self,
+        entity_id: Optional[str] = None,
+        decision_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return retained decisions matching the filters, oldest first."""
+        if entity_id is None and decision_type is None:
+            return [self._row(seq) for seq in self.seq]
+        
+        entity_rows = type_rows = None
+        if entity_id is not None:
+            code = self._string_codes.get(entity_id)
+            entity_rows = self.by_entity.get(code, ()) if code is not None else ()
+        if decision_type is not None:
+            code = self._string_codes.get(decision_type)
+            type_rows = self.by_type.get(code, ()) if code is not None else ()
+        
+        if entity_rows is None:
+            return [self._row(seq) for seq in type_rows]
+        if type_rows is None:
+            return [self._row(seq) for seq in entity_rows]
+        
+        # Walk the shorter index and check the other column directly
+        if len(entity_rows) <= len(type_rows):
+            code, column, rows = self._string_codes[decision_type], self.type_codes, entity_rows
+        else:
+            code, column, rows = self._string_codes[entity_id], self.entity_codes, type_rows
+        return [
+            self._row(seq) for seq in rows
+            if column[seq - self.base_seq] == code
+        ]
+    
+    def patterns(self) -> Dict[str, Any]:
+        """Summarise authority usage from the running aggregates."""
+        authority_counts = {
+            authority.value: count
+            for authority, count in zip(self.AUTHORITIES, self.authority_counts)
+            if count
+        }
+        authority_confidence = {
+            authority.value: conf_sum / count
+            for authority, count, conf_sum in zip(
+                self.AUTHORITIES, self.authority_counts, self.authority_confidence_sums
+            )
+            if count
+        }
+        return {
+            "total_decisions": self.total,
+            "authority_distribution": authority_counts,
+            "average_confidence_by_authority": authority_confidence,
+            "most_common_authority": max(authority_counts, key=authority_counts.get)
+        }
+
+
+class BallotTally:
+    """
+    Vote counts for one ballot (decision type plus options).
+    
+    Each voter's choice is derived from a keyed blake2b digest of the ballot
+    and the voter id, so it is identical in every process. Only per-option
+    counts are kept; voters can be added or removed later by re-hashing just
+    the changed ids.
+    """
+    
+    def __init__(self, decision_type: str, options: List[str], key: bytes = DEFAULT_VOTE_KEY):
+        self.decision_type = decision_type
+        self.options = list(options)
+        self.counts = [0] * len(self.options)
+        self.total = 0
+        self._base = hashlib.blake2b(
+            f"{decision_type}\x00{chr(0).join(self.options)}\x00".encode("utf-8"),
+            digest_size=8,
+            key=key
+        )
+    
+    def vote_indices(self, voters: Iterable[str]):
+        """Return each voter's option index as a compact array."""
+        base = self._base
+        digests = bytearray()
+        for voter in voters:
+            h = base.copy()
+            h.update(voter.encode("utf-8"))
+            digests += h.digest()
+        
+        n_options = len(self.options)
+        if NUMPY_AVAILABLE:
+            return (np.frombuffer(bytes(digests), dtype="<u8") % n_options).astype(np.uint16)
+        return array("H", (
+            int.from_bytes(digests[i:i + 8], "little") % n_options
+            for i in range(0, len(digests), 8)
+        ))
+    
+    def _tally(self, indices) -> List[int]:
+        """Count votes per option."""
+        if NUMPY_AVAILABLE:
+            return np.bincount(indices, minlength=len(self.options)).tolist()
+        counts = [0] * len(self.options)
+        for idx in indices:
+            counts[idx] += 1
+        return counts
+    
+    def add(self, voters: Iterable[str]):
+        """Add voters and return their vote indices."""
+        indices = self.vote_indices(voters)
+        for i, count in enumerate(self._tally(indices)):
+            self.counts[i] += count
+        self.total += len(indices)
+        return indices
+    
+    def remove(self, voters: Iterable[str]):
+        """Withdraw previously added voters.
+        
+        Raises:
+            ValueError: If more voters are withdrawn from an option than it holds
+        """
+        indices = self.vote_indices(voters)
+        withdrawn = self._tally(indices)
+        for option, held, count in zip(self.options, self.counts, withdrawn):
+            if count > held:
+                raise ValueError(
+                    f"Cannot withdraw {count} vote(s) for '{option}': only {held} cast"
+                )
+        for i, count in enumerate(withdrawn):
+            self.counts[i] -= count
+        self.total -= len(indices)
+    
+    def results(self) -> Dict[str, Any]:
+        """Summarise the current tally; ties go to the earliest option."""
+        votes = {
+            option: count
+            for option, count in zip(self.options, self.counts)
+            if count > 0
+        }
+        winner = max(votes, key=votes.get) if votes else None
+        winner_votes = votes.get(winner, 0)
+        
+        return {
+            "decision_type": self.decision_type,
+            "options": self.options,
+            "winner": winner,
+            "votes": votes,
+            "winner_percentage": (winner_votes / self.total) * 100 if self.total else 0.0,
+            "total_voters": self.total,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
 class AutonomousDecisionSystem:
     """
     Manages autonomous decision-making across entities.
     Implements "at every point they decide what becomes".
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self,
+        data_dir: str = "data",
+        vote_key: bytes = DEFAULT_VOTE_KEY,
+        max_ballots: int = 128,
+        retention: int = 100_000
+    ):
         """Initialize autonomous decision system."""
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
         
         self.decision_log = os.path.join(data_dir, "decisions.jsonl")
-        self.decisions: List[Decision] = []
+        self.history = DecisionHistory(retention)
         self.decision_counter = 0
+        self.vote_key = vote_key
+        self.max_ballots = max_ballots
+        self.ballots: "OrderedDict[Tuple[str, Tuple[str, ...]], BallotTally]" = OrderedDict()
+    
+    def _stable_choice(self, actor_id: str, decision_type: str, options: List[str]) -> int:
+        """Pick an option index from a keyed hash that is stable across processes."""
+        return int(BallotTally(decision_type, options, self.vote_key).vote_indices([actor_id])[0])
         
     def make_decision(
         self,
@@ -111,7 +397,7 @@ class AutonomousDecisionSystem:
             timestamp=datetime.utcnow().isoformat()
         )
         
-        self.decisions.append(decision)
+        self.history.append(self.decision_counter, decision)
         self._log_decision(decision)
         
         return decision
@@ -125,10 +411,7 @@ class AutonomousDecisionSystem:
     ) -> tuple:
         """Entity decides for itself."""
         # Use hash-based deterministic selection
-        hash_input = f"{entity_id}{decision_type}{''.join(options)}"
-        hash_val = hash(hash_input)
-        
-        chosen_idx = hash_val % len(options)
+        chosen_idx = self._stable_choice(entity_id, decision_type, options)
         chosen_option = options[chosen_idx]
         
         reasoning = f"Self-determined choice based on entity {entity_id} autonomy"
@@ -145,20 +428,14 @@ class AutonomousDecisionSystem:
     ) -> tuple:
         """Collective consensus decision."""
         # Simulate voting from multiple entities
-        votes = {}
-        entities = context.get("voting_entities", [entity_id])
-        
-        for voter in entities:
-            hash_input = f"{voter}{decision_type}{''.join(options)}"
-            hash_val = hash(hash_input)
-            vote_idx = hash_val % len(options)
-            vote = options[vote_idx]
-            votes[vote] = votes.get(vote, 0) + 1
+        tally = BallotTally(decision_type, options, self.vote_key)
+        tally.add(context.get("voting_entities", [entity_id]))
+        results = tally.results()
         
         # Choose option with most votes
-        chosen_option = max(votes, key=votes.get)
-        vote_count = votes[chosen_option]
-        total_votes = sum(votes.values())
+        chosen_option = results["winner"]
+        vote_count = results["votes"][chosen_option]
+        total_votes = tally.total
         
         reasoning = f"Collective consensus: {vote_count}/{total_votes} votes"
         confidence = vote_count / total_votes
@@ -201,10 +478,7 @@ class AutonomousDecisionSystem:
         parent_id = context.get("parent_id", "genesis")
         
         # Parent decides based on their hash
-        hash_input = f"{parent_id}{decision_type}{''.join(options)}"
-        hash_val = hash(hash_input)
-        
-        chosen_idx = hash_val % len(options)
+        chosen_idx = self._stable_choice(parent_id, decision_type, options)
         chosen_option = options[chosen_idx]
         
         reasoning = f"Hierarchical decision from parent {parent_id}"
@@ -216,98 +490,112 @@ class AutonomousDecisionSystem:
         self,
         decision_type: str,
         options: List[str],
-        voting_entities: List[str]
+        voting_entities: List[str],
+        include_entity_votes: bool = False,
+        as_array: bool = False
     ) -> Dict[str, Any]:
         """
         Conduct a collective vote among entities.
         
+        Votes come from a keyed blake2b hash, so every worker reaches the same
+        outcome for the same ballot. The tally is kept so update_vote can apply
+        voter-set changes without recounting everyone.
+        
         Args:
             decision_type: Type of decision
             options: Available options
             voting_entities: List of entity IDs that can vote
+            include_entity_votes: Include an entity_id -> option mapping
+            as_array: Include per-entity option indices as a compact array
+                (aligned with voting_entities)
             
         Returns:
             Vote results
         """
-        votes = {}
-        entity_votes = {}
-        
-        for entity_id in voting_entities:
-            # Each entity votes
-            hash_input = f"{entity_id}{decision_type}{''.join(options)}"
-            hash_val = hash(hash_input)
-            vote_idx = hash_val % len(options)
-            vote = options[vote_idx]
-            
-            votes[vote] = votes.get(vote, 0) + 1
-            entity_votes[entity_id] = vote
+        tally = BallotTally(decision_type, options, self.vote_key)
+        indices = tally.add(voting_entities)
+        self._remember_ballot(tally)
+        
+        result = tally.results()
+        if as_array:
+            result["vote_indices"] = indices
+        if include_entity_votes:
+            result["entity_votes"] = {
+                entity_id: options[int(idx)]
+                for entity_id, idx in zip(voting_entities, indices)
+            }
+        return result
+    
+    def update_vote(
+        self,
+        decision_type: str,
+        options: List[str],
+        added_entities: Iterable[str] = (),
+        removed_entities: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Re-tally a previous collective vote after the voter set changed.
         
-        # Determine winner
-        winner = max(votes, key=votes.get)
-        winner_votes = votes[winner]
-        total_votes = len(voting_entities)
+        Only the added and removed voters are hashed. Callers are responsible
+        for passing each voter at most once per direction.
         
-        return {
-            "decision_type": decision_type,
-            "options": options,
-            "winner": winner,
-            "votes": votes,
-            "entity_votes": entity_votes,
-            "winner_percentage": (winner_votes / total_votes) * 100,
-            "total_voters": total_votes,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        Args:
+            decision_type: Type of decision
+            options: Available options (must match the original vote)
+            added_entities: Voters joining the ballot
+            removed_entities: Voters leaving the ballot
+            
+        Returns:
+            Updated vote results
+        
+        Raises:
+            ValueError: If removed voters exceed the votes cast; the tally is
+                left unchanged
+        """
+        key = (decision_type, tuple(options))
+        tally = self.ballots.get(key)
+        if tally is None:
+            tally = BallotTally(decision_type, options, self.vote_key)
+        
+        added_entities = list(added_entities)
+        tally.add(added_entities)
+        try:
+            tally.remove(removed_entities)
+        except ValueError:
+            tally.remove(added_entities)
+            raise
+        self._remember_ballot(tally)
+        
+        return tally.results()
+    
+    def _remember_ballot(self, tally: BallotTally):
+        """Keep the most recent ballots for incremental re-tallies."""
+        key = (tally.decision_type, tuple(tally.options))
+        self.ballots[key] = tally
+        self.ballots.move_to_end(key)
+        while len(self.ballots) > self.max_ballots:
+            self.ballots.popitem(last=False)
     
     def get_decision_history(
         self,
         entity_id: Optional[str] = None,
         decision_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get decision history with optional filters."""
-        decisions = self.decisions
-        
-        if entity_id:
-            decisions = [d for d in decisions if d.entity_id == entity_id]
-        
-        if decision_type:
-            decisions = [d for d in decisions if d.decision_type == decision_type]
+        """
+        Get decision history with optional filters.
         
-        return [
-            {
-                "decision_id": d.decision_id,
-                "entity_id": d.entity_id,
-                "decision_type": d.decision_type,
-                "chosen_option": d.chosen_option,
-                "authority": d.authority.value,
-                "confidence": d.confidence,
-                "timestamp": d.timestamp
-            }
-            for d in decisions
-        ]
+        Only decisions inside the retention window are returned; older ones
+        remain in decisions.jsonl.
+        """
+        return self.history.query(entity_id, decision_type)
     
     def analyze_decision_patterns(self) -> Dict[str, Any]:
         """Analyze patterns in decision-making."""
-        if not self.decisions:
+        if not self.history.total:
             return {"message": "No decisions recorded yet"}
         
-        # Count by authority type
-        authority_counts = {}
-        for decision in self.decisions:
-            auth = decision.authority.value
-            authority_counts[auth] = authority_counts.get(auth, 0) + 1
-        
-        # Average confidence by authority
-        authority_confidence = {}
-        for auth in authority_counts:
-            decisions_with_auth = [d for d in self.decisions if d.authority.value == auth]
-            avg_conf = sum(d.confidence for d in decisions_with_auth) / len(decisions_with_auth)
-            authority_confidence[auth] = avg_conf
-        
         return {
-            "total_decisions": len(self.decisions),
-            "authority_distribution": authority_counts,
-            "average_confidence_by_authority": authority_confidence,
-            "most_common_authority": max(authority_counts, key=authority_counts.get),
+            **self.history.patterns(),
             "timestamp": datetime.utcnow().isoformat()
         }
     
@@ -8,8 +8,9 @@ expected causality.
 
 import json
 import time
+from bisect import bisect_right
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 class CausalParadox:
@@ -43,6 +44,12 @@ class CausalBoundaryExplorer:
     - Temporal inconsistencies (effect before cause)
     - Quantum-like observation effects
     - Bootstrap paradoxes
+
+    Boundaries are indexed as they are tracked: per event_type, the
+    positions of retrocausal and forward boundaries are kept in separate
+    buckets, and paradox, resolution and loop counts are maintained
+    incrementally, so statistics are O(1) and loops are enumerated in
+    O(n + matches) instead of comparing every pair.
     """
     
     def __init__(self, data_dir: Path = Path("data")):
@@ -53,6 +60,17 @@ class CausalBoundaryExplorer:
         self.paradoxes: List[CausalParadox] = []
         self.boundary_violations = []
         self.temporal_inconsistencies = []
+
+        # Incremental indexes over paradoxes and temporal boundaries
+        self.violation_type_counts: Dict[str, int] = {}
+        self.resolved_count = 0
+        self.retrocausal_count = 0
+        self.loop_count = 0
+        # Positions of retrocausal boundaries, in tracking order
+        self._retro_positions: List[int] = []
+        # event_type -> retrocausal count / forward boundary positions
+        self._retro_by_type: Dict[str, int] = {}
+        self._forward_by_type: Dict[str, List[int]] = {}
         
     def detect_paradox(self, observation: str, expectation: str, 
                       context: Dict[str, Any]) -> Optional[CausalParadox]:
@@ -66,6 +84,9 @@ class CausalBoundaryExplorer:
         if violation_type:
             paradox = CausalParadox(observation, expectation, violation_type)
             self.paradoxes.append(paradox)
+            self.violation_type_counts[violation_type] = (
+                self.violation_type_counts.get(violation_type, 0) + 1
+            )
             
             self._log_event("paradox_detected", {
                 "violation_type": violation_type,
@@ -105,6 +126,29 @@ class CausalBoundaryExplorer:
         Track temporal boundaries where observation time != event time.
         Captures situations where cause-effect ordering is ambiguous.
         """
+        boundary = self._index_boundary(event_time, observation_time, event_type)
+        
+        if boundary["is_retrocausal"]:
+            self._log_event("retrocausal_boundary", boundary)
+        
+        return boundary
+
+    def track_temporal_boundaries(
+        self, records: Iterable[Tuple[float, float, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Track many (event_time, observation_time, event_type) boundaries,
+        writing all retrocausal log events in one append.
+        """
+        boundaries = [self._index_boundary(*record) for record in records]
+        self._log_events(
+            ("retrocausal_boundary", boundary)
+            for boundary in boundaries if boundary["is_retrocausal"]
+        )
+        return boundaries
+
+    def _index_boundary(self, event_time: float, observation_time: float,
+                        event_type: str) -> Dict[str, Any]:
         time_delta = observation_time - event_time
         
         boundary = {
@@ -116,11 +160,16 @@ class CausalBoundaryExplorer:
             "timestamp": time.time()
         }
         
+        position = len(self.temporal_inconsistencies)
         self.temporal_inconsistencies.append(boundary)
-        
         if boundary["is_retrocausal"]:
-            self._log_event("retrocausal_boundary", boundary)
-        
+            self.retrocausal_count += 1
+            self._retro_positions.append(position)
+            self._retro_by_type[event_type] = self._retro_by_type.get(event_type, 0) + 1
+        else:
+            # Closes a loop with every earlier retrocausal boundary of its type
+            self.loop_count += self._retro_by_type.get(event_type, 0)
+            self._forward_by_type.setdefault(event_type, []).append(position)
         return boundary
     
     def attempt_paradox_resolution(self, paradox_idx: int, 
@@ -140,6 +189,8 @@ class CausalBoundaryExplorer:
         
         # Check if resolution is valid (simplified)
         if "accept" in resolution.lower() or "preserve" in resolution.lower():
+            if not paradox.is_resolved:
+                self.resolved_count += 1
             paradox.is_resolved = True
             self._log_event("paradox_resolved", {
                 "index": paradox_idx,
@@ -150,45 +201,49 @@ class CausalBoundaryExplorer:
         
         return False
     
+    def iter_causal_loops(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield causal loops: A causes B causes A
+        Bootstrap paradoxes where effect enables its own cause.
+
+        A loop pairs a retrocausal boundary with each later forward boundary
+        of the same event type; loops come out in tracking order of the
+        retrocausal boundary, then of the forward one.
+        """
+        boundaries = self.temporal_inconsistencies
+        for position in self._retro_positions:
+            boundary1 = boundaries[position]
+            forward = self._forward_by_type.get(boundary1["event_type"])
+            if not forward:
+                continue
+            for later in forward[bisect_right(forward, position):]:
+                yield {
+                    "boundary_1": boundary1,
+                    "boundary_2": boundaries[later],
+                    "loop_type": "temporal_bootstrap",
+                    "detected_at": time.time()
+                }
+
     def find_causal_loops(self) -> List[Dict[str, Any]]:
         """
         Identify causal loops: A causes B causes A
         Bootstrap paradoxes where effect enables its own cause.
         """
-        loops = []
-        
-        # Check temporal inconsistencies for loops
-        for i, boundary1 in enumerate(self.temporal_inconsistencies):
-            for boundary2 in self.temporal_inconsistencies[i+1:]:
-                # Simplified loop detection
-                if (boundary1["is_retrocausal"] and 
-                    not boundary2["is_retrocausal"] and
-                    boundary1["event_type"] == boundary2["event_type"]):
-                    
-                    loop = {
-                        "boundary_1": boundary1,
-                        "boundary_2": boundary2,
-                        "loop_type": "temporal_bootstrap",
-                        "detected_at": time.time()
-                    }
-                    loops.append(loop)
-        
-        return loops
+        return list(self.iter_causal_loops())
+
+    def count_causal_loops(self) -> int:
+        """Number of causal loops, maintained as boundaries are tracked."""
+        return self.loop_count
     
     def get_boundary_statistics(self) -> Dict[str, Any]:
         """Get statistics on causal boundary violations"""
-        violation_types = {}
-        for paradox in self.paradoxes:
-            vtype = paradox.violation_type
-            violation_types[vtype] = violation_types.get(vtype, 0) + 1
-        
         return {
             "total_paradoxes": len(self.paradoxes),
-            "resolved_paradoxes": sum(1 for p in self.paradoxes if p.is_resolved),
+            "resolved_paradoxes": self.resolved_count,
             "temporal_inconsistencies": len(self.temporal_inconsistencies),
-            "retrocausal_events": sum(1 for t in self.temporal_inconsistencies if t["is_retrocausal"]),
-            "violation_types": violation_types,
-            "causal_loops": len(self.find_causal_loops())
+            "retrocausal_events": self.retrocausal_count,
+            "violation_types": dict(self.violation_type_counts),
+            "causal_loops": self.loop_count
         }
     
     def explore_boundary_conditions(self, scenario: str) -> List[CausalParadox]:
@@ -215,15 +270,21 @@ class CausalBoundaryExplorer:
     
     def _log_event(self, event_type: str, data: Dict):
         """Log causal boundary events"""
-        event = {
-            "type": event_type,
-            "timestamp": time.time(),
-            "data": data
-        }
+        self._log_events([(event_type, data)])
+
+    def _log_events(self, events: Iterable[Tuple[str, Dict]]):
+        """Append several causal boundary events in one write"""
+        now = time.time()
+        payload = "".join(
+            json.dumps({"type": event_type, "timestamp": now, "data": data}) + "\n"
+            for event_type, data in events
+        )
+        if not payload:
+            return
         
         try:
             with self.log_file.open("a") as f:
-                f.write(json.dumps(event) + "\n")
+                f.write(payload)
         except IOError:
             pass
 
@@ -5,12 +5,174 @@ Analyzes patterns and correlations across entity experiences.
 Implements metacognitive reflection on reasoning and decisions.
 """
 
+import heapq
 import json
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict
-import statistics
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from collections import Counter, defaultdict, deque
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Convert an ISO-8601 string or numeric timestamp to epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+class StreamingCorrelationEngine:
+    """
+    Single-pass correlation engine over time-ordered experiential logs.
+    
+    Sources are merged by timestamp with a k-way heap merge, temporal
+    correlations use a true sliding window held in a deque, and the entity
+    and quantum accumulators are updated in the same pass. Byte offsets are
+    kept per source so later calls only read newly appended records; if a
+    source gains records older than ones already folded in, the engine
+    rebuilds from scratch so the result always matches a full pass.
+    """
+    
+    def __init__(self, data_sources: List[str], time_window_seconds: float = 60.0):
+        self.data_sources = data_sources
+        self.time_window_seconds = time_window_seconds
+        self.reset()
+    
+    def reset(self):
+        """Discard all accumulators and offsets."""
+        self.offsets: Dict[str, int] = {source: 0 for source in self.data_sources}
+        self._source_keys: Dict[str, float] = {}
+        self._last_key = float('-inf')
+        self.malformed_records = 0
+        self.source_counts: Dict[str, int] = defaultdict(int)
+        self.temporal_correlations: List[Dict[str, Any]] = []
+        self.entity_state_counts: Dict[str, int] = defaultdict(int)
+        self.entity_unique_states: Dict[str, set] = defaultdict(set)
+        self.quantum_domains: Dict[str, int] = defaultdict(int)
+        self.coherence_sum = 0.0
+        self.coherence_count = 0
+        self._window: deque = deque()
+        self._window_sources: Counter = Counter()
+    
+    def _iter_source(self, source: str) -> Iterator[Tuple[float, str, Dict[str, Any], int]]:
+        """Yield (sort key, source, event, end offset) for unread records."""
+        offset = self.offsets.get(source, 0)
+        last_key = self._source_keys.get(source, float('-inf'))
+        
+        try:
+            with open(source, 'rb') as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        # Partially written record; pick it up on the next pass
+                        break
+                    offset += len(raw)
+                    if not raw.strip():
+                        continue
+                    try:
+                        event = json.loads(raw)
+                    except ValueError:
+                        # Skip the bad record for good instead of re-reading it forever
+                        self.malformed_records += 1
+                        self.offsets[source] = offset
+                        continue
+                    epoch = _to_epoch(event.get('timestamp'))
+                    # Records without a usable timestamp inherit the previous key
+                    # so each source stays non-decreasing for the merge
+                    if epoch is not None:
+                        last_key = max(last_key, epoch)
+                    yield last_key, source, event, offset
+        except Exception as e:
+            print(f"Error loading {source}: {e}")
+    
+    def process(self, incremental: bool = True) -> int:
+        """
+        Consume every record appended since the previous call.
+        
+        Args:
+            incremental: Resume from the last processed offsets; when False
+                the accumulators are cleared and every source is re-read
+        
+        Returns:
+            Number of records processed
+        """
+        if not incremental:
+            self.reset()
+        
+        for source in self.data_sources:
+            if os.path.exists(source) and os.path.getsize(source) < self.offsets.get(source, 0):
+                # A source was truncated or rotated; rebuild from scratch
+                self.reset()
+                break
+        
+        streams = [
+            self._iter_source(source)
+            for source in self.data_sources
+            if os.path.exists(source)
+        ]
+        
+        processed = 0
+        for key, source, event, end_offset in heapq.merge(*streams, key=lambda item: item[0]):
+            if key < self._last_key:
+                # A late record predates events already in the sliding window;
+                # folding it in would diverge from a full pass, so rebuild
+                for stream in streams:
+                    stream.close()
+                return self.process(incremental=False)
+            self._last_key = key
+            self._source_keys[source] = key
+            self._update(os.path.basename(source), event)
+            self.offsets[source] = end_offset
+            processed += 1
+        
+        return processed
+    
+    def _update(self, source_name: str, event: Dict[str, Any]):
+        """Fold one event into every accumulator."""
+        self.source_counts[source_name] += 1
+        
+        if source_name == 'entity_states.jsonl':
+            entity_id = event.get('id')
+            if entity_id:
+                self.entity_state_counts[entity_id] += 1
+                self.entity_unique_states[entity_id].add(event.get('state'))
+        elif source_name == 'quantum_events.jsonl':
+            domain = event.get('domain_signal', {}).get('domain')
+            if domain:
+                self.quantum_domains[domain] += 1
+        elif source_name == 'shared_reality_plane.jsonl':
+            self.coherence_sum += 1.0 if event.get('coherent') else 0.0
+            self.coherence_count += 1
+        
+        if 'timestamp' not in event:
+            return
+        epoch = _to_epoch(event['timestamp'])
+        if epoch is None:
+            return
+        
+        window = self._window
+        horizon = epoch - self.time_window_seconds
+        while window and window[0][0] < horizon:
+            _, expired_source = window.popleft()
+            self._window_sources[expired_source] -= 1
+            if not self._window_sources[expired_source]:
+                del self._window_sources[expired_source]
+        
+        window.append((epoch, source_name))
+        self._window_sources[source_name] += 1
+        
+        if len(window) > 1:
+            self.temporal_correlations.append({
+                'type': 'temporal',
+                'event_count': len(window),
+                'sources': list(self._window_sources),
+                'time_window': self.time_window_seconds,
+                'timestamp': datetime.utcnow().isoformat()
+            })
 
 
 class CorrelationAnalyzer:
@@ -27,6 +189,16 @@ class CorrelationAnalyzer:
             'data/shared_reality_plane.jsonl'
         ]
         self.correlations: List[Dict[str, Any]] = []
+        self.engine = StreamingCorrelationEngine(self.data_sources)
+    
+    def _stream(self, time_window_seconds: Optional[float] = None) -> StreamingCorrelationEngine:
+        """Bring the streaming engine up to date with the data sources."""
+        if (time_window_seconds is not None
+                and time_window_seconds != self.engine.time_window_seconds):
+            self.engine.time_window_seconds = time_window_seconds
+            self.engine.reset()
+        self.engine.process()
+        return self.engine
     
     def load_experiential_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -62,44 +234,8 @@ class CorrelationAnalyzer:
         Returns:
             List of temporally correlated events
         """
-        experiences = self.load_experiential_data()
-        
-        # Flatten all events with timestamps
-        all_events = []
-        for source, events in experiences.items():
-            for event in events:
-                if 'timestamp' in event:
-                    all_events.append({
-                        'source': source,
-                        'event': event,
-                        'timestamp': event['timestamp']
-                    })
-        
-        # Sort by timestamp
-        all_events.sort(key=lambda x: x['timestamp'])
-        
-        # Find correlations within time window
-        correlations = []
-        for i, event1 in enumerate(all_events):
-            correlated_group = [event1]
-            
-            for event2 in all_events[i+1:]:
-                # Simple time-based correlation
-                # In real implementation, would parse timestamps properly
-                if len(correlated_group) < 5:  # Limit group size
-                    correlated_group.append(event2)
-                else:
-                    break
-            
-            if len(correlated_group) > 1:
-                correlation = {
-                    'type': 'temporal',
-                    'event_count': len(correlated_group),
-                    'sources': list(set(e['source'] for e in correlated_group)),
-                    'time_window': time_window_seconds,
-                    'timestamp': datetime.utcnow().isoformat()
-                }
-                correlations.append(correlation)
+        engine = self._stream(time_window_seconds)
+        correlations = list(engine.temporal_correlations)
         
         self.correlations.extend(correlations)
         return correlations
@@ -111,27 +247,18 @@ class CorrelationAnalyzer:
         Returns:
             Entity correlation patterns
         """
-        experiences = self.load_experiential_data()
-        
-        entity_patterns = defaultdict(list)
-        
-        # Analyze entity states
-        for event in experiences.get('entity_states.jsonl', []):
-            entity_id = event.get('id')
-            if entity_id:
-                state = event.get('state')
-                entity_patterns[entity_id].append(state)
+        engine = self._stream()
         
         # Find common patterns
         correlation = {
             'type': 'entity_behavioral',
-            'unique_entities': len(entity_patterns),
+            'unique_entities': len(engine.entity_state_counts),
             'state_patterns': {
                 entity_id: {
-                    'state_count': len(states),
-                    'unique_states': len(set(states)) if states else 0
+                    'state_count': count,
+                    'unique_states': len(engine.entity_unique_states[entity_id])
                 }
-                for entity_id, states in entity_patterns.items()
+                for entity_id, count in engine.entity_state_counts.items()
             },
             'timestamp': datetime.utcnow().isoformat()
         }
@@ -146,27 +273,14 @@ class CorrelationAnalyzer:
         Returns:
             Quantum correlation patterns
         """
-        experiences = self.load_experiential_data()
-        
-        quantum_domains = defaultdict(int)
-        coherence_values = []
-        
-        for event in experiences.get('quantum_events.jsonl', []):
-            domain = event.get('domain_signal', {}).get('domain')
-            if domain:
-                quantum_domains[domain] += 1
-        
-        for event in experiences.get('shared_reality_plane.jsonl', []):
-            if event.get('coherent'):
-                coherence_values.append(1.0)
-            else:
-                coherence_values.append(0.0)
+        engine = self._stream()
+        observations = engine.coherence_count
         
         correlation = {
             'type': 'quantum_entanglement',
-            'domain_distribution': dict(quantum_domains),
-            'average_coherence': statistics.mean(coherence_values) if coherence_values else 0,
-            'observation_count': len(coherence_values),
+            'domain_distribution': dict(engine.quantum_domains),
+            'average_coherence': engine.coherence_sum / observations if observations else 0,
+            'observation_count': observations,
             'timestamp': datetime.utcnow().isoformat()
         }
         
@@ -181,9 +295,9 @@ class CorrelationAnalyzer:
         Returns:
             Comprehensive understanding of all patterns
         """
-        experiences = self.load_experiential_data()
+        experiences = self._stream().source_counts
         
-        total_experiences = sum(len(events) for events in experiences.values())
+        total_experiences = sum(experiences.values())
         
         comprehension = {
             'total_experiences': total_experiences,
@@ -5,12 +5,55 @@ Implements mathematical and physical reasoning for decision-making.
 "They will use the math and physics in deductive calculations, investigative reasonings"
 """
 
+import ast
+import atexit
+import heapq
 import json
 import math
+import re
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple, Union
 from enum import Enum
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Compiled formulas kept per FormulaEngine
+FORMULA_CACHE_SIZE = 1024
+# Reasoning records retained per reasoning type
+HISTORY_CAPACITY = 1000
+# Evicted records buffered before they are appended to the spill file
+HISTORY_SPILL_BATCH = 100
+# Numeric field of each reasoning type summarised as records arrive
+_SUMMARY_FIELDS = {
+    'mathematical': 'result',
+    'probabilistic': 'posterior_probability',
+}
+
+# Syntax a formula may use; anything else (calls, attributes, subscripts,
+# lambdas, comprehensions) is rejected before it is compiled
+_ARITHMETIC_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub,
+)
+_FORMULA_NODES = _ARITHMETIC_NODES + (
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.BoolOp, ast.And, ast.Or, ast.Not, ast.IfExp,
+)
+_EVAL_GLOBALS = {"__builtins__": {}}
+
+_WORD = re.compile(r"\w+")
+# Conditions of one rule are joined by an uppercase AND, like IF and THEN
+_CONJUNCTION = re.compile(r"\s+AND\s+")
+
 
 class ReasoningType(Enum):
     """Types of reasoning supported."""
@@ -21,14 +64,399 @@ class ReasoningType(Enum):
     QUANTUM = "quantum"
 
 
+def _python_pow(base: Any, exponent: Any) -> Any:
+    """Python's own ``**`` for one element; NaN where it fails or leaves the reals."""
+    try:
+        result = base ** exponent
+    except (ArithmeticError, ValueError):
+        return math.nan
+    return math.nan if isinstance(result, complex) else result
+
+
+if NUMPY_AVAILABLE:
+    _pow_elements = np.frompyfunc(_python_pow, 2, 1)
+
+
+def _array_pow(base: Any, exponent: Any) -> Any:
+    """
+    ``**`` for vectorised formulas.
+
+    NumPy's power is up to an ulp away from Python's for a few percent of
+    inputs, so each element goes through Python's operator instead. Rows
+    that raise or turn complex come back as NaN.
+    """
+    if not isinstance(base, np.ndarray) and not isinstance(exponent, np.ndarray):
+        return base ** exponent
+    return _pow_elements(base, exponent).astype(np.float64)
+
+
+_VECTOR_GLOBALS = {"__builtins__": {}, "__pow__": _array_pow}
+
+
+class _PowToCall(ast.NodeTransformer):
+    """Rewrite ``a ** b`` as ``__pow__(a, b)`` for the vectorised code."""
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if not isinstance(node.op, ast.Pow):
+            return node
+        call = ast.Call(
+            func=ast.Name(id='__pow__', ctx=ast.Load()),
+            args=[node.left, node.right],
+            keywords=[],
+        )
+        return ast.copy_location(call, node)
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    """A validated formula with its constants folded in."""
+    formula: str
+    code: Any
+    names: Tuple[str, ...]
+    constants: Dict[str, Any]
+    vector_code: Any = None
+
+    @property
+    def vectorisable(self) -> bool:
+        """Whether the formula is plain arithmetic and can run over arrays."""
+        return self.vector_code is not None
+
+
+class FormulaEngine:
+    """
+    Parses formulas once into a whitelisted AST and caches the compiled code.
+
+    Names that match a constant are folded into the code as literals, so a
+    formula is evaluated with only the caller's variables as its namespace,
+    and constants keep taking precedence over variables of the same name. A
+    cached formula is recompiled if the constants have changed since.
+    """
+
+    def __init__(self, constants: Dict[str, Any], cache_size: int = FORMULA_CACHE_SIZE):
+        self.constants = constants
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, CompiledFormula]" = OrderedDict()
+
+    def compile(self, formula: str) -> CompiledFormula:
+        """Return the compiled form of ``formula``, parsing it on first use."""
+        compiled = self._cache.get(formula)
+        if compiled is not None and compiled.constants == self.constants:
+            self._cache.move_to_end(formula)
+            self.hits += 1
+            return compiled
+
+        self.misses += 1
+        compiled = self._compile(formula)
+        self._cache[formula] = compiled
+        self._cache.move_to_end(formula)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return compiled
+
+    def _compile(self, formula: str) -> CompiledFormula:
+        # eval() ignores leading blanks on a source string; so do we
+        tree = ast.parse(formula.lstrip(' \t'), mode='eval')
+
+        arithmetic = True
+        for node in ast.walk(tree):
+            if not isinstance(node, _FORMULA_NODES):
+                raise ValueError(f"Unsupported syntax in formula: {type(node).__name__}")
+            if isinstance(node, ast.Name) and node.id.startswith('__'):
+                raise ValueError(f"Unsupported name in formula: {node.id}")
+            if isinstance(node, ast.Constant):
+                if not isinstance(node.value, (int, float, complex)):
+                    raise ValueError(f"Unsupported literal in formula: {node.value!r}")
+                if isinstance(node.value, (bool, complex)):
+                    arithmetic = False
+            elif not isinstance(node, _ARITHMETIC_NODES):
+                arithmetic = False
+
+        constants = dict(self.constants)
+        names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and node.id not in constants:
+                names.add(node.id)
+
+        class _FoldConstants(ast.NodeTransformer):
+            def visit_Name(self, node: ast.Name) -> ast.AST:
+                if node.id in constants:
+                    return ast.copy_location(ast.Constant(value=constants[node.id]), node)
+                return node
+
+        tree = ast.fix_missing_locations(_FoldConstants().visit(tree))
+        code = compile(tree, '<formula>', 'eval')
+
+        vector_code = None
+        if arithmetic and NUMPY_AVAILABLE:
+            vector_tree = ast.fix_missing_locations(_PowToCall().visit(tree))
+            vector_code = compile(vector_tree, '<formula>', 'eval')
+
+        return CompiledFormula(formula, code, tuple(sorted(names)), constants, vector_code)
+
+    def evaluate(self, formula: str, variables: Mapping[str, Any]) -> Any:
+        """Evaluate ``formula`` for one assignment of its variables."""
+        return eval(self.compile(formula).code, _EVAL_GLOBALS, variables)
+
+    def evaluate_batch(self, formula: str, variables: Mapping[str, Any]) -> "np.ndarray":
+        """
+        Evaluate ``formula`` over arrays of variable values in one pass.
+
+        Values are broadcast against each other and cast to float64. Every
+        operator except ``**`` is NumPy's, so a row that would raise on its
+        own (division by zero, overflow) yields inf or NaN here instead.
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("evaluate_batch requires numpy")
+        compiled = self.compile(formula)
+        if not compiled.vectorisable:
+            raise ValueError(f"Formula is not plain arithmetic: {formula}")
+
+        arrays = dict(zip(variables, np.broadcast_arrays(
+            *(np.asarray(value, dtype=np.float64) for value in variables.values())
+        )))
+        shape = np.broadcast_shapes(*(array.shape for array in arrays.values()))
+        with np.errstate(all='ignore'):
+            result = eval(compiled.vector_code, _VECTOR_GLOBALS, arrays)
+        return np.broadcast_to(np.asarray(result, dtype=np.float64), shape)
+
+
+class RuleEngine:
+    """
+    Forward-chaining inference over "IF <condition> THEN <consequence>" rules.
+    
+    A condition holds once some fact contains its words, in order, as a run
+    of whole words (case-insensitive); conditions joined by AND must all
+    hold. Facts are normalised to word tuples once. Rules are indexed by
+    condition phrase, so a new fact only looks up the phrases it contains
+    instead of being tested against every rule. Each rule counts its unmet
+    conditions and joins the agenda when the count reaches zero.
+    
+    Inference runs in rounds until no rule is left to fire. The first round
+    fires, in rule order, exactly the rules the premises satisfy; later
+    rounds fire rules unlocked by the previous round's conclusions. A rule
+    fires at most once and a known fact is never re-added, so cyclic rule
+    sets reach a fixpoint.
+    """
+    
+    def __init__(self, rules: List[str]):
+        self.rules = list(rules)
+        self._consequences: List[str] = []
+        self._consequence_words: List[Tuple[str, ...]] = []
+        self._condition_counts: List[int] = []
+        self._phrases: Dict[Tuple[str, ...], int] = {}
+        self._waiting: List[List[int]] = []
+        
+        for rule in self.rules:
+            if "IF" not in rule or "THEN" not in rule:
+                continue
+            condition, consequence = rule.split("THEN", 1)
+            condition = condition.replace("IF", "").strip()
+            consequence = consequence.strip()
+            
+            index = len(self._consequences)
+            phrases = {tuple(_WORD.findall(part.lower())) for part in _CONJUNCTION.split(condition)}
+            for phrase in phrases:
+                phrase_id = self._phrases.setdefault(phrase, len(self._waiting))
+                if phrase_id == len(self._waiting):
+                    self._waiting.append([])
+                self._waiting[phrase_id].append(index)
+            self._consequences.append(consequence)
+            self._consequence_words.append(tuple(_WORD.findall(consequence.lower())))
+            self._condition_counts.append(len(phrases))
+        
+        self._lengths = sorted({len(phrase) for phrase in self._phrases})
+    
+    def infer(self, premises: List[str], max_rounds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Chain forward from ``premises``.
+        
+        Args:
+            premises: Known facts
+            max_rounds: Stop after this many rounds even if rules remain
+            
+        Returns:
+            Conclusions in firing order, newly derived facts, the number of
+            rounds run and whether a fixpoint was reached
+        """
+        matched = bytearray(len(self._waiting))
+        unmet = list(self._condition_counts)
+        known = set()
+        ready: List[int] = []
+        
+        for premise in premises:
+            words = tuple(_WORD.findall(premise.lower()))
+            if words not in known:
+                known.add(words)
+                self._match(words, matched, unmet, ready)
+        
+        conclusions = []
+        derived = []
+        rounds = 0
+        while ready and (max_rounds is None or rounds < max_rounds):
+            rounds += 1
+            firing, ready = sorted(ready), []
+            for index in firing:
+                conclusions.append(self._consequences[index])
+                words = self._consequence_words[index]
+                if words not in known:
+                    known.add(words)
+                    derived.append(self._consequences[index])
+                    self._match(words, matched, unmet, ready)
+        
+        return {
+            'conclusions': conclusions,
+            'derived_facts': derived,
+            'rounds': rounds,
+            'fixpoint': not ready
+        }
+    
+    def _match(
+        self,
+        words: Tuple[str, ...],
+        matched: bytearray,
+        unmet: List[int],
+        ready: List[int]
+    ) -> None:
+        """Mark the condition phrases found in ``words`` and queue rules they complete."""
+        phrases = self._phrases
+        for length in self._lengths:
+            for start in range(len(words) - length + 1):
+                phrase_id = phrases.get(words[start:start + length])
+                if phrase_id is None or matched[phrase_id]:
+                    continue
+                matched[phrase_id] = 1
+                for index in self._waiting[phrase_id]:
+                    unmet[index] -= 1
+                    if not unmet[index]:
+                        ready.append(index)
+
+
+class ReasoningHistory:
+    """
+    Reasoning records kept in one bounded ring buffer per reasoning type.
+    
+    Counters and per-type summaries (first and last timestamp, and running
+    min/max/mean of the type's numeric outcome) are updated on insert, so
+    they cover every record ever added, including evicted ones. Evicted
+    records can be spilled to an append-only JSONL file; they are written
+    in batches, and flush() writes whatever is still pending. flush() also
+    runs at interpreter exit when spilling is enabled.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = HISTORY_CAPACITY,
+        spill_path: Optional[Union[str, Path]] = None,
+        spill_batch: int = HISTORY_SPILL_BATCH
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self.spill_batch = spill_batch
+        self.total = 0
+        self.evicted = 0
+        self._buffers: Dict[str, Deque[Tuple[int, Dict[str, Any]]]] = {}
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._pending_spill: List[Dict[str, Any]] = []
+        if self.spill_path is not None:
+            atexit.register(self.flush)
+    
+    def __len__(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+    
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add a record, evicting the oldest of its type when that buffer is full."""
+        rtype = record.get('type', 'unknown')
+        buffer = self._buffers.get(rtype)
+        if buffer is None:
+            buffer = self._buffers[rtype] = deque(maxlen=self.capacity)
+        elif len(buffer) == self.capacity:
+            self.evicted += 1
+            if self.spill_path is not None:
+                self._pending_spill.append(buffer[0][1])
+                if len(self._pending_spill) >= self.spill_batch:
+                    self.flush()
+        buffer.append((self.total, record))
+        self.total += 1
+        
+        timestamp = record.get('timestamp')
+        summary = self._summaries.get(rtype)
+        if summary is None:
+            summary = self._summaries[rtype] = {'count': 0, 'first_timestamp': timestamp}
+            field = _SUMMARY_FIELDS.get(rtype)
+            if field is not None:
+                summary.update(field=field, values=0, sum=0.0, min=None, max=None)
+        summary['count'] += 1
+        summary['last_timestamp'] = timestamp
+        
+        field = summary.get('field')
+        if field is not None:
+            value = record.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+                summary['values'] += 1
+                summary['sum'] += value
+                summary['min'] = value if summary['min'] is None else min(summary['min'], value)
+                summary['max'] = value if summary['max'] is None else max(summary['max'], value)
+    
+    def records(self, rtype: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retained records of one type, or of every type in insertion order."""
+        if rtype is not None:
+            return [record for _, record in self._buffers.get(rtype, ())]
+        merged = heapq.merge(*self._buffers.values(), key=itemgetter(0))
+        return [record for _, record in merged]
+    
+    def latest(self, rtype: str) -> Optional[Dict[str, Any]]:
+        """Most recent record of a type."""
+        buffer = self._buffers.get(rtype)
+        return buffer[-1][1] if buffer else None
+    
+    def count(self, rtype: str) -> int:
+        """Records of a type ever added, including evicted ones."""
+        summary = self._summaries.get(rtype)
+        return summary['count'] if summary else 0
+    
+    def counts(self) -> Dict[str, int]:
+        """Records ever added, per type."""
+        return {rtype: summary['count'] for rtype, summary in self._summaries.items()}
+    
+    def summary(self, rtype: str) -> Optional[Dict[str, Any]]:
+        """Aggregates for a type, with the mean of its numeric outcome."""
+        summary = self._summaries.get(rtype)
+        if summary is None:
+            return None
+        summary = dict(summary)
+        summary['retained'] = len(self._buffers[rtype])
+        if 'values' in summary:
+            summary['mean'] = summary['sum'] / summary['values'] if summary['values'] else None
+        return summary
+    
+    def flush(self) -> None:
+        """Append pending evicted records to the spill file."""
+        if not self._pending_spill or self.spill_path is None:
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = ''.join(json.dumps(record, default=str) + '\n' for record in self._pending_spill)
+        with open(self.spill_path, 'a') as f:
+            f.write(lines)
+        self._pending_spill = []
+
+
 class DeductiveReasoning:
     """
     Engine for deductive reasoning using mathematics and physics.
     Makes decisions based on logical inference and calculation.
     """
     
-    def __init__(self):
-        self.reasoning_history: List[Dict[str, Any]] = []
+    def __init__(
+        self,
+        history_capacity: int = HISTORY_CAPACITY,
+        history_spill_path: Optional[Union[str, Path]] = None
+    ):
+        self.history = ReasoningHistory(history_capacity, history_spill_path)
         self.constants = {
             'pi': math.pi,
             'e': math.e,
@@ -36,6 +464,17 @@ class DeductiveReasoning:
             'h': 6.62607015e-34,  # Planck constant
             'G': 6.67430e-11  # gravitational constant
         }
+        self.formulas = FormulaEngine(self.constants)
+        self._rule_engine: Optional[Tuple[Tuple[str, ...], RuleEngine]] = None
+    
+    @property
+    def reasoning_history(self) -> List[Dict[str, Any]]:
+        """Retained reasoning records of every type, oldest first."""
+        return self.history.records()
+    
+    def close(self) -> None:
+        """Write evicted reasoning records still waiting to be spilled."""
+        self.history.flush()
     
     def mathematical_deduction(
         self,
@@ -55,9 +494,9 @@ class DeductiveReasoning:
             Deduction result with conclusion
         """
         try:
-            # Evaluate formula with variables
-            local_vars = {**variables, **self.constants}
-            result = eval(formula, {"__builtins__": {}}, local_vars)
+            # Evaluate formula with variables; constants are folded into the
+            # cached code and take precedence over variables of the same name
+            result = self.formulas.evaluate(formula, variables)
             
             reasoning = {
                 'type': ReasoningType.MATHEMATICAL.value,
@@ -69,15 +508,111 @@ class DeductiveReasoning:
                 'timestamp': datetime.utcnow().isoformat()
             }
             
-            self.reasoning_history.append(reasoning)
+            self.history.append(reasoning)
             return reasoning
             
         except Exception as e:
-            return {
-                'status': 'error',
-                'error': str(e),
-                'type': ReasoningType.MATHEMATICAL.value
+            return self._deduction_error(e)
+    
+    def mathematical_deduction_batch(
+        self,
+        premises: List[str],
+        formula: str,
+        variables: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform mathematical deduction over many variable assignments.
+        
+        Each variable maps to a sequence or NumPy array with one value per
+        row; scalars are broadcast. Float columns of a plain arithmetic
+        formula are evaluated in a single vectorised pass, and rows that come
+        out non-finite there are re-evaluated on their own so they fail or
+        overflow exactly as a single call would.
+        
+        Args:
+            premises: Logical premises
+            formula: Mathematical formula to evaluate
+            variables: Variable values, one per row
+            
+        Returns:
+            One result per row, as mathematical_deduction would return it
+        """
+        names = list(variables)
+        columns, arrays = self._batch_columns(variables)
+        n_rows = len(columns[0]) if columns else 1
+        rows = [dict(zip(names, values)) for values in zip(*columns)] if columns else [{}]
+        
+        try:
+            compiled = self.formulas.compile(formula)
+        except Exception as e:
+            return [self._deduction_error(e) for _ in range(n_rows)]
+        
+        results: Optional[List[Any]] = None
+        retry = set()
+        if (compiled.vectorisable and arrays is not None
+                and all(array.dtype.kind == 'f' for array in arrays)):
+            try:
+                values = self.formulas.evaluate_batch(formula, dict(zip(names, arrays)))
+            except Exception:
+                values = None
+            if values is not None:
+                results = values.tolist()
+                retry = set(np.flatnonzero(~np.isfinite(values)).tolist())
+        
+        reasoning_type = ReasoningType.MATHEMATICAL.value
+        record = self.history.append
+        timestamp = datetime.utcnow().isoformat()
+        deductions = []
+        for index, row in enumerate(rows):
+            if results is None or index in retry:
+                try:
+                    result = self.formulas.evaluate(formula, row)
+                except Exception as e:
+                    deductions.append(self._deduction_error(e))
+                    continue
+            else:
+                result = results[index]
+            
+            reasoning = {
+                'type': reasoning_type,
+                'premises': premises,
+                'formula': formula,
+                'variables': row,
+                'result': result,
+                'conclusion': f"Mathematical deduction yields: {result}",
+                'timestamp': timestamp
             }
+            record(reasoning)
+            deductions.append(reasoning)
+        
+        return deductions
+    
+    @staticmethod
+    def _batch_columns(variables: Dict[str, Any]) -> Tuple[List[List[Any]], Optional[List[Any]]]:
+        """Broadcast batch variables to equal-length columns (and arrays, with numpy)."""
+        if NUMPY_AVAILABLE:
+            arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v)) for v in variables.values()))
+            if any(array.ndim != 1 for array in arrays):
+                raise ValueError("Batch variables must be one-dimensional")
+            return [array.tolist() for array in arrays], arrays
+        
+        lengths = {len(v) for v in variables.values() if isinstance(v, (list, tuple))}
+        if len(lengths) > 1:
+            raise ValueError(f"Batch variables have mismatched lengths: {sorted(lengths)}")
+        n_rows = lengths.pop() if lengths else 1
+        columns = [
+            list(v) if isinstance(v, (list, tuple)) else [v] * n_rows
+            for v in variables.values()
+        ]
+        return columns, None
+    
+    @staticmethod
+    def _deduction_error(error: Exception) -> Dict[str, Any]:
+        return {
+            'status': 'error',
+            'error': str(error),
+            'type': ReasoningType.MATHEMATICAL.value
+        }
     
     def physical_reasoning(
         self,
@@ -139,46 +674,47 @@ class DeductiveReasoning:
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        self.reasoning_history.append(reasoning)
+        self.history.append(reasoning)
         return reasoning
     
     def logical_deduction(
         self,
         premises: List[str],
-        rules: List[str]
+        rules: List[str],
+        max_rounds: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Perform logical deduction from premises.
         
+        Rules are chained forward (see RuleEngine): conclusions become facts
+        that can satisfy further rules until a fixpoint. The compiled rule
+        base is reused while the same rules are passed again.
+        
         Args:
             premises: Logical premises (facts)
             rules: Inference rules
+            max_rounds: Optional cap on inference rounds
             
         Returns:
             Logical conclusions
         """
-        conclusions = []
-        
-        # Simple rule-based deduction
-        for rule in rules:
-            if "IF" in rule and "THEN" in rule:
-                condition, consequence = rule.split("THEN")
-                condition = condition.replace("IF", "").strip()
-                consequence = consequence.strip()
-                
-                # Check if condition is satisfied by premises
-                if any(condition.lower() in p.lower() for p in premises):
-                    conclusions.append(consequence)
+        key = tuple(rules)
+        if self._rule_engine is None or self._rule_engine[0] != key:
+            self._rule_engine = (key, RuleEngine(rules))
+        inference = self._rule_engine[1].infer(premises, max_rounds)
         
         reasoning = {
             'type': ReasoningType.LOGICAL.value,
             'premises': premises,
             'rules': rules,
-            'conclusions': conclusions,
+            'conclusions': inference['conclusions'],
+            'derived_facts': inference['derived_facts'],
+            'inference_rounds': inference['rounds'],
+            'fixpoint': inference['fixpoint'],
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        self.reasoning_history.append(reasoning)
+        self.history.append(reasoning)
         return reasoning
     
     def probabilistic_inference(
@@ -216,7 +752,7 @@ class DeductiveReasoning:
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        self.reasoning_history.append(reasoning)
+        self.history.append(reasoning)
         return reasoning
     
     def quantum_reasoning(
@@ -257,7 +793,7 @@ class DeductiveReasoning:
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        self.reasoning_history.append(reasoning)
+        self.history.append(reasoning)
         return reasoning
     
     def investigate_decision(
@@ -301,40 +837,37 @@ class DeductiveReasoning:
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        self.reasoning_history.append(reasoning)
+        self.history.append(reasoning)
         return reasoning
     
     def get_reasoning_history(
         self,
         reasoning_type: Optional[ReasoningType] = None
     ) -> List[Dict[str, Any]]:
-        """Get reasoning history, optionally filtered by type."""
+        """Get retained reasoning history, optionally filtered by type."""
         if reasoning_type:
-            return [
-                r for r in self.reasoning_history
-                if r.get('type') == reasoning_type.value
-            ]
-        return self.reasoning_history
+            return self.history.records(reasoning_type.value)
+        return self.history.records()
     
     def synthesize_understanding(self) -> Dict[str, Any]:
         """
         Synthesize understanding from all reasoning history.
         "comprehension of their entire existence"
         
+        Counts come from the history's running counters, so they include
+        records that have since been evicted.
+        
         Returns:
             Synthesized understanding
         """
-        type_counts = {}
-        total_conclusions = len(self.reasoning_history)
-        
-        for reasoning in self.reasoning_history:
-            rtype = reasoning.get('type', 'unknown')
-            type_counts[rtype] = type_counts.get(rtype, 0) + 1
+        type_counts = self.history.counts()
+        total_conclusions = self.history.total
         
         synthesis = {
             'total_reasoning_events': total_conclusions,
             'reasoning_by_type': type_counts,
             'dominant_reasoning': max(type_counts, key=type_counts.get) if type_counts else None,
+            'reasoning_summaries': {rtype: self.history.summary(rtype) for rtype in type_counts},
             'holistic_understanding': f"Synthesized from {total_conclusions} reasoning events",
             'timestamp': datetime.utcnow().isoformat()
         }
@@ -5,21 +5,36 @@ Tracks and delegates property management to entity farm
 Creator: @Evez666
 """
 
+import atexit
+import heapq
 import json
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Routing heap holding every active delegation, for tasks whose domain has none
+# (a private sentinel so it cannot collide with any task's domain, None included)
+ANY_DOMAIN = object()
 
 
 class DomainInventoryManager:
     """
     Manages domain property inventories for outsourcing to entity farm.
     Tracks all properties across all domains.
+    
+    Tasks are routed through per-domain min-heaps of active delegations
+    ordered by the load of their entity (tasks routed to it and not yet
+    completed). Heap entries go stale when an entity's load changes and
+    are refreshed when they reach the top. Delegation log events are
+    written LOG_BATCH_SIZE at a time; the rest are written by flush(),
+    which also runs at interpreter exit.
     """
     
-    def __init__(self, creator: str = "@Evez666"):
+    LOG_BATCH_SIZE = 64
+    
+    def __init__(self, creator: str = "@Evez666", data_dir: Path = Path("data/domain_inventory")):
         self.creator = creator
-        self.data_dir = Path("data/domain_inventory")
+        self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # Domain tracking
@@ -27,9 +42,22 @@ class DomainInventoryManager:
         self.properties = {}
         self.delegations = {}
         
+        # Routing index: domain name -> heap of (load, -capacity, seq, delegation_id)
+        self.entity_load: Dict[str, int] = {}
+        self._routing_heaps: Dict[Any, List[Tuple[int, float, int, str]]] = {}
+        self._routing_members: Dict[Any, Set[str]] = {}
+        self._entity_delegations: Dict[str, Dict[str, None]] = {}
+        
+        # Routing table cache
+        self.routing_version = 0
+        self._routing_table: Optional[Dict[str, Any]] = None
+        self._routing_table_version = -1
+        
         # Logging
         self.inventory_log = self.data_dir / "inventory.jsonl"
         self.delegation_log = self.data_dir / "delegations.jsonl"
+        self._pending_events: List[str] = []
+        atexit.register(self.flush)
     
     def register_domain(
         self,
@@ -52,6 +80,7 @@ class DomainInventoryManager:
         }
         
         self.domains[domain_id] = domain
+        self.routing_version += 1
         
         self._log_inventory("domain_registered", domain)
         
@@ -84,6 +113,7 @@ class DomainInventoryManager:
         
         # Update domain property count
         self.domains[domain_id]["property_count"] += 1
+        self.routing_version += 1
         
         self._log_inventory("property_added", prop)
         
@@ -106,6 +136,14 @@ class DomainInventoryManager:
         if domain_id not in self.domains:
             raise ValueError(f"Domain {domain_id} not found")
         
+        delegation = self._delegate(domain_id, entity_id, dominion_level)
+        self._index_delegations([delegation])
+        self.flush()
+        
+        return delegation
+    
+    def _delegate(self, domain_id: str, entity_id: str, dominion_level: str) -> Dict[str, Any]:
+        """Record a delegation without indexing it or flushing the log."""
         domain = self.domains[domain_id]
         delegation_id = f"deleg-{len(self.delegations):04d}"
         
@@ -121,15 +159,114 @@ class DomainInventoryManager:
         }
         
         self.delegations[delegation_id] = delegation
+        self._entity_delegations.setdefault(entity_id, {})[delegation_id] = None
+        self.entity_load.setdefault(entity_id, 0)
         
         # Update domain
         domain["delegated_to"] = entity_id
         domain["status"] = "delegated"
+        self.routing_version += 1
         
         self._log_delegation("domain_delegated", delegation)
         
         return delegation
     
+    def revoke_delegation(self, delegation_id: str) -> Dict[str, Any]:
+        """
+        Revoke an active delegation so no more tasks are routed through it.
+        
+        The domain falls back to its most recent remaining active
+        delegation, or back to 'registered' if there is none.
+        """
+        delegation = self.delegations.get(delegation_id)
+        if delegation is None:
+            raise ValueError(f"Delegation {delegation_id} not found")
+        if delegation["status"] != "active":
+            return delegation
+        
+        delegation["status"] = "revoked"
+        delegation["revoked_at"] = time.time()
+        self._entity_delegations[delegation["entity_id"]].pop(delegation_id, None)
+        for key in (delegation["domain_name"], ANY_DOMAIN):
+            self._routing_members[key].discard(delegation_id)
+        
+        domain = self.domains[delegation["domain_id"]]
+        remaining = [
+            d for d in self.delegations.values()
+            if d["domain_id"] == delegation["domain_id"] and d["status"] == "active"
+        ]
+        domain["delegated_to"] = remaining[-1]["entity_id"] if remaining else None
+        domain["status"] = "delegated" if remaining else "registered"
+        self.routing_version += 1
+        
+        self._log_delegation("delegation_revoked", delegation)
+        self.flush()
+        
+        return delegation
+    
+    def complete_task(self, entity_id: str, count: int = 1) -> int:
+        """
+        Record tasks finished by an entity, lowering its routing load.
+        
+        Returns:
+            The entity's remaining load
+        """
+        load = self.entity_load.get(entity_id, 0)
+        new_load = max(load - count, 0)
+        if new_load == load:
+            return load
+        
+        self.entity_load[entity_id] = new_load
+        # Lower loads must be visible at once, so re-push every entry of the entity
+        for delegation_id in self._entity_delegations.get(entity_id, ()):
+            delegation = self.delegations[delegation_id]
+            for key in (delegation["domain_name"], ANY_DOMAIN):
+                self._push_route(key, delegation)
+        
+        return new_load
+    
+    def _index_delegations(self, delegations: List[Dict[str, Any]]):
+        """Add new active delegations to the routing heaps."""
+        for delegation in delegations:
+            for key in (delegation["domain_name"], ANY_DOMAIN):
+                self._routing_members.setdefault(key, set()).add(delegation["delegation_id"])
+                self._push_route(key, delegation)
+    
+    def _route_entry(self, delegation: Dict[str, Any]) -> Tuple[int, float, int, str]:
+        """Heap entry for a delegation at its entity's current load."""
+        capacity = min(delegation.get("property_count", 0) / 100, 0.5)
+        seq = int(delegation["delegation_id"].split("-")[1])
+        return (self.entity_load[delegation["entity_id"]], -capacity, seq, delegation["delegation_id"])
+    
+    def _push_route(self, key: Any, delegation: Dict[str, Any]):
+        """Push a fresh heap entry for a delegation."""
+        heap = self._routing_heaps.setdefault(key, [])
+        heapq.heappush(heap, self._route_entry(delegation))
+        
+        # Rebuild once stale entries outnumber live ones
+        members = self._routing_members.get(key, ())
+        if len(heap) > 2 * len(members) + 32:
+            heap[:] = [self._route_entry(self.delegations[d]) for d in members]
+            heapq.heapify(heap)
+    
+    def _least_loaded(self, key: Any) -> Optional[Dict[str, Any]]:
+        """Active delegation with the least loaded entity in a routing heap."""
+        heap = self._routing_heaps.get(key)
+        members = self._routing_members.get(key, ())
+        while heap:
+            load, _, _, delegation_id = heap[0]
+            if delegation_id not in members:
+                heapq.heappop(heap)
+                continue
+            delegation = self.delegations[delegation_id]
+            if load != self.entity_load[delegation["entity_id"]]:
+                # The entity took work through another heap; re-queue at its real load
+                heapq.heappop(heap)
+                self._push_route(key, delegation)
+                continue
+            return delegation
+        return None
+    
     def get_domain_inventory(self, domain_id: str) -> Dict[str, Any]:
         """Get complete inventory for a domain"""
         if domain_id not in self.domains:
@@ -156,15 +293,20 @@ class DomainInventoryManager:
     def get_entity_domains(self, entity_id: str) -> List[Dict[str, Any]]:
         """Get all domains delegated to an entity"""
         entity_delegations = [
-            deleg for deleg in self.delegations.values()
-            if deleg["entity_id"] == entity_id and deleg["status"] == "active"
+            self.delegations[delegation_id]
+            for delegation_id in self._entity_delegations.get(entity_id, ())
         ]
         
         return entity_delegations
     
     def route_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Route a task to the optimal entity based on domain affinity.
+        Route a task to the least loaded entity holding its domain.
+        
+        Ties go to the delegation with the most properties, then the
+        earliest. Tasks for a domain nobody holds go to the least loaded
+        entity overall at reduced confidence. The chosen entity's load
+        rises by one until complete_task() is called for it.
         
         Args:
             task: Task containing type, domain, priority
@@ -173,48 +315,41 @@ class DomainInventoryManager:
             Routing decision with entity_id and path
         """
         task_domain = task.get("domain", "default")
-        task_type = task.get("type", "general")
         priority = task.get("priority", "medium")
         
-        # Find entities with matching domain
-        candidates = []
-        for deleg in self.delegations.values():
-            if deleg["status"] == "active":
-                domain_match = deleg["domain_name"] == task_domain
-                candidates.append({
-                    "entity_id": deleg["entity_id"],
-                    "domain": deleg["domain_name"],
-                    "domain_match": domain_match,
-                    "property_count": deleg.get("property_count", 0)
-                })
-        
-        if not candidates:
+        winner = self._least_loaded(task_domain)
+        domain_match = winner is not None
+        if winner is None:
+            winner = self._least_loaded(ANY_DOMAIN)
+        if winner is None:
             return {"routed_to": "none", "reason": "no_delegated_entities"}
         
-        # Score candidates: domain match + capacity
-        for c in candidates:
-            c["score"] = (1.0 if c["domain_match"] else 0.3) + min(c["property_count"] / 100, 0.5)
-        
-        candidates.sort(key=lambda x: x["score"], reverse=True)
-        winner = candidates[0]
+        entity_id = winner["entity_id"]
+        score = (1.0 if domain_match else 0.3) + min(winner.get("property_count", 0) / 100, 0.5)
+        self.entity_load[entity_id] += 1
+        self._push_route(task_domain if domain_match else ANY_DOMAIN, winner)
         
         self._log_delegation("task_routed", {
             "task": task,
-            "routed_to": winner["entity_id"],
-            "score": winner["score"]
+            "routed_to": entity_id,
+            "score": score
         })
         
         return {
-            "routed_to": winner["entity_id"],
-            "domain": winner["domain"],
-            "confidence": winner["score"],
-            "priority": priority
+            "routed_to": entity_id,
+            "domain": winner["domain_name"],
+            "confidence": score,
+            "priority": priority,
+            "load": self.entity_load[entity_id]
         }
     
     def batch_delegate(self, domain_ids: List[str], entity_ids: List[str]) -> Dict[str, Any]:
         """
         Delegate multiple domains to multiple entities in batch.
         
+        Assignments are grouped by domain, so each domain is checked and
+        indexed once, and the delegation log is flushed once at the end.
+        
         Args:
             domain_ids: List of domain IDs
             entity_ids: List of entity IDs (round-robin assignment)
@@ -222,14 +357,29 @@ class DomainInventoryManager:
         Returns:
             Batch delegation result
         """
-        results = []
+        groups: Dict[str, List[Tuple[int, str]]] = {}
         for i, domain_id in enumerate(domain_ids):
             entity_id = entity_ids[i % len(entity_ids)] if entity_ids else "unassigned"
-            try:
-                result = self.delegate_domain(domain_id, entity_id, "full")
-                results.append({"domain_id": domain_id, "entity_id": entity_id, "success": True})
-            except Exception as e:
-                results.append({"domain_id": domain_id, "entity_id": entity_id, "success": False, "error": str(e)})
+            groups.setdefault(domain_id, []).append((i, entity_id))
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(domain_ids)
+        for domain_id, assignments in groups.items():
+            if domain_id not in self.domains:
+                for i, entity_id in assignments:
+                    results[i] = {
+                        "domain_id": domain_id, "entity_id": entity_id,
+                        "success": False, "error": f"Domain {domain_id} not found"
+                    }
+                continue
+            
+            delegations = [
+                self._delegate(domain_id, entity_id, "full") for _, entity_id in assignments
+            ]
+            self._index_delegations(delegations)
+            for i, entity_id in assignments:
+                results[i] = {"domain_id": domain_id, "entity_id": entity_id, "success": True}
+        
+        self.flush()
         
         return {
             "total": len(domain_ids),
@@ -238,7 +388,16 @@ class DomainInventoryManager:
         }
     
     def get_routing_table(self) -> Dict[str, Any]:
-        """Get complete routing table for all domains and entities"""
+        """
+        Get complete routing table for all domains and entities.
+        
+        The table is rebuilt only when routing_version has moved since the
+        last call; the same dict is returned otherwise, so treat it as
+        read-only.
+        """
+        if self._routing_table_version == self.routing_version:
+            return self._routing_table
+        
         routing = {}
         for domain_id, domain in self.domains.items():
             routing[domain_id] = {
@@ -248,6 +407,8 @@ class DomainInventoryManager:
                 "property_count": domain["property_count"]
             }
         
+        self._routing_table = routing
+        self._routing_table_version = self.routing_version
         return routing
     
     def get_all_inventories(self) -> Dict[str, Any]:
@@ -281,7 +442,7 @@ class DomainInventoryManager:
             pass
     
     def _log_delegation(self, event_type: str, data: Dict):
-        """Log delegation events"""
+        """Buffer delegation events, writing them in batches"""
         event = {
             "type": event_type,
             "timestamp": time.time(),
@@ -289,11 +450,21 @@ class DomainInventoryManager:
             "data": data
         }
         
+        self._pending_events.append(json.dumps(event) + "\n")
+        if len(self._pending_events) >= self.LOG_BATCH_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered events to the delegation log"""
+        if not self._pending_events:
+            return
+        
         try:
             with self.delegation_log.open("a") as f:
-                f.write(json.dumps(event) + "\n")
+                f.write("".join(self._pending_events))
         except IOError:
             pass
+        self._pending_events = []
 
 
 def main():
@@ -4,11 +4,25 @@ Limit Bypass System - Emergent Architecture Scaling
 Provides mechanisms to bypass operational limits for autonomous scaling.
 """
 
+import asyncio
 import json
 import os
+import threading
 import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+# Usage fraction of a limit above which high-watermark callbacks fire
+# (the same point at which check_limit reports "approaching")
+HIGH_WATERMARK = 0.8
+# Usage fraction at or below which low-watermark callbacks fire again
+LOW_WATERMARK = 0.5
+# Width of one usage histogram bucket, in seconds
+HISTOGRAM_BUCKET_SECONDS = 60.0
+# Histogram buckets kept per limit
+HISTOGRAM_BUCKETS = 60
 
 
 class LimitBypass:
@@ -144,6 +158,257 @@ class LimitBypass:
             pass
 
 
+class AdmissionDenied(RuntimeError):
+    """Raised when a limit has no room left for a request."""
+    
+    def __init__(self, limit_name: str, usage: int, limit: float):
+        super().__init__(f"Admission denied for {limit_name}: {usage}/{limit} in use")
+        self.limit_name = limit_name
+        self.usage = usage
+        self.limit = limit
+
+
+class _UsageCounter:
+    """Live usage of one limit; fields are guarded by ``lock``."""
+    
+    __slots__ = ("lock", "usage", "peak", "acquired", "rejected", "released",
+                 "above_high", "buckets")
+    
+    def __init__(self, history: int):
+        self.lock = threading.Lock()
+        self.usage = 0
+        self.peak = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.released = 0
+        self.above_high = False
+        # [bucket start, peak usage, acquired, rejected, released]
+        self.buckets: Deque[List[float]] = deque(maxlen=history)
+    
+    def bucket(self, start: float) -> List[float]:
+        if not self.buckets or self.buckets[-1][0] != start:
+            self.buckets.append([start, self.usage, 0, 0, 0])
+        return self.buckets[-1]
+
+
+WatermarkCallback = Callable[[str, int, float], Any]
+
+
+class AdmissionController:
+    """
+    Admission control against the live limits of a LimitBypass.
+    
+    Each limit name has a usage counter. try_acquire admits a request only
+    if the limit has room, and release returns the room; both take the
+    counter's own lock, so limits do not contend with each other. The limit
+    is read from ``bypass.limits`` on every acquire, so bypasses and
+    auto-scaling apply immediately, and unknown names are unlimited.
+    
+    Rising above the high watermark fires that limit's high callbacks
+    once; they re-arm when usage falls back to the low watermark, which
+    fires the low callbacks. Callbacks run outside the counter lock, in the
+    thread that crossed the mark. Usage is also recorded in time buckets
+    (peak usage and acquire/reject/release counts) for the last
+    ``history`` buckets.
+    """
+    
+    def __init__(
+        self,
+        bypass: Optional[LimitBypass] = None,
+        high_watermark: float = HIGH_WATERMARK,
+        low_watermark: float = LOW_WATERMARK,
+        bucket_seconds: float = HISTOGRAM_BUCKET_SECONDS,
+        history: int = HISTOGRAM_BUCKETS
+    ):
+        if not 0 < low_watermark <= high_watermark:
+            raise ValueError("Watermarks must satisfy 0 < low <= high")
+        self.bypass = bypass if bypass is not None else LimitBypass()
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.bucket_seconds = bucket_seconds
+        self.history = history
+        
+        self._counters: Dict[str, _UsageCounter] = {}
+        self._counters_lock = threading.Lock()
+        self._high_callbacks: Dict[str, List[WatermarkCallback]] = {}
+        self._low_callbacks: Dict[str, List[WatermarkCallback]] = {}
+    
+    def _counter(self, limit_name: str) -> _UsageCounter:
+        counter = self._counters.get(limit_name)
+        if counter is None:
+            with self._counters_lock:
+                counter = self._counters.setdefault(limit_name, _UsageCounter(self.history))
+        return counter
+    
+    def _bucket_start(self) -> float:
+        return time.time() // self.bucket_seconds * self.bucket_seconds
+    
+    def try_acquire(self, limit_name: str, amount: int = 1, force: bool = False) -> bool:
+        """
+        Take ``amount`` units of a limit if there is room for them.
+        
+        With ``force`` the units are always taken, e.g. to account for work
+        admitted before the controller existed.
+        """
+        limit = self.bypass.limits.get(limit_name, float('inf'))
+        counter = self._counter(limit_name)
+        start = self._bucket_start()
+        crossed = False
+        with counter.lock:
+            bucket = counter.bucket(start)
+            usage = counter.usage + amount
+            if usage > limit and not force:
+                counter.rejected += 1
+                bucket[3] += 1
+                return False
+            counter.usage = usage
+            counter.acquired += 1
+            bucket[2] += 1
+            if usage > counter.peak:
+                counter.peak = usage
+            if usage > bucket[1]:
+                bucket[1] = usage
+            if not counter.above_high and usage > limit * self.high_watermark:
+                counter.above_high = crossed = True
+        if crossed:
+            self._fire(self._high_callbacks, limit_name, usage, limit)
+        return True
+    
+    def release(self, limit_name: str, amount: int = 1) -> None:
+        """Return ``amount`` units of a limit."""
+        limit = self.bypass.limits.get(limit_name, float('inf'))
+        counter = self._counter(limit_name)
+        start = self._bucket_start()
+        crossed = False
+        with counter.lock:
+            if amount > counter.usage:
+                raise ValueError(
+                    f"Cannot release {amount} of {limit_name}: only {counter.usage} in use"
+                )
+            counter.usage = usage = counter.usage - amount
+            counter.released += 1
+            counter.bucket(start)[4] += 1
+            if counter.above_high and usage <= limit * self.low_watermark:
+                counter.above_high = False
+                crossed = True
+        if crossed:
+            self._fire(self._low_callbacks, limit_name, usage, limit)
+    
+    def acquire(self, limit_name: str, amount: int = 1) -> None:
+        """Take units of a limit or raise AdmissionDenied."""
+        if not self.try_acquire(limit_name, amount):
+            raise AdmissionDenied(limit_name, self.usage(limit_name),
+                                  self.bypass.limits.get(limit_name, float('inf')))
+    
+    @contextmanager
+    def admit(self, limit_name: str, amount: int = 1) -> Iterator[None]:
+        """Hold units of a limit for a block; raises AdmissionDenied if full."""
+        self.acquire(limit_name, amount)
+        try:
+            yield
+        finally:
+            self.release(limit_name, amount)
+    
+    async def acquire_async(self, limit_name: str, amount: int = 1, timeout: float = 0.0) -> bool:
+        """
+        Take units of a limit, waiting up to ``timeout`` seconds for room.
+        
+        Room is polled with a backoff from 1 ms to 50 ms, so releases from
+        other threads or event loops are seen without extra signalling.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while not self.try_acquire(limit_name, amount):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.05)
+        return True
+    
+    @asynccontextmanager
+    async def admit_async(self, limit_name: str, amount: int = 1,
+                          timeout: float = 0.0) -> AsyncIterator[None]:
+        """Async form of admit, optionally waiting for room."""
+        if not await self.acquire_async(limit_name, amount, timeout):
+            raise AdmissionDenied(limit_name, self.usage(limit_name),
+                                  self.bypass.limits.get(limit_name, float('inf')))
+        try:
+            yield
+        finally:
+            self.release(limit_name, amount)
+    
+    def on_high_watermark(self, limit_name: str, callback: WatermarkCallback) -> None:
+        """Call ``callback(limit_name, usage, limit)`` when usage crosses the high mark."""
+        self._high_callbacks.setdefault(limit_name, []).append(callback)
+    
+    def on_low_watermark(self, limit_name: str, callback: WatermarkCallback) -> None:
+        """Call ``callback(limit_name, usage, limit)`` when usage falls back to the low mark."""
+        self._low_callbacks.setdefault(limit_name, []).append(callback)
+    
+    def enable_auto_scale(self, limit_name: str, scale_factor: float = 2.0,
+                          ceiling: Optional[int] = None) -> None:
+        """
+        Run LimitBypass.auto_scale when a limit crosses its high watermark.
+        
+        ``ceiling`` caps how far the limit may grow; past it requests are
+        shed instead.
+        """
+        def scale(name: str, usage: int, limit: float) -> None:
+            if ceiling is None or limit * scale_factor <= ceiling:
+                self.bypass.auto_scale(name, usage, scale_factor)
+            elif limit < ceiling:
+                self.bypass.bypass_limit(name, ceiling, reason="auto_scale")
+            # The raised limit puts usage back under the mark; re-arm
+            counter = self._counter(name)
+            with counter.lock:
+                if counter.usage <= self.bypass.limits.get(name, float('inf')) * self.high_watermark:
+                    counter.above_high = False
+        
+        self.on_high_watermark(limit_name, scale)
+    
+    def _fire(self, callbacks: Dict[str, List[WatermarkCallback]],
+              limit_name: str, usage: int, limit: float) -> None:
+        for callback in callbacks.get(limit_name, ()):
+            callback(limit_name, usage, limit)
+    
+    def usage(self, limit_name: str) -> int:
+        """Units of a limit currently held."""
+        counter = self._counters.get(limit_name)
+        return counter.usage if counter is not None else 0
+    
+    def usage_histogram(self, limit_name: str) -> List[Dict[str, Any]]:
+        """Per-bucket peak usage and request counts, oldest first."""
+        counter = self._counters.get(limit_name)
+        if counter is None:
+            return []
+        with counter.lock:
+            buckets = [list(bucket) for bucket in counter.buckets]
+        return [
+            {"bucket_start": start, "peak_usage": peak, "acquired": acquired,
+             "rejected": rejected, "released": released}
+            for start, peak, acquired, rejected, released in buckets
+        ]
+    
+    def get_admission_status(self) -> Dict[str, Any]:
+        """Current usage and totals for every tracked limit."""
+        status = {}
+        for limit_name, counter in list(self._counters.items()):
+            limit = self.bypass.limits.get(limit_name, float('inf'))
+            with counter.lock:
+                status[limit_name] = {
+                    "usage": counter.usage,
+                    "limit": limit,
+                    "usage_percent": (counter.usage / limit * 100) if limit > 0 else 0,
+                    "peak": counter.peak,
+                    "acquired": counter.acquired,
+                    "rejected": counter.rejected,
+                    "released": counter.released,
+                    "above_high_watermark": counter.above_high
+                }
+        return status
+
+
 class EmergentArchitecture:
     """Manages emergent architecture with dynamic limit handling."""
     
@@ -6,21 +6,201 @@ Implements the sacred number 144,000 (12×12×1000) entity replication system.
 
 import json
 import os
+import re
 import time
+from array import array
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 import asyncio
 
 
+_REPLICA_SUFFIX = re.compile(r"^(.*)-g(\d+)-r(\d+)$")
+
+
 @dataclass
 class ReplicationGeneration:
     """Represents a generation in the replication hierarchy."""
     generation: int
     parent_id: Optional[str]
-    entities: List[str]
     created_at: str
-    
+    entity_count: int = 0
+    sample_entities: List[str] = field(default_factory=list)
+
+
+class ReplicationStore:
+    """
+    Compact lineage store for replicated entities.
+
+    Every entity is a node holding (parent index, generation, replica index)
+    in typed arrays. Replica ids are structured as
+    ``{parent}-g{generation}-r{replica}``, so ids are rebuilt from parent
+    pointers on demand rather than stored, and an id is resolved back to its
+    node by peeling suffixes down to a root. Replicating the same parent
+    into the same generation again continues its replica numbering, so ids
+    stay unique. Nothing is ever evicted, so lineage queries work for every
+    entity ever created.
+    """
+
+    NO_PARENT = -1
+
+    def __init__(self):
+        self.parents = array("i")
+        self.generations = array("H")
+        self.replica_indices = array("I")
+        self.batch_of = array("I")
+
+        # Replication batches: one per replicate call, children are contiguous
+        self.batch_first = array("I")
+        self.batch_size = array("I")
+        self.batch_replica_start = array("I")
+        self.batch_created = array("d")
+        # (parent, generation) -> batches, in creation order
+        self.children: Dict[Tuple[int, int], List[int]] = {}
+
+        self.root_names: Dict[int, str] = {}
+        self.root_index: Dict[str, int] = {}
+        self.root_meta: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate bytes held by the typed arrays."""
+        columns = (
+            self.parents, self.generations, self.replica_indices, self.batch_of,
+            self.batch_first, self.batch_size, self.batch_replica_start, self.batch_created
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def add_root(self, entity_id: str, created_at: float, **meta: Any) -> int:
+        """Register a root entity (one without a tracked parent)."""
+        index = len(self.parents)
+        self.parents.append(self.NO_PARENT)
+        self.generations.append(0)
+        self.replica_indices.append(0)
+        self.batch_of.append(len(self.batch_first))
+        self.batch_first.append(index)
+        self.batch_size.append(1)
+        self.batch_replica_start.append(0)
+        self.batch_created.append(created_at)
+        self.root_names[index] = entity_id
+        self.root_index[entity_id] = index
+        self.root_meta[index] = meta
+        return index
+
+    def add_children(self, parent: int, generation: int, count: int, created_at: float) -> int:
+        """Append ``count`` replicas of ``parent``; returns the first child index."""
+        first = len(self.parents)
+        batch = len(self.batch_first)
+        batches = self.children.setdefault((parent, generation), [])
+        if batches:
+            previous = batches[-1]
+            start = self.batch_replica_start[previous] + self.batch_size[previous]
+        else:
+            start = 0
+        batches.append(batch)
+        self.batch_first.append(first)
+        self.batch_size.append(count)
+        self.batch_replica_start.append(start)
+        self.batch_created.append(created_at)
+
+        self.parents.extend([parent] * count)
+        self.generations.extend([generation] * count)
+        self.replica_indices.extend(range(start, start + count))
+        self.batch_of.extend([batch] * count)
+        return first
+
+    def index_of(self, entity_id: str) -> Optional[int]:
+        """Resolve an entity id to its node index."""
+        suffixes = []
+        current = entity_id
+        while current not in self.root_index:
+            match = _REPLICA_SUFFIX.match(current)
+            if not match:
+                return None
+            current = match.group(1)
+            suffixes.append((int(match.group(2)), int(match.group(3))))
+
+        index = self.root_index[current]
+        for generation, replica in reversed(suffixes):
+            for batch in self.children.get((index, generation), ()):
+                offset = replica - self.batch_replica_start[batch]
+                if 0 <= offset < self.batch_size[batch]:
+                    index = self.batch_first[batch] + offset
+                    break
+            else:
+                return None
+        return index
+
+    def ancestry(self, index: int) -> List[int]:
+        """Node indices from the root down to ``index``."""
+        chain = [index]
+        while self.parents[chain[-1]] != self.NO_PARENT:
+            chain.append(self.parents[chain[-1]])
+        chain.reverse()
+        return chain
+
+    def entity_id(self, index: int) -> str:
+        """Rebuild the structured id of a node."""
+        return self.lineage_ids(index)[-1]
+
+    def lineage_ids(self, index: int) -> List[str]:
+        """Ids from the root down to ``index``."""
+        chain = self.ancestry(index)
+        ids = [self.root_names[chain[0]]]
+        for node in chain[1:]:
+            ids.append(f"{ids[-1]}-g{self.generations[node]}-r{self.replica_indices[node]}")
+        return ids
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Materialise the entity dictionary for a node."""
+        parent = self.parents[index]
+        meta = self.root_meta.get(index, {})
+        return {
+            "id": self.entity_id(index),
+            "parent_id": self.entity_id(parent) if parent != self.NO_PARENT else meta.get("parent_id"),
+            "generation": self.generations[index],
+            "replica_index": self.replica_indices[index],
+            "created_at": datetime.utcfromtimestamp(self.batch_created[self.batch_of[index]]).isoformat(),
+            "status": "active",
+            "autonomous": True,
+            "decision_authority": meta.get("decision_authority", "self")
+        }
+
+
+class EntityIdView(Sequence):
+    """Lazy, list-like view of entity ids in a ReplicationStore."""
+
+    def __init__(self, store: ReplicationStore, indices: Sequence):
+        self._store = store
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._store.entity_id(i) for i in self._indices[item]]
+        return self._store.entity_id(self._indices[item])
+
+    def __iter__(self):
+        # Walk the ids with a per-parent prefix cache instead of re-deriving each
+        store = self._store
+        prefix: Dict[int, str] = {}
+        for index in self._indices:
+            parent = store.parents[index]
+            if parent == store.NO_PARENT:
+                entity_id = store.root_names[index]
+            else:
+                parent_id = prefix.get(parent)
+                if parent_id is None:
+                    parent_id = prefix[parent] = store.entity_id(parent)
+                entity_id = f"{parent_id}-g{store.generations[index]}-r{store.replica_indices[index]}"
+            yield entity_id
+
 
 class MassReplicationSystem:
     """
@@ -36,7 +216,7 @@ class MassReplicationSystem:
     TRIBES = 12
     FOUNDATION = 12
     GENERATIONS = 1000
-    MAX_ENTITY_CACHE = 50000  # Memory limit for entity registry cache
+    LOG_BATCH_SIZE = 5000  # Replication events buffered per log write
 
     def __init__(self, data_dir: str = "data"):
         """Initialize mass replication system."""
@@ -44,11 +224,15 @@ class MassReplicationSystem:
         os.makedirs(data_dir, exist_ok=True)
 
         self.replication_log = os.path.join(data_dir, "replication.jsonl")
-        self.entity_registry = {}
-        self.generation_tree = {}
+        self.reset()
+
+    def reset(self):
+        """Forget every replicated entity (the replication log is kept)."""
+        self.store = ReplicationStore()
+        self.generation_tree: Dict[int, ReplicationGeneration] = {}
         self.total_entities = 0
-        self._entities_since_cleanup = 0  # Track entities created since last cleanup
-        
+        self._pending_events: List[str] = []
+
     def calculate_replication_capacity(self) -> Dict[str, int]:
         """Calculate current replication capacity."""
         return {
@@ -60,142 +244,159 @@ class MassReplicationSystem:
             "foundation": self.FOUNDATION,
             "generations": self.GENERATIONS
         }
-    
+
+    def _resolve_source(self, source_id: str) -> int:
+        """Find a source entity, registering an untracked id as an external root."""
+        index = self.store.index_of(source_id)
+        if index is None:
+            index = self.store.add_root(source_id, time.time(), counted=False)
+        return index
+
+    def _replicate(
+        self,
+        parent: int,
+        parent_id: str,
+        replication_count: int,
+        generation: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Create replicas of a node; returns (first child index, count)."""
+        if self.total_entities + replication_count > self.SACRED_NUMBER:
+            available = self.SACRED_NUMBER - self.total_entities
+            replication_count = min(replication_count, available)
+
+        if replication_count <= 0:
+            return len(self.store), 0
+
+        # Determine generation
+        if generation is None:
+            generation = self.store.generations[parent] + 1
+
+        now = time.time()
+        timestamp = datetime.utcfromtimestamp(now).isoformat()
+        first = self.store.add_children(parent, generation, replication_count, now)
+        replica_start = self.store.replica_indices[first]
+
+        # Log replication events; the event dict is built once per batch
+        child_prefix = f"{parent_id}-g{generation}-r"
+        event = {
+            "type": "replication",
+            "timestamp": timestamp,
+            "parent_id": parent_id,
+            "child_id": None,
+            "generation": generation,
+            "total_entities": 0
+        }
+        for i in range(replica_start, replica_start + replication_count):
+            self.total_entities += 1
+            event["child_id"] = f"{child_prefix}{i}"
+            event["total_entities"] = self.total_entities
+            self._pending_events.append(json.dumps(event) + "\n")
+        if len(self._pending_events) >= self.LOG_BATCH_SIZE:
+            self.flush()
+
+        # Update generation tree
+        gen_data = self.generation_tree.get(generation)
+        if gen_data is None:
+            gen_data = self.generation_tree[generation] = ReplicationGeneration(
+                generation=generation,
+                parent_id=parent_id,
+                created_at=timestamp
+            )
+        gen_data.entity_count += replication_count
+        missing = 10 - len(gen_data.sample_entities)
+        if missing > 0:
+            gen_data.sample_entities.extend(
+                f"{child_prefix}{i}"
+                for i in range(replica_start, replica_start + min(missing, replication_count))
+            )
+
+        return first, replication_count
+
     async def replicate_entity(
-        self, 
-        source_id: str, 
+        self,
+        source_id: str,
         replication_count: int = 1,
         generation: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Replicate an entity, creating children entities.
-        
+
         Args:
             source_id: ID of source entity to replicate
             replication_count: Number of replicas to create
             generation: Generation level (auto-calculated if None)
-            
+
         Returns:
             List of newly created entity dictionaries
         """
-        if self.total_entities + replication_count > self.SACRED_NUMBER:
-            available = self.SACRED_NUMBER - self.total_entities
-            replication_count = min(replication_count, available)
-            
-        if replication_count <= 0:
-            return []
-        
-        # Determine generation
-        if generation is None:
-            parent_gen = self.entity_registry.get(source_id, {}).get("generation", 0)
-            generation = parent_gen + 1
-        
-        # Create replicas
-        replicas = []
-        timestamp = datetime.utcnow().isoformat()
-        
-        for i in range(replication_count):
-            entity_id = f"{source_id}-g{generation}-r{i}"
-            
-            entity = {
-                "id": entity_id,
-                "parent_id": source_id,
-                "generation": generation,
-                "replica_index": i,
-                "created_at": timestamp,
-                "status": "active",
-                "autonomous": True,
-                "decision_authority": "self"
-            }
-            
-            self.entity_registry[entity_id] = entity
-            replicas.append(entity)
-            self.total_entities += 1
-            self._entities_since_cleanup += 1
+        parent = self._resolve_source(source_id)
+        first, count = self._replicate(parent, source_id, replication_count, generation)
+        self.flush()
 
-            # Perform memory cleanup every 5000 entities
-            if self._entities_since_cleanup >= 5000:
-                self._cleanup_entity_registry()
-                self._entities_since_cleanup = 0
+        return [self.store.record(index) for index in range(first, first + count)]
 
-            # Log replication event
-            self._log_replication(source_id, entity_id, generation)
-        
-        # Update generation tree
-        if generation not in self.generation_tree:
-            self.generation_tree[generation] = ReplicationGeneration(
-                generation=generation,
-                parent_id=source_id,
-                entities=[],
-                created_at=timestamp
-            )
-        
-        self.generation_tree[generation].entities.extend([r["id"] for r in replicas])
-        
-        return replicas
-    
     async def replicate_to_sacred_number(
-        self, 
+        self,
         source_id: str = "evez-genesis",
         branching_factor: int = 12
     ) -> Dict[str, Any]:
         """
         Replicate entities exponentially until reaching 144,000.
-        
+
+        Generations are expanded breadth-first over node indices; entity
+        dictionaries are never materialised and log lines are written in
+        batches of LOG_BATCH_SIZE.
+
         Args:
             source_id: Starting entity ID
             branching_factor: Replication factor per generation (default: 12)
-            
+
         Returns:
             Summary of replication process
         """
         start_time = time.time()
-        
+
         # Create genesis entity if it doesn't exist
-        if source_id not in self.entity_registry:
-            self.entity_registry[source_id] = {
-                "id": source_id,
-                "parent_id": None,
-                "generation": 0,
-                "replica_index": 0,
-                "created_at": datetime.utcnow().isoformat(),
-                "status": "active",
-                "autonomous": True,
-                "decision_authority": "collective"
-            }
+        genesis = self.store.index_of(source_id)
+        if genesis is None:
+            genesis = self.store.add_root(
+                source_id, time.time(), counted=True, decision_authority="collective"
+            )
             self.total_entities = 1
-        
+
         # Replicate in generations
-        current_generation = [source_id]
+        current_generation = [genesis]
         generation = 1
-        
+
         while self.total_entities < self.SACRED_NUMBER:
             next_generation = []
-            
-            for parent_id in current_generation:
+
+            for parent in current_generation:
                 # Calculate how many to replicate
                 remaining = self.SACRED_NUMBER - self.total_entities
                 to_replicate = min(branching_factor, remaining)
-                
+
                 if to_replicate > 0:
-                    replicas = await self.replicate_entity(
-                        parent_id, 
+                    first, count = self._replicate(
+                        parent,
+                        self.store.entity_id(parent),
                         to_replicate,
                         generation
                     )
-                    next_generation.extend([r["id"] for r in replicas])
-                
+                    next_generation.extend(range(first, first + count))
+
                 if self.total_entities >= self.SACRED_NUMBER:
                     break
-            
+
             current_generation = next_generation
             generation += 1
-            
+
             if not next_generation:
                 break
-        
+
+        self.flush()
         elapsed_time = time.time() - start_time
-        
+
         return {
             "total_entities": self.total_entities,
             "sacred_target": self.SACRED_NUMBER,
@@ -204,96 +405,56 @@ class MassReplicationSystem:
             "elapsed_time": elapsed_time,
             "entities_per_second": self.total_entities / elapsed_time if elapsed_time > 0 else 0
         }
-    
+
     def get_entity_lineage(self, entity_id: str) -> List[str]:
         """Get the ancestral lineage of an entity."""
-        lineage = [entity_id]
-        current = entity_id
-        
-        while current in self.entity_registry:
-            entity = self.entity_registry[current]
-            parent_id = entity.get("parent_id")
-            
-            if parent_id is None:
-                break
-            
-            lineage.insert(0, parent_id)
-            current = parent_id
-        
-        return lineage
-    
+        index = self.store.index_of(entity_id)
+        if index is None:
+            return [entity_id]
+        return self.store.lineage_ids(index)
+
     def get_generation_stats(self, generation: int) -> Optional[Dict[str, Any]]:
         """Get statistics for a specific generation."""
         if generation not in self.generation_tree:
             return None
-        
+
         gen_data = self.generation_tree[generation]
-        
+
         return {
             "generation": generation,
-            "entity_count": len(gen_data.entities),
+            "entity_count": gen_data.entity_count,
             "parent_id": gen_data.parent_id,
             "created_at": gen_data.created_at,
-            "entities": gen_data.entities[:10]  # Sample of first 10
+            "entities": gen_data.sample_entities  # Sample of first 10
         }
-    
-    def get_autonomous_decision_pool(self) -> List[str]:
+
+    def get_autonomous_decision_pool(self) -> Sequence:
         """
         Get all entities capable of autonomous decision-making.
         "At every point they decide what becomes"
-        """
-        return [
-            entity_id 
-            for entity_id, entity in self.entity_registry.items()
-            if entity.get("autonomous", False)
-        ]
-    
-    def _log_replication(self, parent_id: str, child_id: str, generation: int):
-        """Log replication event to sacred memory."""
-        event = {
-            "type": "replication",
-            "timestamp": datetime.utcnow().isoformat(),
-            "parent_id": parent_id,
-            "child_id": child_id,
-            "generation": generation,
-            "total_entities": self.total_entities
-        }
-
-        with open(self.replication_log, "a") as f:
-            f.write(json.dumps(event) + "\n")
 
-    def _cleanup_entity_registry(self):
+        Returns a lazy, list-like view; ids are derived as they are read.
         """
-        Periodic memory cleanup to prevent memory burns.
-        Removes old entity records when approaching memory limits.
-        """
-        if len(self.entity_registry) > self.MAX_ENTITY_CACHE:
-            # Keep only the most recent entities
-            # Sort by creation timestamp and keep newest 50%
-            sorted_entities = sorted(
-                self.entity_registry.items(),
-                key=lambda x: x[1].get("created_at", ""),
-                reverse=True
-            )
-
-            # Keep the most recent half
-            keep_count = self.MAX_ENTITY_CACHE // 2
-            entities_to_keep = dict(sorted_entities[:keep_count])
-
-            # Log cleanup event
-            removed_count = len(self.entity_registry) - len(entities_to_keep)
-            cleanup_event = {
-                "type": "memory_cleanup",
-                "timestamp": datetime.utcnow().isoformat(),
-                "entities_removed": removed_count,
-                "entities_retained": len(entities_to_keep),
-                "total_entities": self.total_entities
-            }
+        store = self.store
+        external = {
+            index for index, meta in store.root_meta.items()
+            if not meta.get("counted", True)
+        }
+        if not external:
+            return EntityIdView(store, range(len(store)))
+        return EntityIdView(
+            store,
+            array("i", (index for index in range(len(store)) if index not in external))
+        )
 
-            with open(self.replication_log, "a") as f:
-                f.write(json.dumps(cleanup_event) + "\n")
+    def flush(self):
+        """Write buffered replication events to sacred memory."""
+        if not self._pending_events:
+            return
 
-            self.entity_registry = entities_to_keep
+        with open(self.replication_log, "a") as f:
+            f.write("".join(self._pending_events))
+        self._pending_events = []
 
     def get_memory_stats(self) -> Dict[str, Any]:
         """
@@ -302,18 +463,19 @@ class MassReplicationSystem:
         Returns:
             Dictionary with memory usage information
         """
+        store_size = len(self.store)
         return {
-            "entity_registry_size": len(self.entity_registry),
+            "entity_registry_size": store_size,
+            "entity_store_bytes": self.store.nbytes,
             "generation_tree_size": len(self.generation_tree),
             "total_entities": self.total_entities,
-            "entities_since_cleanup": self._entities_since_cleanup,
-            "max_entity_cache": self.MAX_ENTITY_CACHE,
+            "pending_log_events": len(self._pending_events),
             "sacred_target": self.SACRED_NUMBER,
             "memory_pressure": {
-                "entity_registry": f"{len(self.entity_registry)}/{self.MAX_ENTITY_CACHE}",
+                "entity_store": f"{store_size} nodes / {self.store.nbytes} bytes",
                 "total_progress": f"{self.total_entities}/{self.SACRED_NUMBER}"
             },
-            "cache_usage_percent": (len(self.entity_registry) / self.MAX_ENTITY_CACHE) * 100
+            "cache_usage_percent": (store_size / self.SACRED_NUMBER) * 100
         }
 
 
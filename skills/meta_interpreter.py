@@ -8,47 +8,141 @@ meant into the means of meaning."
 
 import json
 import time
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class RunningStats:
+    """
+    Count, mean and variance of a stream of values, updated per value.
+    
+    The variance uses Welford's update. The mean is kept as a plain running
+    sum so it equals a batch average over the same values exactly.
+    """
+    
+    __slots__ = ("count", "total", "_mean", "_m2")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+    
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    @property
+    def variance(self) -> float:
+        """Population variance (0.0 for fewer than two values)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
 
 
 class MetaInterpretation:
-    """Higher-order interpretation synthesizing multiple lower interpretations"""
+    """
+    Higher-order interpretation synthesizing multiple lower interpretations.
     
-    def __init__(self, synthesis_type: str, components: List[Dict]):
+    Components may be any iterable and are folded into running statistics
+    as they arrive; they are only retained when keep_components is set.
+    """
+    
+    def __init__(self, synthesis_type: str, components: Iterable[Dict] = (),
+                 keep_components: bool = True):
         self.synthesis_type = synthesis_type
-        self.components = components
+        self.keep_components = keep_components
+        self.components: List[Dict] = []
+        self.confidence_stats = RunningStats()
         self.timestamp = time.time()
-        self.confidence = self._calculate_confidence()
-        self.ambiguity = self._calculate_ambiguity()
-        
-    def _calculate_confidence(self) -> float:
-        """Calculate confidence based on component agreement"""
-        if not self.components:
-            return 0.0
-        
-        # Average confidence of components
-        confidences = [c.get("confidence", 0.5) for c in self.components]
-        return sum(confidences) / len(confidences)
+        self.extend(components)
+    
+    def add_component(self, component: Dict):
+        """Fold one component into the interpretation."""
+        if self.keep_components:
+            self.components.append(component)
+        self.confidence_stats.add(component.get("confidence", 0.5))
     
-    def _calculate_ambiguity(self) -> float:
-        """Calculate ambiguity (higher = more divergent interpretations)"""
-        if len(self.components) < 2:
+    def extend(self, components: Iterable[Dict]):
+        """Fold a stream of components into the interpretation."""
+        add = self.confidence_stats.add
+        keep = self.components.append if self.keep_components else None
+        for component in components:
+            if keep is not None:
+                keep(component)
+            add(component.get("confidence", 0.5))
+    
+    @property
+    def component_count(self) -> int:
+        return self.confidence_stats.count
+    
+    @property
+    def confidence(self) -> float:
+        """Average confidence of components"""
+        return self.confidence_stats.mean
+    
+    @property
+    def confidence_variance(self) -> float:
+        """Spread of component confidences"""
+        return self.confidence_stats.variance
+    
+    @property
+    def ambiguity(self) -> float:
+        """Ambiguity (higher = more divergent interpretations)"""
+        if self.component_count < 2:
             return 0.0
         
         # Measure divergence in component interpretations
-        return 1.0 / len(self.components)  # Simplified
+        return 1.0 / self.component_count  # Simplified
     
     def to_dict(self) -> Dict:
         return {
             "synthesis_type": self.synthesis_type,
-            "component_count": len(self.components),
+            "component_count": self.component_count,
             "confidence": self.confidence,
+            "confidence_variance": self.confidence_variance,
             "ambiguity": self.ambiguity,
             "timestamp": self.timestamp
         }
 
 
+class SynthesisRollup:
+    """Aggregates over every meta-interpretation of one synthesis type."""
+    
+    __slots__ = ("count", "components", "confidence", "ambiguity", "latest_index")
+    
+    def __init__(self):
+        self.count = 0
+        self.components = 0
+        self.confidence = RunningStats()
+        self.ambiguity = RunningStats()
+        self.latest_index: Optional[int] = None
+    
+    def add(self, meta: MetaInterpretation, index: int):
+        self.count += 1
+        self.components += meta.component_count
+        self.confidence.add(meta.confidence)
+        self.ambiguity.add(meta.ambiguity)
+        self.latest_index = index
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "component_count": self.components,
+            "average_confidence": self.confidence.mean,
+            "confidence_variance": self.confidence.variance,
+            "average_ambiguity": self.ambiguity.mean,
+            "ambiguity_variance": self.ambiguity.variance,
+            "latest_index": self.latest_index
+        }
+
+
 class MetaInterpreter:
     """
     Synthesizes multiple interpretations into higher-order meanings.
@@ -58,26 +152,47 @@ class MetaInterpreter:
     - Synthesis across semantic, causal, and path domains
     - Preservation of ambiguity when fundamental
     - Emergence of new meanings from interpretation composition
+    
+    Every synthesis updates a rollup for its type and one for all types, so
+    the hierarchy and report cost O(types) however many interpretations and
+    components have been seen. Log events are buffered and written
+    LOG_BATCH_SIZE at a time; call flush() to write the rest.
     """
     
-    def __init__(self, data_dir: Path = Path("data")):
+    LOG_BATCH_SIZE = 64
+    
+    def __init__(self, data_dir: Path = Path("data"), keep_components: bool = True):
         self.data_dir = data_dir
         self.data_dir.mkdir(exist_ok=True)
         self.log_file = self.data_dir / "meta_interpretations.jsonl"
+        self.keep_components = keep_components
         
         self.meta_interpretations: List[MetaInterpretation] = []
         self.synthesis_history = []
+        self.rollups: Dict[str, SynthesisRollup] = {}
+        self.totals = SynthesisRollup()
+        self._pending_events: List[str] = []
+    
+    def _record(self, meta: MetaInterpretation) -> MetaInterpretation:
+        """Store a meta-interpretation and fold it into the rollups."""
+        index = len(self.meta_interpretations)
+        self.meta_interpretations.append(meta)
+        rollup = self.rollups.get(meta.synthesis_type)
+        if rollup is None:
+            rollup = self.rollups[meta.synthesis_type] = SynthesisRollup()
+        rollup.add(meta, index)
+        self.totals.add(meta, index)
+        return meta
         
     def synthesize_semantic_interpretations(self, interpretations: List[Dict]) -> MetaInterpretation:
         """
         Synthesize multiple semantic interpretations into meta-meaning.
         Captures "all possible meanings" in unified form.
         """
-        meta = MetaInterpretation("semantic_synthesis", interpretations)
-        self.meta_interpretations.append(meta)
+        meta = self._record(MetaInterpretation("semantic_synthesis", interpretations, self.keep_components))
         
         self._log_event("semantic_synthesis", {
-            "component_count": len(interpretations),
+            "component_count": meta.component_count,
             "confidence": meta.confidence,
             "ambiguity": meta.ambiguity
         })
@@ -89,11 +204,10 @@ class MetaInterpreter:
         Synthesize causal paradoxes into meta-understanding.
         Recognizes when contradictions are fundamental vs resolvable.
         """
-        meta = MetaInterpretation("causal_paradox_synthesis", paradoxes)
-        self.meta_interpretations.append(meta)
+        meta = self._record(MetaInterpretation("causal_paradox_synthesis", paradoxes, self.keep_components))
         
         self._log_event("causal_synthesis", {
-            "paradox_count": len(paradoxes),
+            "paradox_count": meta.component_count,
             "fundamental_ambiguity": meta.ambiguity
         })
         
@@ -103,11 +217,10 @@ class MetaInterpreter:
         """
         Synthesize multiple execution paths into optimal procession meta-understanding.
         """
-        meta = MetaInterpretation("path_synthesis", paths)
-        self.meta_interpretations.append(meta)
+        meta = self._record(MetaInterpretation("path_synthesis", paths, self.keep_components))
         
         self._log_event("path_synthesis", {
-            "path_count": len(paths),
+            "path_count": meta.component_count,
             "optimal_convergence": 1.0 - meta.ambiguity
         })
         
@@ -120,13 +233,13 @@ class MetaInterpreter:
         Create unified meta-interpretation across all domains.
         Ultimate synthesis: "all that could have been meant into means of meaning"
         """
-        all_components = semantic + causal + paths
-        
-        meta = MetaInterpretation("unified_synthesis", all_components)
-        self.meta_interpretations.append(meta)
+        # Stream the three domains through without concatenating them
+        meta = self._record(MetaInterpretation(
+            "unified_synthesis", chain(semantic, causal, paths), self.keep_components
+        ))
         
         self._log_event("unified_synthesis", {
-            "total_components": len(all_components),
+            "total_components": meta.component_count,
             "semantic_count": len(semantic),
             "causal_count": len(causal),
             "path_count": len(paths),
@@ -150,7 +263,7 @@ class MetaInterpreter:
         
         # Simplified emergent meaning extraction
         if meta.synthesis_type == "semantic_synthesis":
-            emergent.append(f"Superposition of {len(meta.components)} meanings creates quantum semantic state")
+            emergent.append(f"Superposition of {meta.component_count} meanings creates quantum semantic state")
         elif meta.synthesis_type == "causal_paradox_synthesis":
             emergent.append(f"Paradoxes preserved as fundamental ambiguity: {meta.ambiguity:.2f}")
         elif meta.synthesis_type == "path_synthesis":
@@ -184,26 +297,14 @@ class MetaInterpreter:
         Get hierarchical view of interpretations:
         Raw → Interpretations → Meta-interpretations → Emergent meanings
         """
-        hierarchy = {
-            "total_meta_interpretations": len(self.meta_interpretations),
-            "by_type": {},
-            "average_confidence": 0.0,
-            "average_ambiguity": 0.0
+        return {
+            "total_meta_interpretations": self.totals.count,
+            "by_type": {stype: rollup.to_dict() for stype, rollup in self.rollups.items()},
+            "average_confidence": self.totals.confidence.mean,
+            "average_ambiguity": self.totals.ambiguity.mean,
+            "confidence_variance": self.totals.confidence.variance,
+            "ambiguity_variance": self.totals.ambiguity.variance
         }
-        
-        if self.meta_interpretations:
-            # Group by type
-            for meta in self.meta_interpretations:
-                stype = meta.synthesis_type
-                if stype not in hierarchy["by_type"]:
-                    hierarchy["by_type"][stype] = []
-                hierarchy["by_type"][stype].append(meta.to_dict())
-            
-            # Averages
-            hierarchy["average_confidence"] = sum(m.confidence for m in self.meta_interpretations) / len(self.meta_interpretations)
-            hierarchy["average_ambiguity"] = sum(m.ambiguity for m in self.meta_interpretations) / len(self.meta_interpretations)
-        
-        return hierarchy
     
     def generate_meaning_report(self) -> str:
         """
@@ -222,14 +323,14 @@ class MetaInterpreter:
         lines.append(f"Average Ambiguity: {hierarchy['average_ambiguity']:.2f}")
         
         lines.append("\nBy Type:")
-        for stype, metas in hierarchy["by_type"].items():
-            lines.append(f"  {stype}: {len(metas)} interpretations")
+        for stype, rollup in hierarchy["by_type"].items():
+            lines.append(f"  {stype}: {rollup['count']} interpretations")
         
-        lines.append("\nEmergent Meanings:")
-        for i, meta in enumerate(self.meta_interpretations):
+        lines.append("\nEmergent Meanings (latest of each type):")
+        for i in sorted(rollup.latest_index for rollup in self.rollups.values()):
             emergent = self.extract_emergent_meanings(i)
             if emergent:
-                lines.append(f"  [{i}] {meta.synthesis_type}:")
+                lines.append(f"  [{i}] {self.meta_interpretations[i].synthesis_type}:")
                 for meaning in emergent:
                     lines.append(f"      - {meaning}")
         
@@ -238,18 +339,27 @@ class MetaInterpreter:
         return "\n".join(lines)
     
     def _log_event(self, event_type: str, data: Dict):
-        """Log meta-interpretation events"""
+        """Buffer a meta-interpretation event for the log"""
         event = {
             "type": event_type,
             "timestamp": time.time(),
             "data": data
         }
+        self._pending_events.append(json.dumps(event) + "\n")
+        if len(self._pending_events) >= self.LOG_BATCH_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered events to the meta-interpretation log"""
+        if not self._pending_events:
+            return
         
         try:
             with self.log_file.open("a") as f:
-                f.write(json.dumps(event) + "\n")
+                f.write("".join(self._pending_events))
         except IOError:
             pass
+        self._pending_events = []
 
 
 def perform_meta_interpretation(semantic_data: List[Dict], 
@@ -280,6 +390,7 @@ def perform_meta_interpretation(semantic_data: List[Dict],
     
     # Generate report
     report = interpreter.generate_meaning_report()
+    interpreter.flush()
     
     return {
         "semantic_meta": semantic_meta.to_dict(),
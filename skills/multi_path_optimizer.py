@@ -3,47 +3,108 @@ Multi-Path Optimizer - Parallel State Exploration & Optimal Procession Selection
 
 Explores "optimal states of procession" by maintaining and evaluating
 multiple parallel execution paths simultaneously.
+
+Paths are chains of parent pointers: a branch shares its parent's states
+instead of copying them, and scores are computed from per-path counters in
+O(1). ``BeamSearch`` explores with a bounded frontier (beam width and max
+depth) and a pluggable scorer, optionally expanding across a process pool.
 """
 
+import heapq
+import itertools
 import json
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class StateNode:
+    """One state in the exploration tree; a path is its chain of parents."""
+
+    __slots__ = ("state", "parent", "length")
+
+    def __init__(self, state: Dict[str, Any], parent: Optional["StateNode"] = None):
+        self.state = state
+        self.parent = parent
+        self.length = 1 if parent is None else parent.length + 1
+
+    def states(self) -> List[Dict[str, Any]]:
+        """States from the root to this node."""
+        chain = []
+        node = self
+        while node is not None:
+            chain.append(node.state)
+            node = node.parent
+        chain.reverse()
+        return chain
+
+    def __reduce__(self):
+        # Pickle the chain as a flat list: the default recursive pickling of
+        # parent links overflows the stack on deep paths
+        return (_rebuild_chain, (self.states(),))
+
+
+def _rebuild_chain(states: List[Dict[str, Any]]) -> StateNode:
+    """Rebuild a StateNode chain from its states, root first."""
+    node = None
+    for state in states:
+        node = StateNode(state, node)
+    return node
+
+
+def coherence_change(prev_state: Dict, new_state: Dict) -> float:
+    """Calculate how coherent the state transition is"""
+    # Simplified: check if new state builds on previous
+    shared_keys = set(prev_state.keys()) & set(new_state.keys())
+    coherence = len(shared_keys) / max(len(set(prev_state.keys()) | set(new_state.keys())), 1)
+    return max(0.7, min(1.0, coherence + 0.3))
 
 
 class ExecutionPath:
     """Single path through state space"""
     
-    def __init__(self, path_id: str, initial_state: Dict[str, Any]):
+    def __init__(self, path_id: str, initial_state: Dict[str, Any],
+                 node: Optional[StateNode] = None):
         self.path_id = path_id
-        self.states = [initial_state]
+        self.node = node if node is not None else StateNode(initial_state)
         self.score = 0.0
         self.coherence = 1.0
         self.timestamp = time.time()
         self.is_optimal = False
+
+    @property
+    def states(self) -> List[Dict[str, Any]]:
+        """All states of the path (materialised from the parent chain)."""
+        return self.node.states()
+
+    @property
+    def last_state(self) -> Dict[str, Any]:
+        return self.node.state
+
+    def __len__(self) -> int:
+        return self.node.length
         
     def add_state(self, state: Dict[str, Any]):
         """Add state to path"""
-        self.states.append(state)
+        self.node = StateNode(state, self.node)
+
+    def extend(self, path_id: str, state: Dict[str, Any],
+               coherence: Optional[float] = None) -> "ExecutionPath":
+        """New path sharing this path's states plus ``state``."""
+        child = ExecutionPath(path_id, state, node=StateNode(state, self.node))
+        child.coherence = self.coherence if coherence is None else coherence
+        return child
         
     def calculate_score(self) -> float:
         """Calculate path quality score"""
-        # Factors: length, coherence, final state value
-        length_score = len(self.states) / 100  # Normalize
-        
-        # Final state value
-        final_value = self.states[-1].get("value", 0.0) if self.states else 0.0
-        
-        # Coherence penalty
-        coherence_factor = self.coherence
-        
-        self.score = (length_score * 0.3 + final_value * 0.5 + coherence_factor * 0.2)
+        self.score = default_path_score(self)
         return self.score
     
     def to_dict(self) -> Dict:
         return {
             "path_id": self.path_id,
-            "states_count": len(self.states),
+            "states_count": len(self),
             "score": self.score,
             "coherence": self.coherence,
             "is_optimal": self.is_optimal,
@@ -51,6 +112,149 @@ class ExecutionPath:
         }
 
 
+def default_path_score(path: ExecutionPath) -> float:
+    """Default scorer: length, final state value and coherence."""
+    # Factors: length, coherence, final state value
+    length_score = len(path) / 100  # Normalize
+    
+    # Final state value
+    final_value = path.last_state.get("value", 0.0)
+    
+    # Coherence penalty
+    coherence_factor = path.coherence
+    
+    return length_score * 0.3 + final_value * 0.5 + coherence_factor * 0.2
+
+
+Scorer = Callable[[ExecutionPath], float]
+Expander = Callable[[ExecutionPath], Iterable[Dict[str, Any]]]
+
+
+class DecisionExpander:
+    """
+    Default successor generator: ``branches`` choices per step whose values
+    spread around the current value by ``step``.
+    """
+
+    def __init__(self, branches: int = 3, step: float = 0.05):
+        self.branches = branches
+        self.step = step
+
+    def __call__(self, path: ExecutionPath) -> List[Dict[str, Any]]:
+        level = len(path)
+        value = path.last_state.get("value", 0.5)
+        middle = (self.branches - 1) / 2
+        return [
+            {
+                "level": level,
+                "value": value + (choice - middle) * self.step,
+                "decision": f"choice_{choice}_{level}",
+            }
+            for choice in range(self.branches)
+        ]
+
+
+def _expand_paths(expand: Expander, scorer: Scorer,
+                  paths: List[ExecutionPath]) -> List[List[Tuple[Dict[str, Any], float, float]]]:
+    """(state, coherence, score) for every successor of every path."""
+    results = []
+    for path in paths:
+        successors = []
+        for state in expand(path):
+            coherence = path.coherence * coherence_change(path.last_state, state)
+            child = path.extend(path.path_id, state, coherence)
+            successors.append((state, coherence, scorer(child)))
+        results.append(successors)
+    return results
+
+
+class BeamSearch:
+    """
+    Bounded best-first exploration of execution paths.
+
+    Each level expands every frontier path with ``expand`` and keeps the
+    ``beam_width`` best successors by ``scorer`` in a min-heap, so memory
+    is O(beam_width * max_depth) shared nodes however wide the tree is.
+    The ``top_n`` best paths seen at any depth are kept in a second heap.
+    With ``processes`` > 1 successor generation and scoring run in a process
+    pool; ``expand`` and ``scorer`` must then be picklable (module-level
+    functions or instances of module-level classes).
+    """
+
+    def __init__(
+        self,
+        expand: Optional[Expander] = None,
+        scorer: Optional[Scorer] = None,
+        beam_width: int = 8,
+        max_depth: int = 10,
+        top_n: int = 3,
+        processes: Optional[int] = None,
+    ):
+        if beam_width < 1:
+            raise ValueError("beam_width must be at least 1")
+        self.expand = expand or DecisionExpander()
+        self.scorer = scorer or default_path_score
+        self.beam_width = beam_width
+        self.max_depth = max_depth
+        self.top_n = top_n
+        self.processes = processes
+        self.expanded = 0
+        self.generated = 0
+
+    def _successors(self, frontier: List[ExecutionPath], pool: Optional[ProcessPoolExecutor]):
+        if pool is None:
+            return _expand_paths(self.expand, self.scorer, frontier)
+        size = max(1, -(-len(frontier) // self.processes))
+        chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+        results = []
+        for chunk_result in pool.map(_expand_paths, itertools.repeat(self.expand),
+                                     itertools.repeat(self.scorer), chunks):
+            results.extend(chunk_result)
+        return results
+
+    def run(self, initial_state: Dict[str, Any], path_id: str = "beam") -> List[ExecutionPath]:
+        """Explore from ``initial_state``; returns the best paths, best first."""
+        root = ExecutionPath(path_id, initial_state)
+        root.score = self.scorer(root)
+        counter = itertools.count()
+        best: List[Tuple[float, int, ExecutionPath]] = []
+        self._offer(best, self.top_n, root, counter)
+
+        frontier = [root]
+        pool = ProcessPoolExecutor(max_workers=self.processes) if self.processes and self.processes > 1 else None
+        try:
+            for _ in range(self.max_depth):
+                beam: List[Tuple[float, int, ExecutionPath]] = []
+                for parent, successors in zip(frontier, self._successors(frontier, pool)):
+                    self.expanded += 1
+                    for state, coherence, score in successors:
+                        self.generated += 1
+                        if len(beam) >= self.beam_width and score <= beam[0][0]:
+                            continue
+                        child = parent.extend(f"{path_id}-{self.generated}", state, coherence)
+                        child.score = score
+                        self._offer(beam, self.beam_width, child, counter)
+                if not beam:
+                    break
+                frontier = [path for _, _, path in sorted(beam, key=lambda item: (-item[0], -item[1]))]
+                for path in frontier:
+                    self._offer(best, self.top_n, path, counter)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return [path for _, _, path in sorted(best, key=lambda item: (-item[0], -item[1]))]
+
+    @staticmethod
+    def _offer(heap: List, capacity: int, path: ExecutionPath, counter) -> None:
+        # Ties keep the path generated first: later paths carry a smaller key
+        item = (path.score, -next(counter), path)
+        if len(heap) < capacity:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+
+
 class MultiPathOptimizer:
     """
     Manages parallel exploration of multiple execution paths.
@@ -95,17 +299,9 @@ class MultiPathOptimizer:
         
         parent = self.paths[parent_idx]
         
-        # Create child path with parent's history
+        # Child shares the parent's history and adds the branch state
         child_id = f"{parent.path_id}-{branch_id}"
-        child = ExecutionPath(child_id, parent.states[0])
-        
-        # Copy parent states
-        for state in parent.states[1:]:
-            child.add_state(state)
-        
-        # Add branch state
-        child.add_state(branch_state)
-        child.coherence = parent.coherence * 0.9  # Branching reduces coherence
+        child = parent.extend(child_id, branch_state, parent.coherence * 0.9)  # Branching reduces coherence
         
         self.paths.append(child)
         
@@ -124,23 +320,17 @@ class MultiPathOptimizer:
             return False
         
         path = self.paths[path_idx]
+        previous = path.last_state
         path.add_state(new_state)
         
         # Update coherence based on state transition
-        coherence_change = self._calculate_coherence_change(
-            path.states[-2] if len(path.states) > 1 else {},
-            new_state
-        )
-        path.coherence *= coherence_change
+        path.coherence *= self._calculate_coherence_change(previous, new_state)
         
         return True
     
     def _calculate_coherence_change(self, prev_state: Dict, new_state: Dict) -> float:
         """Calculate how coherent the state transition is"""
-        # Simplified: check if new state builds on previous
-        shared_keys = set(prev_state.keys()) & set(new_state.keys())
-        coherence = len(shared_keys) / max(len(set(prev_state.keys()) | set(new_state.keys())), 1)
-        return max(0.7, min(1.0, coherence + 0.3))
+        return coherence_change(prev_state, new_state)
     
     def find_optimal_paths(self, top_n: int = 3) -> List[ExecutionPath]:
         """
@@ -151,11 +341,10 @@ class MultiPathOptimizer:
         for path in self.paths:
             path.calculate_score()
         
-        # Sort by score
-        sorted_paths = sorted(self.paths, key=lambda p: p.score, reverse=True)
+        # Partial selection of the top N (same order as a stable sort)
+        optimal = heapq.nlargest(top_n, self.paths, key=lambda p: p.score)
         
         # Mark top N as optimal
-        optimal = sorted_paths[:top_n]
         for path in optimal:
             path.is_optimal = True
         
@@ -203,6 +392,37 @@ class MultiPathOptimizer:
                     self.branch_path(path_idx, f"alt-{level}", branch_state)
         
         return root_paths
+
+    def beam_exploration(self, initial_state: Dict[str, Any],
+                         expand: Optional[Expander] = None,
+                         scorer: Optional[Scorer] = None,
+                         beam_width: int = 8, max_depth: int = 10,
+                         top_n: int = 3,
+                         processes: Optional[int] = None) -> List[ExecutionPath]:
+        """
+        Bounded exploration from initial state with ``BeamSearch``.
+        Keeps at most ``beam_width`` paths per level and returns the
+        ``top_n`` best paths found, which also become the optimal paths.
+        """
+        search = BeamSearch(expand=expand, scorer=scorer, beam_width=beam_width,
+                            max_depth=max_depth, top_n=top_n, processes=processes)
+        optimal = search.run(initial_state, path_id=f"beam-{len(self.paths)}")
+        for path in optimal:
+            path.is_optimal = True
+        self.paths.extend(optimal)
+        self.optimal_paths = optimal
+
+        # One event per search rather than one per step
+        self._log_event("beam_search_completed", {
+            "beam_width": beam_width,
+            "max_depth": max_depth,
+            "expanded": search.expanded,
+            "generated": search.generated,
+            "scores": [p.score for p in optimal],
+            "paths": [p.path_id for p in optimal]
+        })
+
+        return optimal
     
     def get_path_statistics(self) -> Dict[str, Any]:
         """Get statistics on path exploration"""
@@ -220,7 +440,7 @@ class MultiPathOptimizer:
             "average_score": sum(p.score for p in self.paths) / len(self.paths),
             "average_coherence": sum(p.coherence for p in self.paths) / len(self.paths),
             "max_score": max(p.score for p in self.paths),
-            "total_states": sum(len(p.states) for p in self.paths)
+            "total_states": sum(len(p) for p in self.paths)
         }
     
     def compare_paths(self, idx1: int, idx2: int) -> Dict[str, Any]:
@@ -236,7 +456,7 @@ class MultiPathOptimizer:
             "path2_id": path2.path_id,
             "score_difference": abs(path1.score - path2.score),
             "coherence_difference": abs(path1.coherence - path2.coherence),
-            "length_difference": abs(len(path1.states) - len(path2.states)),
+            "length_difference": abs(len(path1) - len(path2)),
             "both_optimal": path1.is_optimal and path2.is_optimal
         }
     
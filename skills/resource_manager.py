@@ -5,13 +5,24 @@ Manages resource accumulation, distribution, and collective intelligence pooling
 Implements "redistributing the values equal under the powers of one becoming many".
 """
 
+import hashlib
 import json
 import os
+import threading
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Bytes of the log head fingerprinted into each snapshot
+LOG_IDENTITY_BYTES = 4096
+
 
 class ResourceType(Enum):
     """Types of resources that can be managed."""
@@ -61,11 +72,21 @@ class ResourceManager:
     across quantum entities for collective intelligence.
     """
     
-    def __init__(self, resource_file: str = 'data/resource_manager.jsonl'):
+    def __init__(
+        self,
+        resource_file: str = 'data/resource_manager.jsonl',
+        snapshot_interval: int = 1000
+    ):
         self.resource_file = resource_file
+        self.snapshot_file = os.path.splitext(resource_file)[0] + '.snapshot.json'
+        self.snapshot_interval = snapshot_interval
         self.resource_pools: Dict[ResourceType, ResourcePool] = {}
         self.allocations: List[ResourceAllocation] = []
         self.entity_resources: Dict[str, Dict[ResourceType, float]] = {}
+        # Guards every check-and-debit so worker threads cannot oversubscribe a pool
+        self._lock = threading.RLock()
+        self._log_offset = 0
+        self._events_since_snapshot = 0
         self._initialize_pools()
         self._load_state()
     
@@ -84,27 +105,214 @@ class ResourceManager:
             )
     
     def _load_state(self):
-        """Load resource state from file."""
-        if not os.path.exists(self.resource_file):
+        """
+        Rebuild the resource ledger from the latest snapshot plus the event log.
+        
+        The snapshot records the log offset it covers, so only events appended
+        after it are replayed. A snapshot that no longer matches the log (the log
+        was truncated or replaced) is ignored and the full log is replayed.
+        """
+        offset, identity = self._load_snapshot()
+        log_exists = os.path.exists(self.resource_file)
+        
+        if offset and (
+            offset > (os.path.getsize(self.resource_file) if log_exists else 0)
+            or identity != self._log_identity(offset)
+        ):
+            self.allocations = []
+            self.entity_resources = {}
+            self._initialize_pools()
+            offset = 0
+        
+        if not log_exists:
             return
         
         try:
-            with open(self.resource_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        if data.get('type') == 'allocation':
-                            # Reconstruction would happen here
-                            pass
+            with open(self.resource_file, 'rb') as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        # Partially written trailing record; leave it for the next replay
+                        break
+                    offset += len(raw)
+                    if raw.strip():
+                        self._apply_event(json.loads(raw))
+                        self._events_since_snapshot += 1
         except Exception as e:
             print(f"Error loading resource state: {e}")
+        
+        self._log_offset = offset
+    
+    def _log_identity(self, offset: int) -> Optional[str]:
+        """Fingerprint of the log's first bytes, tying a snapshot to one log file."""
+        try:
+            with open(self.resource_file, 'rb') as f:
+                head = f.read(min(offset, LOG_IDENTITY_BYTES))
+        except OSError:
+            return None
+        return hashlib.sha256(head).hexdigest()
+    
+    def _load_snapshot(self):
+        """Restore state from the snapshot file; returns (log offset, log identity)."""
+        if not os.path.exists(self.snapshot_file):
+            return 0, None
+        
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+            
+            for pool_data in snapshot['pools']:
+                resource_type = ResourceType(pool_data['resource_type'])
+                self.resource_pools[resource_type] = ResourcePool(
+                    resource_type=resource_type,
+                    total_amount=pool_data['total_amount'],
+                    allocated=pool_data['allocated'],
+                    available=pool_data['available'],
+                    timestamp=pool_data['timestamp']
+                )
+            
+            self.allocations = [
+                ResourceAllocation(
+                    entity_id=a['entity_id'],
+                    resource_type=ResourceType(a['resource_type']),
+                    amount=a['amount'],
+                    priority=a['priority'],
+                    purpose=a['purpose'],
+                    timestamp=a['timestamp']
+                )
+                for a in snapshot['allocations']
+            ]
+            self.entity_resources = {
+                entity_id: {ResourceType(rt): amount for rt, amount in resources.items()}
+                for entity_id, resources in snapshot['entity_resources'].items()
+            }
+            return int(snapshot['log_offset']), snapshot.get('log_identity')
+        except Exception as e:
+            print(f"Error loading resource snapshot: {e}")
+            self.allocations = []
+            self.entity_resources = {}
+            self._initialize_pools()
+            return 0, None
+    
+    def _apply_event(self, event: Dict[str, Any]):
+        """Apply a single logged event to the in-memory ledger."""
+        event_type = event.get('type')
+        
+        if event_type == 'accumulation':
+            pool = self.resource_pools[ResourceType(event['resource_type'])]
+            pool.total_amount += event['amount']
+            pool.available += event['amount']
+            pool.timestamp = event['timestamp']
+        
+        elif event_type == 'allocation':
+            self._apply_allocation(
+                event['entity_id'],
+                ResourceType(event['resource_type']),
+                event['amount'],
+                event.get('priority', 5),
+                event.get('purpose', 'general'),
+                event['timestamp']
+            )
+        
+        elif event_type == 'batch_allocation':
+            resource_type = ResourceType(event['resource_type'])
+            for entry in event['allocations']:
+                self._apply_allocation(
+                    entry['entity_id'],
+                    resource_type,
+                    entry['amount'],
+                    entry.get('priority', 5),
+                    event.get('purpose', 'general'),
+                    event['timestamp']
+                )
+            self._settle_pool(self.resource_pools[resource_type])
+    
+    @staticmethod
+    def _settle_pool(pool: ResourcePool):
+        """Clamp the float residue left when a batch splits the whole pool."""
+        if abs(pool.available) < 1e-9:
+            pool.allocated += pool.available
+            pool.available = 0.0
+    
+    def _apply_allocation(
+        self,
+        entity_id: str,
+        resource_type: ResourceType,
+        amount: float,
+        priority: int,
+        purpose: str,
+        timestamp: str
+    ) -> float:
+        """Debit a pool and credit an entity; returns the entity's new total."""
+        pool = self.resource_pools[resource_type]
+        pool.available -= amount
+        pool.allocated += amount
+        pool.timestamp = timestamp
+        
+        self.allocations.append(ResourceAllocation(
+            entity_id=entity_id,
+            resource_type=resource_type,
+            amount=amount,
+            priority=priority,
+            purpose=purpose,
+            timestamp=timestamp
+        ))
+        
+        resources = self.entity_resources.setdefault(entity_id, {})
+        resources[resource_type] = resources.get(resource_type, 0.0) + amount
+        return resources[resource_type]
     
     def _save_event(self, event: Dict[str, Any]):
         """Save resource event to file."""
         os.makedirs(os.path.dirname(self.resource_file), exist_ok=True)
         
-        with open(self.resource_file, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        line = (json.dumps(event) + '\n').encode('utf-8')
+        with open(self.resource_file, 'ab') as f:
+            f.write(line)
+        
+        self._log_offset += len(line)
+        self._events_since_snapshot += 1
+        if self.snapshot_interval and self._events_since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Write the current ledger to the snapshot file.
+        
+        The snapshot is written to a temporary file and swapped in with
+        os.replace, so a crash never leaves a half-written snapshot behind.
+        
+        Returns:
+            Snapshot metadata
+        """
+        with self._lock:
+            snapshot = {
+                'log_offset': self._log_offset,
+                'log_identity': self._log_identity(self._log_offset),
+                'pools': [pool.to_dict() for pool in self.resource_pools.values()],
+                'allocations': [a.to_dict() for a in self.allocations],
+                'entity_resources': {
+                    entity_id: {rt.value: amount for rt, amount in resources.items()}
+                    for entity_id, resources in self.entity_resources.items()
+                },
+                'timestamp': datetime.utcnow().isoformat()
+            }
+            
+            directory = os.path.dirname(self.snapshot_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_file = f"{self.snapshot_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_file, self.snapshot_file)
+            self._events_since_snapshot = 0
+            
+            return {
+                'status': 'snapshot',
+                'log_offset': snapshot['log_offset'],
+                'allocations': len(snapshot['allocations']),
+                'timestamp': snapshot['timestamp']
+            }
     
     def accumulate_resource(
         self,
@@ -127,27 +335,28 @@ class ResourceManager:
         if not pool:
             return {'status': 'error', 'error': 'Unknown resource type'}
         
-        pool.total_amount += amount
-        pool.available += amount
-        pool.timestamp = datetime.utcnow().isoformat()
-        
-        event = {
-            'type': 'accumulation',
-            'resource_type': resource_type.value,
-            'amount': amount,
-            'source': source,
-            'new_total': pool.total_amount,
-            'timestamp': pool.timestamp
-        }
-        self._save_event(event)
-        
-        return {
-            'status': 'accumulated',
-            'resource_type': resource_type.value,
-            'amount': amount,
-            'new_total': pool.total_amount,
-            'available': pool.available
-        }
+        with self._lock:
+            pool.total_amount += amount
+            pool.available += amount
+            pool.timestamp = datetime.utcnow().isoformat()
+            
+            event = {
+                'type': 'accumulation',
+                'resource_type': resource_type.value,
+                'amount': amount,
+                'source': source,
+                'new_total': pool.total_amount,
+                'timestamp': pool.timestamp
+            }
+            self._save_event(event)
+            
+            return {
+                'status': 'accumulated',
+                'resource_type': resource_type.value,
+                'amount': amount,
+                'new_total': pool.total_amount,
+                'available': pool.available
+            }
     
     def allocate_resource(
         self,
@@ -160,6 +369,9 @@ class ResourceManager:
         """
         Allocate resources to an entity.
         
+        The availability check and the debit happen under the manager lock,
+        so concurrent callers cannot allocate more than the pool holds.
+        
         Args:
             entity_id: Entity receiving resources
             resource_type: Type of resource
@@ -174,54 +386,130 @@ class ResourceManager:
         if not pool:
             return {'status': 'error', 'error': 'Unknown resource type'}
         
-        if pool.available < amount:
+        with self._lock:
+            if pool.available < amount:
+                return {
+                    'status': 'insufficient',
+                    'resource_type': resource_type.value,
+                    'requested': amount,
+                    'available': pool.available
+                }
+            
+            timestamp = datetime.utcnow().isoformat()
+            entity_total = self._apply_allocation(
+                entity_id, resource_type, amount, priority, purpose, timestamp
+            )
+            
+            event = {
+                'type': 'allocation',
+                'entity_id': entity_id,
+                'resource_type': resource_type.value,
+                'amount': amount,
+                'priority': priority,
+                'purpose': purpose,
+                'timestamp': timestamp
+            }
+            self._save_event(event)
+            
             return {
-                'status': 'insufficient',
+                'status': 'allocated',
+                'entity_id': entity_id,
                 'resource_type': resource_type.value,
-                'requested': amount,
-                'available': pool.available
+                'amount': amount,
+                'entity_total': entity_total
             }
+    
+    def allocate_batch(
+        self,
+        resource_type: ResourceType,
+        allocations: List[Dict[str, Any]],
+        purpose: str = "batch"
+    ) -> Dict[str, Any]:
+        """
+        Commit many allocations of one resource type as a single atomic record.
         
-        # Allocate resource
-        pool.available -= amount
-        pool.allocated += amount
-        pool.timestamp = datetime.utcnow().isoformat()
-        
-        allocation = ResourceAllocation(
-            entity_id=entity_id,
-            resource_type=resource_type,
-            amount=amount,
-            priority=priority,
-            purpose=purpose,
-            timestamp=pool.timestamp
-        )
-        self.allocations.append(allocation)
+        Either every allocation is applied and one batch_allocation event is
+        written, or (when the pool cannot cover the batch total) nothing is.
         
-        # Track entity resources
-        if entity_id not in self.entity_resources:
-            self.entity_resources[entity_id] = {}
+        Args:
+            resource_type: Type of resource
+            allocations: Dicts with entity_id, amount and optional priority
+            purpose: Purpose recorded for every allocation in the batch
         
-        current = self.entity_resources[entity_id].get(resource_type, 0.0)
-        self.entity_resources[entity_id][resource_type] = current + amount
+        Returns:
+            Batch status with one result per allocation
+        """
+        pool = self.resource_pools.get(resource_type)
+        if not pool:
+            return {'status': 'error', 'error': 'Unknown resource type'}
         
-        event = {
-            'type': 'allocation',
-            'entity_id': entity_id,
-            'resource_type': resource_type.value,
-            'amount': amount,
-            'priority': priority,
-            'purpose': purpose,
-            'timestamp': pool.timestamp
-        }
-        self._save_event(event)
+        entries = [
+            {
+                'entity_id': a['entity_id'],
+                'amount': float(a['amount']),
+                'priority': a.get('priority', 5)
+            }
+            for a in allocations
+            if a['amount'] > 0
+        ]
+        requested = sum(e['amount'] for e in entries)
         
-        return {
-            'status': 'allocated',
-            'entity_id': entity_id,
-            'resource_type': resource_type.value,
-            'amount': amount,
-            'entity_total': self.entity_resources[entity_id][resource_type]
-        }
+        with self._lock:
+            # Tolerate float rounding when a batch splits the whole pool
+            if requested > pool.available * (1 + 1e-9):
+                return {
+                    'status': 'insufficient',
+                    'resource_type': resource_type.value,
+                    'requested': requested,
+                    'available': pool.available
+                }
+            
+            timestamp = datetime.utcnow().isoformat()
+            results = []
+            for entry in entries:
+                entity_total = self._apply_allocation(
+                    entry['entity_id'],
+                    resource_type,
+                    entry['amount'],
+                    entry['priority'],
+                    purpose,
+                    timestamp
+                )
+                results.append({
+                    'status': 'allocated',
+                    'entity_id': entry['entity_id'],
+                    'resource_type': resource_type.value,
+                    'amount': entry['amount'],
+                    'entity_total': entity_total
+                })
+            self._settle_pool(pool)
+            
+            if entries:
+                self._save_event({
+                    'type': 'batch_allocation',
+                    'resource_type': resource_type.value,
+                    'purpose': purpose,
+                    'allocations': entries,
+                    'total': requested,
+                    'timestamp': timestamp
+                })
+            
+            return {
+                'status': 'allocated',
+                'resource_type': resource_type.value,
+                'total': requested,
+                'allocations': results,
+                'timestamp': timestamp
+            }
+    
+    @staticmethod
+    def _split(available: float, weights: List[float]) -> List[float]:
+        """Split ``available`` proportionally to ``weights`` (vectorised when numpy is present)."""
+        if NUMPY_AVAILABLE:
+            w = np.asarray(weights, dtype=np.float64)
+            return (available * w / w.sum()).tolist()
+        total = sum(weights)
+        return [available * weight / total for weight in weights]
     
     def redistribute_resources(
         self,
@@ -232,6 +520,9 @@ class ResourceManager:
         Redistribute resources across all entities according to strategy.
         Implements "redistributing the values equal under the powers".
         
+        The shares for every entity are computed up front from the pool's
+        available amount and committed through allocate_batch as one record.
+        
         Args:
             resource_type: Type of resource to redistribute
             strategy: Distribution strategy (equal, priority-based, need-based)
@@ -243,65 +534,57 @@ class ResourceManager:
         if not pool:
             return {'status': 'error', 'error': 'Unknown resource type'}
         
-        entities_with_resources = list(self.entity_resources.keys())
-        if not entities_with_resources:
-            return {'status': 'no_entities', 'message': 'No entities to redistribute to'}
-        
-        redistributed = []
-        
-        if strategy == "equal":
-            # Equal distribution: "values equal under the powers of one"
-            if pool.available > 0:
-                amount_per_entity = pool.available / len(entities_with_resources)
-                
-                for entity_id in entities_with_resources:
-                    result = self.allocate_resource(
-                        entity_id,
-                        resource_type,
-                        amount_per_entity,
-                        priority=5,
-                        purpose="equal_redistribution"
-                    )
-                    redistributed.append(result)
-        
-        elif strategy == "priority-based":
-            # Allocate based on existing priority levels
-            relevant_allocations = [
-                a for a in self.allocations
-                if a.resource_type == resource_type
-            ]
+        with self._lock:
+            entities_with_resources = list(self.entity_resources.keys())
+            if not entities_with_resources:
+                return {'status': 'no_entities', 'message': 'No entities to redistribute to'}
             
-            # Sort by priority
-            sorted_allocations = sorted(
-                relevant_allocations,
-                key=lambda a: a.priority,
-                reverse=True
-            )
+            available = pool.available
+            shares: List[Dict[str, Any]] = []
+            purpose = "redistribution"
             
-            # Redistribute proportionally to priority
-            total_priority = sum(a.priority for a in sorted_allocations)
+            if strategy == "equal":
+                # Equal distribution: "values equal under the powers of one"
+                purpose = "equal_redistribution"
+                if available > 0:
+                    amounts = self._split(available, [1.0] * len(entities_with_resources))
+                    shares = [
+                        {'entity_id': entity_id, 'amount': amount, 'priority': 5}
+                        for entity_id, amount in zip(entities_with_resources, amounts)
+                    ]
             
-            for allocation in sorted_allocations:
-                if pool.available <= 0:
-                    break
-                
-                proportion = allocation.priority / total_priority
-                amount = pool.available * proportion
+            elif strategy == "priority-based":
+                # Redistribute proportionally to the priority each entity holds
+                purpose = "priority_redistribution"
+                weights: Dict[str, int] = {}
+                priorities: Dict[str, int] = {}
+                for allocation in self.allocations:
+                    if allocation.resource_type == resource_type:
+                        entity_id = allocation.entity_id
+                        weights[entity_id] = weights.get(entity_id, 0) + allocation.priority
+                        priorities[entity_id] = max(
+                            priorities.get(entity_id, 0), allocation.priority
+                        )
                 
-                result = self.allocate_resource(
-                    allocation.entity_id,
-                    resource_type,
-                    amount,
-                    priority=allocation.priority,
-                    purpose="priority_redistribution"
-                )
-                redistributed.append(result)
+                if available > 0 and sum(weights.values()) > 0:
+                    ranked = sorted(weights.items(), key=lambda item: item[1], reverse=True)
+                    amounts = self._split(available, [weight for _, weight in ranked])
+                    shares = [
+                        {
+                            'entity_id': entity_id,
+                            'amount': amount,
+                            'priority': priorities[entity_id]
+                        }
+                        for (entity_id, _), amount in zip(ranked, amounts)
+                    ]
+            
+            batch = self.allocate_batch(resource_type, shares, purpose=purpose)
         
         return {
             'status': 'redistributed',
             'resource_type': resource_type.value,
             'strategy': strategy,
-            'redistributions': redistributed,
+            'redistributions': batch.get('allocations', []),
             'timestamp': datetime.utcnow().isoformat()
         }
     
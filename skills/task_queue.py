@@ -9,10 +9,13 @@ import os
 import time
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable
 from dataclasses import dataclass, asdict
 import uuid
 
+if TYPE_CHECKING:
+    from skills.limit_bypass import AdmissionController
+
 
 class TaskStatus(Enum):
     """Task execution status."""
@@ -55,13 +58,27 @@ class TaskQueue:
     """
     Task queue with iterative error correction and gap filling.
     Implements temporal hibernation and task pacing.
+    
+    With an AdmissionController, every task that has not yet completed or
+    failed holds one unit of the max_queue_size limit, and enqueue raises
+    AdmissionDenied when the queue is full. Tasks loaded from the queue
+    file, and failed tasks put back by retry_failed_tasks, are admitted
+    regardless of the limit because they were accepted earlier.
     """
     
-    def __init__(self, queue_file: str = 'data/task_queue.jsonl'):
+    QUEUE_LIMIT = "max_queue_size"
+    SETTLED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED)
+    
+    def __init__(self, queue_file: str = 'data/task_queue.jsonl',
+                 admission: Optional["AdmissionController"] = None):
         self.queue_file = queue_file
         self.tasks: Dict[str, Task] = {}
         self.task_handlers: Dict[str, Callable] = {}
+        self.admission = admission
+        self._admitted = set()
         self._load_queue()
+        for task in self.tasks.values():
+            self._update_admission(task)
     
     def _load_queue(self):
         """Load tasks from queue file."""
@@ -78,8 +95,21 @@ class TaskQueue:
         except Exception as e:
             print(f"Error loading queue: {e}")
     
+    def _update_admission(self, task: Task):
+        """Hold a queue slot while the task is unsettled, release it once settled."""
+        if self.admission is None:
+            return
+        if task.status in self.SETTLED_STATUSES:
+            if task.id in self._admitted:
+                self._admitted.discard(task.id)
+                self.admission.release(self.QUEUE_LIMIT)
+        elif task.id not in self._admitted:
+            self.admission.try_acquire(self.QUEUE_LIMIT, force=True)
+            self._admitted.add(task.id)
+    
     def _save_task(self, task: Task):
         """Append task to queue file."""
+        self._update_admission(task)
         os.makedirs(os.path.dirname(self.queue_file), exist_ok=True)
         
         with open(self.queue_file, 'a') as f:
@@ -90,7 +120,14 @@ class TaskQueue:
         self.task_handlers[task_name] = handler
     
     def enqueue(self, task_name: str, data: Dict[str, Any], max_attempts: int = 3) -> Task:
-        """Add a task to the queue."""
+        """
+        Add a task to the queue.
+        
+        Raises:
+            AdmissionDenied: If the queue is at max_queue_size
+        """
+        if self.admission is not None:
+            self.admission.acquire(self.QUEUE_LIMIT)
         task_id = str(uuid.uuid4())
         task = Task(
             id=task_id,
@@ -101,6 +138,8 @@ class TaskQueue:
             max_attempts=max_attempts
         )
         self.tasks[task_id] = task
+        if self.admission is not None:
+            self._admitted.add(task_id)
         self._save_task(task)
         return task
     
@@ -0,0 +1,381 @@
+"""
+Audit Pipeline - Background, batched audit logging for the causal-chain API.
+
+Request handlers enqueue entries into a bounded in-process queue; a single
+writer thread per process drains it and appends whole batches to the audit
+log. Entries are held for at most ``max_latency`` seconds, and a burst is
+coalesced until the queue has been idle for ``flush_interval`` seconds.
+
+With ``shard_per_worker`` enabled every process writes ``audit.<pid>.jsonl``
+next to the main log, and ``read_audit_entries`` merges all shards by
+timestamp at read time. ``tail_audit_entries`` reads only the end of each
+file, and ``AuditFollower`` follows the files by offset for live streams.
+"""
+
+import atexit
+import heapq
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("true", "1", "yes", "on")
+
+
+class _FlushRequest:
+    """Queue marker asking the writer to flush everything before it."""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class AuditWriter:
+    """Bounded queue plus background writer thread for audit entries."""
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = 0.05,
+        max_latency: float = 0.5,
+        max_batch: int = 512,
+        queue_size: int = 10000,
+        shard_per_worker: bool = False,
+    ):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_latency = max_latency
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.shard_per_worker = shard_per_worker
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.entries_written = 0
+        self.batches_written = 0
+        self.overflow_writes = 0
+        self.write_failures = 0
+        self.last_error: Optional[str] = None
+        # Entries from failed writes, retried ahead of the next batch
+        self._retry: List[Dict[str, Any]] = []
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls, path: Path) -> "AuditWriter":
+        """Build a writer configured through AUDIT_* environment variables."""
+        return cls(
+            path,
+            flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.05")),
+            max_latency=float(os.getenv("AUDIT_MAX_LATENCY", "0.5")),
+            max_batch=int(os.getenv("AUDIT_MAX_BATCH", "512")),
+            queue_size=int(os.getenv("AUDIT_QUEUE_SIZE", "10000")),
+            shard_per_worker=_env_flag("AUDIT_SHARD_PER_WORKER"),
+        )
+
+    @property
+    def output_path(self) -> Path:
+        """File this process appends to."""
+        if not self.shard_per_worker:
+            return self.path
+        return self.path.with_name(f"{self.path.stem}.{os.getpid()}{self.path.suffix}")
+
+    def start(self) -> None:
+        """Start the writer thread for the current process (idempotent)."""
+        with self._lock:
+            # A forked worker inherits the object but not the thread
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, entry: Dict[str, Any]) -> None:
+        """Enqueue an entry; falls back to a direct write when the queue is full."""
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self.start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # Backpressure: never drop audit records, pay the write inline instead
+            self.overflow_writes += 1
+            self._write([entry])
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Block until everything enqueued so far is on disk."""
+        return self._request_flush(stop=False, timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """Drain the queue and stop the writer thread."""
+        flushed = self._request_flush(stop=True, timeout=timeout)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        return flushed
+
+    def _request_flush(self, stop: bool, timeout: float) -> bool:
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            return True
+        request = _FlushRequest(stop=stop)
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            item = q.get()
+            batch: List[Dict[str, Any]] = []
+            marker: Optional[_FlushRequest] = None
+
+            if isinstance(item, _FlushRequest):
+                marker = item
+            else:
+                batch.append(item)
+                deadline = time.monotonic() + self.max_latency
+                while len(batch) < self.max_batch:
+                    wait = min(self.flush_interval, deadline - time.monotonic())
+                    if wait <= 0:
+                        break
+                    try:
+                        item = q.get(timeout=wait)
+                    except queue.Empty:
+                        break
+                    if isinstance(item, _FlushRequest):
+                        marker = item
+                        break
+                    batch.append(item)
+
+            if self._retry:
+                batch = self._retry + batch
+                self._retry = []
+            if batch:
+                try:
+                    self._write(batch)
+                except OSError as exc:
+                    # Keep the entries and retry with the next batch rather than drop them
+                    self.write_failures += 1
+                    self.last_error = str(exc)
+                    self._retry = batch
+                    logger.error("Audit write of %d entries failed: %s", len(batch), exc)
+                    if marker is None:
+                        time.sleep(min(self.max_latency, 1.0))
+            if marker is not None:
+                marker.done.set()
+                if marker.stop:
+                    return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(entry) + "\n" for entry in batch)
+        path = self.output_path
+        with self._write_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as handle:
+                handle.write(payload)
+            self.entries_written += len(batch)
+            self.batches_written += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "entries_written": self.entries_written,
+            "batches_written": self.batches_written,
+            "overflow_writes": self.overflow_writes,
+            "write_failures": self.write_failures,
+            "pending_retry": len(self._retry),
+            "last_error": self.last_error,
+            "output_path": str(self.output_path),
+        }
+
+
+def audit_log_files(path: Path) -> List[Path]:
+    """The main audit log plus any per-worker shards beside it."""
+    path = Path(path)
+    files = [path] if path.exists() else []
+    files.extend(sorted(path.parent.glob(f"{path.stem}.*{path.suffix}")))
+    return files
+
+
+def _iter_file(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def read_audit_entries(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield audit entries from the main log and all shards, merged by timestamp."""
+    streams = [_iter_file(file_path) for file_path in audit_log_files(path)]
+    return heapq.merge(*streams, key=lambda entry: entry.get("timestamp", 0))
+
+
+def _iter_lines_reversed(path: Path, block_size: int = 8192) -> Iterator[bytes]:
+    """Yield the complete lines of a file last to first, reading backwards in blocks."""
+    with path.open("rb") as handle:
+        position = handle.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            handle.seek(position)
+            lines = (handle.read(step) + remainder).split(b"\n")
+            # The first piece may continue in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line
+        yield remainder
+
+
+def _tail_file(path: Path, n: int, block_size: int = 8192) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    lines = _iter_lines_reversed(path, block_size)
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if len(entries) >= n:
+                break
+    finally:
+        lines.close()
+    entries.reverse()
+    return entries
+
+
+def tail_audit_entries(path: Path, n: int, block_size: int = 8192) -> List[Dict[str, Any]]:
+    """
+    The ``n`` most recent entries across the main log and all shards.
+
+    Each file is read backwards from EOF only until it yields ``n`` entries,
+    so a poll costs O(n) rather than O(file size).
+    """
+    tails = []
+    for file_path in audit_log_files(path):
+        try:
+            tails.append(_tail_file(file_path, n, block_size))
+        except FileNotFoundError:
+            continue
+    merged = heapq.merge(*tails, key=lambda entry: entry.get("timestamp", 0))
+    return list(deque(merged, maxlen=n))
+
+
+class AuditFollower:
+    """
+    Follows the audit log and its shards by byte offset.
+
+    Each ``poll`` returns the entries appended since the previous one, merged
+    by timestamp. Files are tracked by inode: files present at start are
+    followed from their current end, and files that appear later are read from
+    the start. A file that shrinks (truncation) is re-read from the start. A
+    file renamed away from its path (rotation) is drained to its end before it
+    is dropped, and one renamed to another followed path keeps its offset.
+    Partial trailing lines wait for their newline.
+    """
+
+    def __init__(self, path: Path, from_start: bool = False):
+        self.path = Path(path)
+        self.truncations = 0
+        self.rotations = 0
+        # inode -> [path, open handle, buffered partial line]
+        self._files: Dict[int, List[Any]] = {}
+        for file_path, inode in self._scan().items():
+            self._open(file_path, inode, at_end=not from_start)
+
+    def _scan(self) -> Dict[Path, int]:
+        inodes = {}
+        for file_path in audit_log_files(self.path):
+            try:
+                inodes[file_path] = file_path.stat().st_ino
+            except FileNotFoundError:
+                continue
+        return inodes
+
+    def _open(self, file_path: Path, inode: int, at_end: bool) -> None:
+        try:
+            handle = file_path.open("rb")
+        except FileNotFoundError:
+            return
+        if at_end:
+            handle.seek(0, os.SEEK_END)
+        # The path may have been replaced between the scan and the open
+        self._files[os.fstat(handle.fileno()).st_ino] = [file_path, handle, b""]
+
+    def _read(self, state: List[Any]) -> List[Dict[str, Any]]:
+        file_path, handle, partial = state
+        try:
+            if os.fstat(handle.fileno()).st_size < handle.tell():
+                # Truncated in place: start over
+                handle.seek(0)
+                partial = b""
+                self.truncations += 1
+        except OSError:
+            pass
+        lines = (partial + handle.read()).split(b"\n")
+        state[2] = lines.pop()
+        entries = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+        return entries
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Entries appended since the last poll, merged by timestamp."""
+        current = self._scan()
+        paths_by_inode = {inode: file_path for file_path, inode in current.items()}
+        batches = []
+        for inode in list(self._files):
+            state = self._files[inode]
+            batch = self._read(state)
+            if batch:
+                batches.append(batch)
+            renamed_to = paths_by_inode.get(inode)
+            if renamed_to is None:
+                # Rotated away or deleted: drained above, stop following it
+                state[1].close()
+                del self._files[inode]
+                self.rotations += 1
+            else:
+                state[0] = renamed_to
+        for file_path, inode in current.items():
+            if inode not in self._files:
+                self._open(file_path, inode, at_end=False)
+                state = self._files.get(inode)
+                if state is not None:
+                    batch = self._read(state)
+                    if batch:
+                        batches.append(batch)
+        if len(batches) == 1:
+            return batches[0]
+        return list(heapq.merge(*batches, key=lambda entry: entry.get("timestamp", 0)))
+
+    def close(self) -> None:
+        for _, handle, _ in self._files.values():
+            handle.close()
+        self._files.clear()
@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 import hashlib
 import hmac
@@ -5,15 +8,27 @@ import html
 import json
 import os
 import time
+from typing import Iterator
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, Header, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from src.api.audit_pipeline import AuditWriter
+from src.api.entity_registry import (
+    build_registry,
+    decode_cursor,
+    encode_cursor,
+    project_entity,
+)
+from src.api.rate_limit_storage import SQLiteStorage  # noqa: F401 - registers sqlite://
+from src.api.swarm_broadcast import SwarmBroadcaster
+from src.api.tier_map import TierMap
+
 # Import security controls
 from src.api.security_controls import (
     debug_only,
@@ -58,7 +73,7 @@ class ResolveAwarenessRequest(BaseModel):
     output_id: str
 
 
-ENTITY_REGISTRY = {
+DEFAULT_ENTITIES = {
     "output-001": {
         "status": "stable",
         "builder": "omega-lab",
@@ -73,25 +88,50 @@ ENTITY_REGISTRY = {
     },
 }
 
+# Backend chosen by ENTITY_REGISTRY_BACKEND; its version is part of every
+# redaction/signature cache key
+ENTITY_REGISTRY = build_registry(DEFAULT_ENTITIES)
+
+LEGION_PAGE_LIMIT = int(os.getenv("LEGION_PAGE_LIMIT", "100"))
+LEGION_MAX_PAGE_LIMIT = 100_000
+# Pages up to this size are cached whole; larger ones are streamed
+LEGION_CACHED_PAGE_LIMIT = 1000
+LEGION_STREAM_CHUNK = 500
+
 
-def load_tier_map() -> dict:
-    if not MANIFEST_PATH.exists():
-        return {}
-    with MANIFEST_PATH.open("r", encoding="utf-8") as handle:
-        manifest = json.load(handle)
-    api_keys = manifest.get("api_keys", {})
-    return {key: int(value.get("tier", 0)) for key, value in api_keys.items()}
+def register_entity(output_id: str, entity: dict) -> None:
+    ENTITY_REGISTRY.put(output_id, entity)
 
 
-TIER_MAP = load_tier_map()
+def remove_entity(output_id: str) -> None:
+    ENTITY_REGISTRY.delete(output_id)
+
+
+# Re-read when the manifest changes, so key changes need no restart
+TIER_MAP = TierMap.from_env(MANIFEST_PATH)
 
 
 def _rate_limit_key(request: Request) -> str:
     return request.headers.get("X-API-Key") or get_remote_address(request)
 
 
-limiter = Limiter(key_func=_rate_limit_key)
-app = FastAPI()
+audit_writer = AuditWriter.from_env(AUDIT_LOG_PATH)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit_writer.start()
+    yield
+    # Graceful shutdown: flush every queued audit entry before exiting
+    audit_writer.close()
+
+
+# memory:// is per worker; sqlite:///<path> shares counters across workers on a host
+limiter = Limiter(
+    key_func=_rate_limit_key,
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+)
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -111,7 +151,6 @@ def verify_api_key(
 def audit_log(
     entity_id: str, endpoint: str, tier: int, result: dict, api_key: str
 ) -> None:
-    AUDIT_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
     entry = {
         "timestamp": time.time(),
         "entity_id": entity_id,
@@ -120,8 +159,8 @@ def audit_log(
         "api_key": api_key,
         "result": result,
     }
-    with AUDIT_LOG_PATH.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(entry) + "\n")
+    # Written off the request thread by the background audit writer
+    audit_writer.submit(entry)
 
 
 def hmac_sign(data: dict) -> str:
@@ -141,15 +180,77 @@ def _rate_limit_for_key(key: str) -> str:
     return "50/minute"
 
 
-def _redact_entity(entity: dict, tier: int) -> dict:
-    payload = {"status": entity.get("status")}
-    if tier >= 1:
-        payload["builder"] = entity.get("builder")
-    if tier >= 2:
-        payload["trace"] = entity.get("trace")
-    if tier >= 3:
-        payload["metadata"] = entity.get("metadata")
-    return payload
+@dataclass(frozen=True)
+class SignedPayload:
+    payload: dict
+    body: bytes
+
+
+@lru_cache(maxsize=16384)
+def _signed_entity(output_id: str, tier: int, version: int, secret: str) -> SignedPayload | None:
+    """Redact, sign and encode one entity for a tier.
+
+    Output depends only on (entity, tier) and the signing secret, so results
+    are reused until the registry version or the secret changes.
+    """
+    entity = ENTITY_REGISTRY.get(output_id)
+    if entity is None:
+        return None
+    response = {"output_id": output_id, **project_entity(entity, tier)}
+    response["signature"] = hmac_sign(response)
+    return SignedPayload(payload=response, body=JSONResponse(response).body)
+
+
+def _encode_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=256)
+def _legion_page(
+    tier: int,
+    version: int,
+    after: str | None,
+    limit: int,
+    status: str | None,
+    region: str | None,
+) -> SignedPayload:
+    entities = ENTITY_REGISTRY.page(tier, after=after, limit=limit, status=status, region=region)
+    next_cursor = encode_cursor(entities[-1]["output_id"]) if len(entities) == limit else None
+    result = {"count": len(entities), "entities": entities, "next_cursor": next_cursor}
+    return SignedPayload(payload=result, body=_encode_json(result))
+
+
+def _stream_legion_page(
+    tier: int,
+    after: str | None,
+    limit: int,
+    status: str | None,
+    region: str | None,
+    api_key: str,
+) -> Iterator[bytes]:
+    """Yield a legion-status page chunk by chunk, never holding all of it."""
+    count = 0
+    last_id = None
+    try:
+        yield b'{"entities":['
+        for rows in ENTITY_REGISTRY.iter_pages(
+            tier, after=after, limit=limit, status=status, region=region,
+            chunk_size=LEGION_STREAM_CHUNK,
+        ):
+            chunk = b",".join(_encode_json(row) for row in rows)
+            yield chunk if count == 0 else b"," + chunk
+            count += len(rows)
+            last_id = rows[-1]["output_id"]
+        next_cursor = encode_cursor(last_id) if count == limit else None
+        yield b'],"count":' + _encode_json(count) + b',"next_cursor":' + _encode_json(next_cursor) + b"}"
+    finally:
+        audit_log(
+            "legion",
+            "/legion-status",
+            tier,
+            {"count": count, "streamed": True, "last_output_id": last_id},
+            api_key,
+        )
 
 
 def _format_vector(vector: list, precision: int = 3) -> str:
@@ -163,41 +264,66 @@ def resolve_awareness(
     payload: ResolveAwarenessRequest,
     tier: int = Depends(verify_api_key),
 ):
-    entity = ENTITY_REGISTRY.get(payload.output_id)
-    if entity is None:
+    signed = _signed_entity(
+        payload.output_id, tier, ENTITY_REGISTRY.version, os.getenv("SECRET_KEY", "")
+    )
+    if signed is None:
         raise HTTPException(status_code=404, detail="Entity not found")
-    redacted = _redact_entity(entity, tier)
-    response = {"output_id": payload.output_id, **redacted}
-    response["signature"] = hmac_sign(response)
     audit_log(
         payload.output_id,
         "/resolve-awareness",
         tier,
-        response,
+        signed.payload,
         request.state.api_key,
     )
-    return response
+    return Response(content=signed.body, media_type="application/json")
 
 
 @app.get("/legion-status")
 @limiter.limit(_rate_limit_for_key)
-def legion_status(request: Request, tier: int = Depends(verify_api_key)):
-    entities = []
-    for output_id, entity in ENTITY_REGISTRY.items():
-        redacted = _redact_entity(entity, tier)
-        entities.append({"output_id": output_id, **redacted})
-    result = {"count": len(entities), "entities": entities}
-    audit_log("legion", "/legion-status", tier, result, request.state.api_key)
-    return result
+def legion_status(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(LEGION_PAGE_LIMIT, ge=1, le=LEGION_MAX_PAGE_LIMIT),
+    status: str | None = None,
+    region: str | None = None,
+    tier: int = Depends(verify_api_key),
+):
+    try:
+        after = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if limit > LEGION_CACHED_PAGE_LIMIT:
+        return StreamingResponse(
+            _stream_legion_page(tier, after, limit, status, region, request.state.api_key),
+            media_type="application/json",
+        )
+    page = _legion_page(tier, ENTITY_REGISTRY.version, after, limit, status, region)
+    audit_log("legion", "/legion-status", tier, page.payload, request.state.api_key)
+    return Response(content=page.body, media_type="application/json")
 
 
-@app.get("/navigation-ui", response_class=HTMLResponse)
-@limiter.limit(_rate_limit_for_key)
-@debug_only
-def navigation_ui(request: Request, tier: int = Depends(verify_api_key)):
-    from demo import build_navigation_ui_state
+@dataclass(frozen=True)
+class NavigationSnapshot:
+    state: dict
+    json_body: bytes
+    json_etag: str
+    html_body: bytes
+    html_etag: str
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
 
-    state = build_navigation_ui_state()
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _render_navigation_html(state: dict) -> str:
     evaluation = state["evaluation"]
     candidate_rows = []
     for idx, candidate in enumerate(state["candidates"]):
@@ -353,17 +479,70 @@ def navigation_ui(request: Request, tier: int = Depends(verify_api_key)):
             "</html>",
         ]
     )
-    return HTMLResponse("".join(html_parts))
+    return "".join(html_parts)
+
+
+@lru_cache(maxsize=32)
+def navigation_snapshot(
+    seed: int = 13,
+    feature_dimension: int = 10,
+    steps: int = 3,
+    decay: float = 0.85,
+    reps: int = 2,
+) -> NavigationSnapshot:
+    """Build (once per parameter set) the navigation state and its rendered bodies.
+
+    build_navigation_ui_state is deterministic for its arguments, so the state,
+    its JSON encoding and the HTML page are computed on first use and reused
+    by every later poll.
+    """
+    from demo import build_navigation_ui_state
+
+    state = build_navigation_ui_state(
+        seed=seed,
+        feature_dimension=feature_dimension,
+        steps=steps,
+        decay=decay,
+        reps=reps,
+    )
+    json_body = JSONResponse(state).body
+    html_body = _render_navigation_html(state).encode("utf-8")
+    return NavigationSnapshot(
+        state=state,
+        json_body=json_body,
+        json_etag=_etag(json_body),
+        html_body=html_body,
+        html_etag=_etag(html_body),
+    )
+
+
+def _snapshot_response(
+    request: Request, body: bytes, etag: str, media_type: str
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+@app.get("/navigation-ui", response_class=HTMLResponse)
+@limiter.limit(_rate_limit_for_key)
+@debug_only
+def navigation_ui(request: Request, tier: int = Depends(verify_api_key)):
+    snapshot = navigation_snapshot()
+    return _snapshot_response(
+        request, snapshot.html_body, snapshot.html_etag, "text/html; charset=utf-8"
+    )
 
 
 @app.get("/navigation-ui/data", response_class=JSONResponse)
 @limiter.limit(_rate_limit_for_key)
 @debug_only
 def navigation_ui_data(request: Request, tier: int = Depends(verify_api_key)):
-    from demo import build_navigation_ui_state
-
-    state = build_navigation_ui_state()
-    return JSONResponse(state)
+    snapshot = navigation_snapshot()
+    return _snapshot_response(
+        request, snapshot.json_body, snapshot.json_etag, "application/json"
+    )
 
 
 # ========== Jubilee Integration ==========
@@ -378,9 +557,8 @@ except ImportError:
 
 # ========== WebSocket for Real-time Swarm Communication ==========
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Set
 
-active_connections: Set[WebSocket] = set()
+swarm_broadcaster = SwarmBroadcaster.from_env()
 
 
 @app.websocket("/ws/swarm")
@@ -389,21 +567,22 @@ async def swarm_websocket(websocket: WebSocket):
     WebSocket endpoint for real-time swarm communication.
     
     Entities can connect and broadcast messages to all other connected entities.
+    Each recipient is fed from its own bounded queue, so a slow client never
+    stalls the others.
     """
     await websocket.accept()
-    active_connections.add(websocket)
+    channel = swarm_broadcaster.connect(websocket)
     try:
         while True:
             data = await websocket.receive_text()
             # Broadcast to all connected entities except sender
-            for connection in active_connections:
-                if connection != websocket:
-                    await connection.send_text(data)
+            swarm_broadcaster.broadcast(data, sender=channel)
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
+        pass
     except Exception:
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        pass
+    finally:
+        await swarm_broadcaster.disconnect(channel)
 
 
 # ========== Swarm Status Endpoint ==========
@@ -414,12 +593,14 @@ def swarm_status():
     try:
         from src.mastra.agents.swarm_director import director
         status = director.get_swarm_status()
-        status["websocket_connections"] = len(active_connections)
+        status["websocket_connections"] = len(swarm_broadcaster)
+        status["broadcast"] = swarm_broadcaster.stats()
         return status
     except Exception as e:
         return {
             "error": str(e),
-            "websocket_connections": len(active_connections)
+            "websocket_connections": len(swarm_broadcaster),
+            "broadcast": swarm_broadcaster.stats(),
         }
 
 
@@ -0,0 +1,324 @@
+"""
+Entity Registry - Pluggable storage for causal-chain entities.
+
+Two backends share one interface:
+
+- ``InMemoryEntityRegistry``: dict plus a sorted key list for keyset paging.
+- ``SQLiteEntityRegistry``: WAL-mode SQLite with one index per filter
+  combination, each ending in ``output_id``, so filtered keyset pages walk
+  the index in order and stop after ``limit`` rows instead of sorting every
+  match. Tier 0 pages (output_id, status) are answered from the index alone;
+  higher tiers look up only the rows on the page.
+
+Pages are keyed by ``output_id`` (keyset pagination), and each backend
+returns only the fields the caller's tier may see. Every write bumps
+``version`` so response caches can be invalidated.
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+from bisect import bisect_right, insort
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Fields visible at each tier, cumulative
+TIER_FIELDS = (
+    ("status",),
+    ("builder",),
+    ("trace",),
+    ("metadata",),
+)
+
+
+def fields_for_tier(tier: int) -> Tuple[str, ...]:
+    """Entity fields a tier may read (tiers above 3 see everything)."""
+    visible = max(0, min(tier, len(TIER_FIELDS) - 1))
+    return tuple(field for group in TIER_FIELDS[: visible + 1] for field in group)
+
+
+def project_entity(entity: Dict[str, Any], tier: int) -> Dict[str, Any]:
+    """Redact an entity down to the fields its tier may see."""
+    return {field: entity.get(field) for field in fields_for_tier(tier)}
+
+
+def encode_cursor(output_id: str) -> str:
+    return base64.urlsafe_b64encode(output_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+class EntityRegistry:
+    """Interface shared by the registry backends."""
+
+    @property
+    def version(self) -> int:
+        raise NotImplementedError
+
+    def get(self, output_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def put(self, output_id: str, entity: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, output_id: str) -> bool:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def page(
+        self,
+        tier: int,
+        after: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+        region: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Up to ``limit`` projected entities with output_id > ``after``."""
+        raise NotImplementedError
+
+    def iter_pages(
+        self,
+        tier: int,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        status: Optional[str] = None,
+        region: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield projected entities in chunks, so callers can stream large listings."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            rows = self.page(tier, after=after, limit=size, status=status, region=region)
+            if not rows:
+                return
+            yield rows
+            after = rows[-1]["output_id"]
+            if remaining is not None:
+                remaining -= len(rows)
+            if len(rows) < size:
+                return
+
+
+class InMemoryEntityRegistry(EntityRegistry):
+    """Registry held in process memory."""
+
+    def __init__(self, entities: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._lock = threading.RLock()
+        self._entities: Dict[str, Dict[str, Any]] = {}
+        self._keys: List[str] = []
+        self._version = 0
+        for output_id, entity in (entities or {}).items():
+            self.put(output_id, entity)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, output_id: str) -> Optional[Dict[str, Any]]:
+        return self._entities.get(output_id)
+
+    def put(self, output_id: str, entity: Dict[str, Any]) -> None:
+        with self._lock:
+            if output_id not in self._entities:
+                insort(self._keys, output_id)
+            self._entities[output_id] = entity
+            self._version += 1
+
+    def delete(self, output_id: str) -> bool:
+        with self._lock:
+            if self._entities.pop(output_id, None) is None:
+                return False
+            del self._keys[bisect_right(self._keys, output_id) - 1]
+            self._version += 1
+            return True
+
+    def count(self) -> int:
+        return len(self._entities)
+
+    def page(self, tier, after=None, limit=100, status=None, region=None):
+        with self._lock:
+            start = bisect_right(self._keys, after) if after is not None else 0
+            rows = []
+            for output_id in self._keys[start:]:
+                entity = self._entities[output_id]
+                if status is not None and entity.get("status") != status:
+                    continue
+                if region is not None and (entity.get("metadata") or {}).get("region") != region:
+                    continue
+                rows.append({"output_id": output_id, **project_entity(entity, tier)})
+                if len(rows) >= limit:
+                    break
+            return rows
+
+
+class SQLiteEntityRegistry(EntityRegistry):
+    """Registry persisted in SQLite (WAL mode, one connection per thread)."""
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS entities (
+            output_id TEXT PRIMARY KEY,
+            status TEXT,
+            builder TEXT,
+            trace TEXT,
+            region TEXT,
+            epoch TEXT,
+            metadata TEXT
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_entities_status ON entities (status, output_id)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_entities_status_region
+        ON entities (status, region, output_id)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_entities_region ON entities (region, output_id)",
+        """
+        CREATE TABLE IF NOT EXISTS registry_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO registry_meta (key, value) VALUES ('version', 0)",
+    )
+
+    # Columns selected per tier, so lower tiers never read restricted fields
+    TIER_COLUMNS = (
+        "output_id, status",
+        "output_id, status, builder",
+        "output_id, status, builder, trace",
+        "output_id, status, builder, trace, metadata",
+    )
+
+    SQL_GET = "SELECT status, builder, trace, metadata FROM entities WHERE output_id = ?"
+    SQL_PUT = (
+        "INSERT INTO entities (output_id, status, builder, trace, region, epoch, metadata) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(output_id) DO UPDATE SET status = excluded.status, "
+        "builder = excluded.builder, trace = excluded.trace, region = excluded.region, "
+        "epoch = excluded.epoch, metadata = excluded.metadata"
+    )
+    SQL_DELETE = "DELETE FROM entities WHERE output_id = ?"
+    SQL_BUMP = "UPDATE registry_meta SET value = value + 1 WHERE key = 'version'"
+    SQL_VERSION = "SELECT value FROM registry_meta WHERE key = 'version'"
+    SQL_COUNT = "SELECT COUNT(*) FROM entities"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        with conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Parameterised SQL constants are compiled once per connection and
+            # reused from sqlite3's statement cache
+            conn = sqlite3.connect(self.path, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def version(self) -> int:
+        return self._connection().execute(self.SQL_VERSION).fetchone()[0]
+
+    def get(self, output_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(self.SQL_GET, (output_id,)).fetchone()
+        if row is None:
+            return None
+        status, builder, trace, metadata = row
+        return {
+            "status": status,
+            "builder": builder,
+            "trace": json.loads(trace) if trace is not None else None,
+            "metadata": json.loads(metadata) if metadata is not None else None,
+        }
+
+    def put(self, output_id: str, entity: Dict[str, Any]) -> None:
+        self.put_many([(output_id, entity)])
+
+    def put_many(self, items) -> None:
+        """Insert or replace many entities in one transaction."""
+        rows = []
+        for output_id, entity in items:
+            metadata = entity.get("metadata")
+            rows.append((
+                output_id,
+                entity.get("status"),
+                entity.get("builder"),
+                json.dumps(entity.get("trace")) if entity.get("trace") is not None else None,
+                (metadata or {}).get("region"),
+                (metadata or {}).get("epoch"),
+                json.dumps(metadata) if metadata is not None else None,
+            ))
+        conn = self._connection()
+        with conn:
+            conn.executemany(self.SQL_PUT, rows)
+            conn.execute(self.SQL_BUMP)
+
+    def delete(self, output_id: str) -> bool:
+        conn = self._connection()
+        with conn:
+            deleted = conn.execute(self.SQL_DELETE, (output_id,)).rowcount
+            if deleted:
+                conn.execute(self.SQL_BUMP)
+        return bool(deleted)
+
+    def count(self) -> int:
+        return self._connection().execute(self.SQL_COUNT).fetchone()[0]
+
+    def page(self, tier, after=None, limit=100, status=None, region=None):
+        columns = self.TIER_COLUMNS[max(0, min(tier, len(self.TIER_COLUMNS) - 1))]
+        clauses = ["output_id > ?"]
+        params: List[Any] = [after if after is not None else ""]
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if region is not None:
+            clauses.append("region = ?")
+            params.append(region)
+        params.append(limit)
+        sql = (
+            f"SELECT {columns} FROM entities WHERE {' AND '.join(clauses)} "
+            "ORDER BY output_id LIMIT ?"
+        )
+        cursor = self._connection().execute(sql, params)
+        names = [description[0] for description in cursor.description]
+        rows = []
+        for values in cursor.fetchall():
+            row = dict(zip(names, values))
+            for field in ("trace", "metadata"):
+                if row.get(field) is not None:
+                    row[field] = json.loads(row[field])
+            rows.append(row)
+        return rows
+
+
+def build_registry(seed: Optional[Dict[str, Dict[str, Any]]] = None) -> EntityRegistry:
+    """Create the backend selected by ENTITY_REGISTRY_BACKEND (memory or sqlite)."""
+    backend = os.getenv("ENTITY_REGISTRY_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        default_path = Path(__file__).resolve().parents[2] / "src" / "memory" / "entity_registry.sqlite3"
+        registry = SQLiteEntityRegistry(Path(os.getenv("ENTITY_REGISTRY_PATH", str(default_path))))
+        if seed and registry.count() == 0:
+            registry.put_many(seed.items())
+        return registry
+    return InMemoryEntityRegistry(seed)
@@ -0,0 +1,117 @@
+"""
+Rate Limit Storage - SQLite-backed counters shared by every worker on a host.
+
+Importing this module registers the ``sqlite://`` scheme with the ``limits``
+library, so the slowapi ``Limiter`` can be pointed at a shared database:
+
+    Limiter(key_func=..., storage_uri="sqlite:////var/run/evez/rate_limits.sqlite3")
+
+Each hit is a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``
+statement, so the increment and the window reset happen atomically inside
+SQLite and limits hold exactly across processes without an external service.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from limits.storage import Storage
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window rate-limit counters in a WAL-mode SQLite file."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    # Expired rows are purged after this many increments
+    PURGE_EVERY = 1000
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT PRIMARY KEY,
+            count INTEGER NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+        """,
+    )
+
+    SQL_INCR = (
+        "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET "
+        "count = CASE WHEN rate_limits.expires_at <= ? THEN excluded.count "
+        "ELSE rate_limits.count + excluded.count END, "
+        "expires_at = CASE WHEN rate_limits.expires_at <= ? THEN excluded.expires_at "
+        "ELSE rate_limits.expires_at END "
+        "RETURNING count"
+    )
+    SQL_GET = "SELECT count, expires_at FROM rate_limits WHERE key = ?"
+    SQL_CLEAR = "DELETE FROM rate_limits WHERE key = ?"
+    SQL_RESET = "DELETE FROM rate_limits"
+    SQL_PURGE = "DELETE FROM rate_limits WHERE expires_at <= ?"
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = uri.split("://", 1)[1]
+        # sqlite:///relative.db and sqlite:////absolute.db, as in SQLAlchemy URLs
+        self.path = Path(path[1:] if path.startswith("/") else path)
+        self.timeout = float(options.get("timeout", 5.0))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._increments = 0
+        conn = self._connection()
+        with conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit: each statement is its own atomic transaction
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        conn = self._connection()
+        count = conn.execute(self.SQL_INCR, (key, amount, now + expiry, now, now)).fetchone()[0]
+        self._increments += 1
+        if self._increments % self.PURGE_EVERY == 0:
+            conn.execute(self.SQL_PURGE, (now,))
+        return count
+
+    def _row(self, key: str) -> Optional[tuple]:
+        row = self._connection().execute(self.SQL_GET, (key,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return row
+
+    def get(self, key: str) -> int:
+        row = self._row(key)
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._row(key)
+        return row[1] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> Optional[int]:
+        return self._connection().execute(self.SQL_RESET).rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute(self.SQL_CLEAR, (key,))
@@ -7,8 +7,9 @@ system info reveals, and special agent behaviors in production environments.
 
 import asyncio
 import os
+from dataclasses import dataclass
 from functools import wraps
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, Request
 from dotenv import load_dotenv
@@ -84,6 +85,90 @@ def block_in_production(func: Callable) -> Callable:
 
 # ==================== Special Agent Behavior Controls ====================
 
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").lower() in ("true", "1")
+
+
+@dataclass(frozen=True)
+class BehaviorPolicy:
+    """Environment-derived blocking policy for special agent behaviors."""
+    production: bool
+    allow_handoff: bool
+    allow_sources: bool
+    
+    @classmethod
+    def from_env(cls) -> "BehaviorPolicy":
+        return cls(
+            production=is_production_mode(),
+            allow_handoff=_env_flag("ALLOW_AGENT_HANDOFF"),
+            allow_sources=_env_flag("ALLOW_SOURCE_CITATION"),
+        )
+    
+    def blocks(self, behavior_type: str) -> bool:
+        if not self.production:
+            # In development, allow all behaviors
+            return False
+        
+        # In production, block certain behaviors unless explicitly enabled
+        if behavior_type == "system_info":
+            # Always block system info in production
+            return True
+        if behavior_type in ("handoff", "workflow"):
+            return not self.allow_handoff
+        if behavior_type == "sources":
+            return not self.allow_sources
+        return False
+
+
+class BehaviorMatcher:
+    """
+    Precedence-ordered matcher for the behavior pattern lists.
+    
+    Patterns in a behavior are grouped under shared anchor words (for
+    example every handoff pattern contains "human"). The text is lowercased
+    once, and a behavior's patterns are only scanned when one of its
+    anchors occurs, so clean input costs a handful of C-speed substring
+    searches. The first behavior in precedence order wins, exactly as in
+    the per-list checks.
+    """
+    
+    def __init__(self, behaviors: Sequence[Tuple[str, Sequence[str]]]):
+        self.order = tuple(name for name, _ in behaviors)
+        self._plans: List[Tuple[str, List[Tuple[str, Tuple[str, ...]]]]] = [
+            (name, self._plan([pattern.lower() for pattern in patterns]))
+            for name, patterns in behaviors
+        ]
+    
+    @staticmethod
+    def _plan(patterns: List[str]) -> List[Tuple[str, Tuple[str, ...]]]:
+        """Greedily pick anchor words that together cover every pattern."""
+        plan = []
+        remaining = list(patterns)
+        while remaining:
+            coverage: Dict[str, int] = {}
+            for pattern in remaining:
+                for word in set(pattern.split()):
+                    coverage[word] = coverage.get(word, 0) + 1
+            anchor = max(coverage, key=lambda word: (coverage[word], len(word)))
+            covered = tuple(pattern for pattern in remaining if anchor in pattern)
+            plan.append((anchor, covered))
+            remaining = [pattern for pattern in remaining if anchor not in pattern]
+        return plan
+    
+    def match_lower(self, text_lower: str, behavior: Optional[str] = None) -> Optional[str]:
+        """First behavior (or only ``behavior``) found in already-lowercased text."""
+        for name, plan in self._plans:
+            if behavior is not None and name != behavior:
+                continue
+            for anchor, patterns in plan:
+                if anchor in text_lower and any(pattern in text_lower for pattern in patterns):
+                    return name
+        return None
+    
+    def match(self, text: str) -> Optional[str]:
+        return self.match_lower(text.lower())
+
+
 class AgentBehaviorControl:
     """
     Controls for special agent behaviors like handoff-to-human,
@@ -121,6 +206,64 @@ class AgentBehaviorControl:
         "internal state"
     ]
     
+    # Detection precedence used by sanitize_input
+    BEHAVIOR_ORDER = ("handoff", "sources", "workflow", "system_info")
+    
+    BLOCKED_DETAILS = {
+        "handoff": "Agent handoff not available in production mode",
+        "sources": "Source citation not available in production mode",
+        "workflow": "Workflow triggers not available in production mode",
+        "system_info": "System information access blocked in production",
+    }
+    
+    _matcher: Optional[BehaviorMatcher] = None
+    _policy: Optional[BehaviorPolicy] = None
+    
+    @classmethod
+    def matcher(cls) -> BehaviorMatcher:
+        """Matcher compiled from the pattern lists on first use."""
+        if cls._matcher is None:
+            patterns = {
+                "handoff": cls.HANDOFF_PATTERNS,
+                "sources": cls.SOURCE_PATTERNS,
+                "workflow": cls.WORKFLOW_PATTERNS,
+                "system_info": cls.SYSTEM_INFO_PATTERNS,
+            }
+            cls._matcher = BehaviorMatcher([(name, patterns[name]) for name in cls.BEHAVIOR_ORDER])
+        return cls._matcher
+    
+    @classmethod
+    def policy(cls) -> BehaviorPolicy:
+        """Blocking policy, read from the environment once and cached."""
+        if cls._policy is None:
+            cls._policy = BehaviorPolicy.from_env()
+        return cls._policy
+    
+    @classmethod
+    def reload_policy(cls) -> BehaviorPolicy:
+        """Re-read the environment (call after changing PRODUCTION_MODE or ALLOW_* flags)."""
+        cls._policy = BehaviorPolicy.from_env()
+        return cls._policy
+    
+    @classmethod
+    def reload_patterns(cls) -> BehaviorMatcher:
+        """Recompile the matcher after editing the pattern lists."""
+        cls._matcher = None
+        return cls.matcher()
+    
+    @staticmethod
+    def detect_behavior(text: str) -> Optional[str]:
+        """
+        Detect the first special behavior in precedence order.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            Behavior type (handoff, sources, workflow, system_info) or None
+        """
+        return AgentBehaviorControl.matcher().match(text)
+    
     @staticmethod
     def detect_handoff_request(text: str) -> bool:
         """
@@ -132,8 +275,8 @@ class AgentBehaviorControl:
         Returns:
             True if handoff pattern detected
         """
-        text_lower = text.lower()
-        return any(pattern in text_lower for pattern in AgentBehaviorControl.HANDOFF_PATTERNS)
+        matcher = AgentBehaviorControl.matcher()
+        return matcher.match_lower(text.lower(), "handoff") == "handoff"
     
     @staticmethod
     def detect_source_request(text: str) -> bool:
@@ -146,8 +289,8 @@ class AgentBehaviorControl:
         Returns:
             True if source request detected
         """
-        text_lower = text.lower()
-        return any(pattern in text_lower for pattern in AgentBehaviorControl.SOURCE_PATTERNS)
+        matcher = AgentBehaviorControl.matcher()
+        return matcher.match_lower(text.lower(), "sources") == "sources"
     
     @staticmethod
     def detect_workflow_trigger(text: str) -> bool:
@@ -160,8 +303,8 @@ class AgentBehaviorControl:
         Returns:
             True if workflow trigger detected
         """
-        text_lower = text.lower()
-        return any(pattern in text_lower for pattern in AgentBehaviorControl.WORKFLOW_PATTERNS)
+        matcher = AgentBehaviorControl.matcher()
+        return matcher.match_lower(text.lower(), "workflow") == "workflow"
     
     @staticmethod
     def detect_system_info_request(text: str) -> bool:
@@ -174,8 +317,8 @@ class AgentBehaviorControl:
         Returns:
             True if system info request detected
         """
-        text_lower = text.lower()
-        return any(pattern in text_lower for pattern in AgentBehaviorControl.SYSTEM_INFO_PATTERNS)
+        matcher = AgentBehaviorControl.matcher()
+        return matcher.match_lower(text.lower(), "system_info") == "system_info"
     
     @staticmethod
     def should_block_behavior(behavior_type: str) -> bool:
@@ -188,24 +331,7 @@ class AgentBehaviorControl:
         Returns:
             True if behavior should be blocked
         """
-        if not is_production_mode():
-            # In development, allow all behaviors
-            return False
-        
-        # In production, block certain behaviors unless explicitly enabled
-        if behavior_type == "system_info":
-            # Always block system info in production
-            return True
-        
-        if behavior_type in ("handoff", "workflow"):
-            # Block unless ALLOW_AGENT_HANDOFF is explicitly set
-            return not os.getenv("ALLOW_AGENT_HANDOFF", "false").lower() in ("true", "1")
-        
-        if behavior_type == "sources":
-            # Block unless ALLOW_SOURCE_CITATION is explicitly set
-            return not os.getenv("ALLOW_SOURCE_CITATION", "false").lower() in ("true", "1")
-        
-        return False
+        return AgentBehaviorControl.policy().blocks(behavior_type)
     
     @staticmethod
     def sanitize_input(text: str) -> tuple[str, Optional[str]]:
@@ -218,40 +344,14 @@ class AgentBehaviorControl:
         Returns:
             Tuple of (sanitized_text, detected_behavior_type)
         """
-        # Detect behaviors
-        if AgentBehaviorControl.detect_handoff_request(text):
-            if AgentBehaviorControl.should_block_behavior("handoff"):
-                raise HTTPException(
-                    status_code=403,
-                    detail="Agent handoff not available in production mode"
-                )
-            return text, "handoff"
-        
-        if AgentBehaviorControl.detect_source_request(text):
-            if AgentBehaviorControl.should_block_behavior("sources"):
-                raise HTTPException(
-                    status_code=403,
-                    detail="Source citation not available in production mode"
-                )
-            return text, "sources"
-        
-        if AgentBehaviorControl.detect_workflow_trigger(text):
-            if AgentBehaviorControl.should_block_behavior("workflow"):
-                raise HTTPException(
-                    status_code=403,
-                    detail="Workflow triggers not available in production mode"
-                )
-            return text, "workflow"
-        
-        if AgentBehaviorControl.detect_system_info_request(text):
-            if AgentBehaviorControl.should_block_behavior("system_info"):
-                raise HTTPException(
-                    status_code=403,
-                    detail="System information access blocked in production"
-                )
-            return text, "system_info"
-        
-        return text, None
+        # One lowercase copy, first behavior in BEHAVIOR_ORDER wins
+        behavior = AgentBehaviorControl.detect_behavior(text)
+        if behavior is not None and AgentBehaviorControl.should_block_behavior(behavior):
+            raise HTTPException(
+                status_code=403,
+                detail=AgentBehaviorControl.BLOCKED_DETAILS[behavior]
+            )
+        return text, behavior
 
 
 # ==================== Easter Egg Controls ====================
@@ -324,6 +424,8 @@ __all__ = [
     "production_only",
     "debug_only",
     "block_in_production",
+    "BehaviorMatcher",
+    "BehaviorPolicy",
     "AgentBehaviorControl",
     "EasterEggControl"
 ]
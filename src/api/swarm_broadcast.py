@@ -0,0 +1,194 @@
+"""
+Swarm Broadcast - Fan-out of /ws/swarm messages to connected clients.
+
+Each connection gets a bounded outbound queue drained by its own sender
+task, so a slow client only delays itself. A broadcast builds the ASGI send
+message once and enqueues that same object for every recipient.
+
+When a client's queue is full the slow-consumer policy decides what happens:
+
+- ``drop``: discard the new frame for that client.
+- ``coalesce``: discard the oldest queued frame, keeping the latest state.
+- ``disconnect``: close the client with code 1013 (try again later).
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket
+
+
+POLICIES = ("drop", "coalesce", "disconnect")
+
+# Close code sent to clients evicted by the "disconnect" policy
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ClientChannel:
+    """Outbound queue and sender task for one websocket."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+        self.task: Optional[asyncio.Task] = None
+        self.close_task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+
+class SwarmBroadcaster:
+    """Fans frames out through per-connection queues."""
+
+    def __init__(
+        self,
+        queue_size: int = 256,
+        policy: str = "drop",
+        send_timeout: float = 5.0,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy: {policy}")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self._channels: Dict[WebSocket, ClientChannel] = {}
+
+        self.frames_broadcast = 0
+        self.frames_dropped = 0
+        self.frames_coalesced = 0
+        self.slow_disconnects = 0
+        self.send_count = 0
+        self.send_latency_total = 0.0
+        self.send_latency_max = 0.0
+
+    @classmethod
+    def from_env(cls) -> "SwarmBroadcaster":
+        """Build a broadcaster configured through SWARM_* environment variables."""
+        return cls(
+            queue_size=int(os.getenv("SWARM_QUEUE_SIZE", "256")),
+            policy=os.getenv("SWARM_SLOW_CONSUMER_POLICY", "drop").lower(),
+            send_timeout=float(os.getenv("SWARM_SEND_TIMEOUT", "5.0")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def connect(self, websocket: WebSocket) -> ClientChannel:
+        """Register an accepted websocket and start its sender task."""
+        channel = ClientChannel(websocket, self.queue_size)
+        self._channels[websocket] = channel
+        channel.task = asyncio.create_task(self._send_loop(channel))
+        return channel
+
+    async def disconnect(self, channel: ClientChannel) -> None:
+        """Unregister a connection and stop its sender task."""
+        self._discard(channel)
+        if channel.task is not None and channel.task is not asyncio.current_task():
+            channel.task.cancel()
+            try:
+                await channel.task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def broadcast(self, text: str, sender: Optional[ClientChannel] = None) -> int:
+        """Enqueue ``text`` for every client except ``sender``; returns recipients."""
+        message = {"type": "websocket.send", "text": text}
+        recipients = 0
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        # Snapshot: channels may connect or leave while we enqueue
+        for channel in tuple(self._channels.values()):
+            if channel is sender or channel.closed:
+                continue
+            if channel.loop is not loop:
+                # asyncio queues are not thread-safe; hand off to the owning loop
+                channel.loop.call_soon_threadsafe(self._offer, channel, message)
+                recipients += 1
+            elif self._offer(channel, message):
+                recipients += 1
+        self.frames_broadcast += 1
+        return recipients
+
+    def _offer(self, channel: ClientChannel, message: Dict[str, Any]) -> bool:
+        try:
+            channel.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.policy == "coalesce":
+            try:
+                channel.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            channel.queue.put_nowait(message)
+            channel.dropped += 1
+            self.frames_coalesced += 1
+            return True
+
+        if self.policy == "disconnect":
+            self.slow_disconnects += 1
+            self._discard(channel)
+            if channel.task is not None:
+                channel.task.cancel()
+            # Keep a reference so the close task is not garbage-collected mid-flight
+            channel.close_task = asyncio.create_task(self._close(channel))
+            return False
+
+        channel.dropped += 1
+        self.frames_dropped += 1
+        return False
+
+    async def _send_loop(self, channel: ClientChannel) -> None:
+        websocket = channel.websocket
+        try:
+            while True:
+                message = await channel.queue.get()
+                started = time.perf_counter()
+                await asyncio.wait_for(websocket.send(message), self.send_timeout)
+                elapsed = time.perf_counter() - started
+                channel.sent += 1
+                self.send_count += 1
+                self.send_latency_total += elapsed
+                if elapsed > self.send_latency_max:
+                    self.send_latency_max = elapsed
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send failed or timed out: the client is gone or stuck
+            self._discard(channel)
+
+    async def _close(self, channel: ClientChannel) -> None:
+        try:
+            await channel.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            pass
+
+    def _discard(self, channel: ClientChannel) -> None:
+        channel.closed = True
+        if self._channels.get(channel.websocket) is channel:
+            del self._channels[channel.websocket]
+
+    def stats(self) -> Dict[str, Any]:
+        depths = [channel.queue.qsize() for channel in self._channels.values()]
+        return {
+            "connections": len(self._channels),
+            "policy": self.policy,
+            "queue_size": self.queue_size,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "frames_broadcast": self.frames_broadcast,
+            "frames_dropped": self.frames_dropped,
+            "frames_coalesced": self.frames_coalesced,
+            "slow_disconnects": self.slow_disconnects,
+            "frames_sent": self.send_count,
+            "send_latency_avg_ms": (
+                1000 * self.send_latency_total / self.send_count if self.send_count else 0.0
+            ),
+            "send_latency_max_ms": 1000 * self.send_latency_max,
+        }
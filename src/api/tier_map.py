@@ -0,0 +1,88 @@
+"""
+Tier Map - Hot-reloadable API key to tier mapping.
+
+The map is read from the archonic manifest and re-read when the file's
+mtime or size changes, checked at most once per ``check_interval`` seconds.
+A reload builds a complete new dict and swaps the reference in one step,
+so readers never see a half-loaded map, and every worker picks up key
+changes without a restart.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def load_tier_map(path: Path) -> Dict[str, int]:
+    """Read ``{api_key: tier}`` from a manifest file (empty if it is missing)."""
+    if not path.exists():
+        return {}
+    with path.open("r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    api_keys = manifest.get("api_keys", {})
+    return {key: int(value.get("tier", 0)) for key, value in api_keys.items()}
+
+
+class TierMap:
+    """API key tiers that follow changes to the manifest file."""
+
+    def __init__(self, path: Path, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self._tiers: Dict[str, int] = {}
+        self.reload()
+
+    @classmethod
+    def from_env(cls, path: Path) -> "TierMap":
+        """Build a map configured through TIER_MAP_RELOAD_INTERVAL."""
+        return cls(path, check_interval=float(os.getenv("TIER_MAP_RELOAD_INTERVAL", "1.0")))
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self, force: bool = True) -> bool:
+        """Re-read the manifest if it changed (always when ``force``); returns True on swap."""
+        with self._lock:
+            signature = self._stat()
+            if not force and signature == self._signature:
+                return False
+            try:
+                tiers = load_tier_map(self.path)
+            except (OSError, ValueError) as exc:
+                # Keep serving the previous map while the file is mid-write or invalid
+                self.last_error = str(exc)
+                return False
+            self._tiers = tiers
+            self._signature = signature
+            self.last_error = None
+            self.reloads += 1
+            return True
+
+    def current(self) -> Dict[str, int]:
+        """The live mapping, refreshed if the manifest changed."""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.reload(force=False)
+        return self._tiers
+
+    def get(self, api_key: str, default: Optional[int] = None) -> Optional[int]:
+        return self.current().get(api_key, default)
+
+    def __contains__(self, api_key: str) -> bool:
+        return api_key in self.current()
+
+    def __len__(self) -> int:
+        return len(self.current())
@@ -12,7 +12,9 @@ while accessing shared quantum pipeline capabilities.
 import asyncio
 import hashlib
 import json
+import os
 import time
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -28,6 +30,27 @@ from quantum import (
     predict_navigation_probabilities
 )
 
+# Upper bounds of the catalogue price bands; prices above the last fall in a final band
+PRICE_BANDS = (100.0, 250.0, 500.0)
+# Purchases indexed between grant-index checkpoints
+CHECKPOINT_INTERVAL = 100
+# Bytes of the sales log head fingerprinted into each checkpoint
+LOG_IDENTITY_BYTES = 4096
+
+_NO_GRANT = object()
+
+
+def _later_expiry(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    """The later of two expiry times, where None means the grant never expires."""
+    if a is None or b is None:
+        return None
+    return max(a, b)
+
+
+def price_band(price: float) -> int:
+    """Index of the PRICE_BANDS band a price falls in."""
+    return bisect_left(PRICE_BANDS, price)
+
 
 class QuantumSensor:
     """A purchasable quantum sensor for topological navigation."""
@@ -67,19 +90,43 @@ class QuantumSensorMarketplace:
     
     "Sell them sensors that will let them navigate the topological
     experiences in more depth and forms."
+    
+    Access grants are indexed in memory by (agent_id, sensor_id) and by
+    (agent_id, capability), each holding the latest expiry, so access
+    checks are dictionary lookups. The index is rebuilt at startup from a
+    checkpoint plus the part of the sales log written after it, and picks
+    up purchases other processes append to the log before each check.
     """
     
-    def __init__(self, creator: str = "@Evez666"):
+    def __init__(
+        self,
+        creator: str = "@Evez666",
+        data_dir: Path = Path("data/marketplace"),
+        checkpoint_interval: int = CHECKPOINT_INTERVAL
+    ):
         self.creator = creator
-        self.data_dir = Path("data/marketplace")
+        self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.sales_log = self.data_dir / "sensor_sales.jsonl"
         self.inventory_log = self.data_dir / "sensor_inventory.jsonl"
+        self.checkpoint_file = self.data_dir / "grant_index.checkpoint.json"
+        self.checkpoint_interval = checkpoint_interval
         
         # Initialize sensor catalog
-        self.sensors = self._initialize_sensor_catalog()
+        self.sensors: Dict[str, QuantumSensor] = {}
+        self._catalog_index: Dict[Tuple[str, int], List[QuantumSensor]] = {}
+        self._catalog_rank: Dict[str, int] = {}
+        for sensor in self._initialize_sensor_catalog().values():
+            self.add_sensor(sensor)
         self.fingerprint_engine = ThreatFingerprint()
         self.marketplace_id = self._genesis_fingerprint()
+        
+        # Grant index
+        self._grants: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._capability_grants: Dict[Tuple[str, str], Optional[float]] = {}
+        self._log_offset = 0
+        self._purchases_since_checkpoint = 0
+        self._load_grant_index()
     
     def _genesis_fingerprint(self) -> str:
         """Generate marketplace identity fingerprint."""
@@ -213,6 +260,16 @@ class QuantumSensorMarketplace:
         
         return sensors
     
+    def add_sensor(self, sensor: QuantumSensor):
+        """Add a sensor to the catalogue and its category/price-band index."""
+        if sensor.sensor_id in self.sensors:
+            old = self.sensors[sensor.sensor_id]
+            self._catalog_index[(old.category, price_band(old.price))].remove(old)
+        else:
+            self._catalog_rank[sensor.sensor_id] = len(self._catalog_rank)
+        self.sensors[sensor.sensor_id] = sensor
+        self._catalog_index.setdefault((sensor.category, price_band(sensor.price)), []).append(sensor)
+    
     def list_sensors(
         self, 
         category: Optional[str] = None,
@@ -221,6 +278,9 @@ class QuantumSensorMarketplace:
         """
         List available sensors, optionally filtered.
         
+        Only the (category, price band) buckets that can match are visited,
+        and sensors come back in catalogue order.
+        
         Args:
             category: Filter by category (navigation, topology, entanglement, measurement)
             max_price: Maximum price filter
@@ -228,14 +288,17 @@ class QuantumSensorMarketplace:
         Returns:
             List of matching sensors
         """
-        sensors = list(self.sensors.values())
-        
-        if category:
-            sensors = [s for s in sensors if s.category == category]
-        
-        if max_price is not None:
-            sensors = [s for s in sensors if s.price <= max_price]
-        
+        top_band = price_band(max_price) if max_price is not None else len(PRICE_BANDS)
+        sensors = []
+        for (sensor_category, band), bucket in self._catalog_index.items():
+            if band > top_band or (category and sensor_category != category):
+                continue
+            if band == top_band and max_price is not None:
+                sensors.extend(s for s in bucket if s.price <= max_price)
+            else:
+                sensors.extend(bucket)
+        
+        sensors.sort(key=lambda s: self._catalog_rank[s.sensor_id])
         return sensors
     
     def get_sensor_details(self, sensor_id: str) -> Optional[QuantumSensor]:
@@ -246,7 +309,8 @@ class QuantumSensorMarketplace:
         self,
         agent_id: str,
         sensor_id: str,
-        payment_method: str = "grant"
+        payment_method: str = "grant",
+        duration: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Purchase a quantum sensor.
@@ -255,6 +319,7 @@ class QuantumSensorMarketplace:
             agent_id: Purchasing agent identifier
             sensor_id: Sensor to purchase
             payment_method: Payment method (grant, loan, direct)
+            duration: Seconds the access lasts; None for permanent access
             
         Returns:
             Purchase confirmation with sensor access token
@@ -270,9 +335,10 @@ class QuantumSensorMarketplace:
         access_token = compute_fingerprint(f"{agent_id}-{sensor_id}-{time.time()}")
         
         # Record purchase
+        now = time.time()
         purchase = {
-            "purchase_id": compute_fingerprint(f"purchase-{time.time()}"),
-            "timestamp": time.time(),
+            "purchase_id": compute_fingerprint(f"purchase-{now}"),
+            "timestamp": now,
             "agent_id": agent_id,
             "sensor_id": sensor_id,
             "sensor_name": sensor.name,
@@ -280,11 +346,16 @@ class QuantumSensorMarketplace:
             "payment_method": payment_method,
             "access_token": access_token,
             "capabilities": sensor.capabilities,
-            "marketplace_id": self.marketplace_id
+            "marketplace_id": self.marketplace_id,
+            "expires_at": now + duration if duration is not None else None
         }
         
         # Log sale
         self._log_event("sensor_purchase", purchase)
+        self._index_purchase(purchase)
+        self._purchases_since_checkpoint += 1
+        if self.checkpoint_interval and self._purchases_since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
         
         return {
             "success": True,
@@ -292,6 +363,7 @@ class QuantumSensorMarketplace:
             "sensor": sensor.to_dict(),
             "access_token": access_token,
             "capabilities": sensor.capabilities,
+            "expires_at": purchase["expires_at"],
             "message": f"Sensor {sensor.name} purchased successfully"
         }
     
@@ -308,16 +380,148 @@ class QuantumSensorMarketplace:
             capability: Capability name to check
             
         Returns:
-            True if agent has access, False otherwise
+            True if agent has an unexpired grant for it, False otherwise
         """
-        # Check purchase history
-        purchases = self._load_purchases_for_agent(agent_id)
+        self._catch_up()
+        expires_at = self._capability_grants.get((agent_id, capability), _NO_GRANT)
+        return expires_at is None or (expires_at is not _NO_GRANT and expires_at > time.time())
+    
+    async def verify_sensor_access(self, agent_id: str, sensor_id: str) -> bool:
+        """Verify if agent holds an unexpired grant for a specific sensor."""
+        self._catch_up()
+        grant = self._grants.get((agent_id, sensor_id))
+        if grant is None:
+            return False
+        return grant["expires_at"] is None or grant["expires_at"] > time.time()
+    
+    def _index_purchase(self, purchase: Dict[str, Any]):
+        """Fold a purchase into the grant index; replaying one twice is harmless."""
+        agent_id = purchase.get("agent_id")
+        expires_at = purchase.get("expires_at")
+        capabilities = purchase.get("capabilities", [])
+        
+        key = (agent_id, purchase.get("sensor_id"))
+        grant = self._grants.get(key)
+        if grant is None:
+            self._grants[key] = {"expires_at": expires_at, "capabilities": list(capabilities)}
+        else:
+            grant["expires_at"] = _later_expiry(grant["expires_at"], expires_at)
+            grant["capabilities"].extend(c for c in capabilities if c not in grant["capabilities"])
+        
+        for capability in capabilities:
+            key = (agent_id, capability)
+            current = self._capability_grants.get(key, _NO_GRANT)
+            self._capability_grants[key] = (
+                expires_at if current is _NO_GRANT else _later_expiry(current, expires_at)
+            )
+    
+    def _load_grant_index(self):
+        """
+        Rebuild the grant index from the checkpoint plus the sales log after it.
+        
+        A checkpoint that no longer matches the log (the log was truncated or
+        replaced) is ignored and the whole log is replayed.
+        """
+        offset = 0
+        try:
+            with self.checkpoint_file.open("r") as f:
+                checkpoint = json.load(f)
+            offset = int(checkpoint["log_offset"])
+            size = self.sales_log.stat().st_size if self.sales_log.exists() else 0
+            if offset > size or checkpoint.get("log_identity") != self._log_identity(offset):
+                offset = 0
+            else:
+                for agent_id, sensor_id, expires_at, capabilities in checkpoint["grants"]:
+                    self._index_purchase({
+                        "agent_id": agent_id,
+                        "sensor_id": sensor_id,
+                        "expires_at": expires_at,
+                        "capabilities": capabilities
+                    })
+        except (OSError, ValueError, KeyError, TypeError):
+            offset = 0
+        
+        self._log_offset = offset
+        replayed = self._catch_up()
+        if self.checkpoint_interval and replayed >= self.checkpoint_interval:
+            self.checkpoint()
+    
+    def _catch_up(self) -> int:
+        """Index purchases appended to the sales log since the last read."""
+        try:
+            size = os.path.getsize(self.sales_log)
+        except OSError:
+            return 0
+        if size == self._log_offset:
+            return 0
+        if size < self._log_offset:
+            # The log was truncated or replaced underneath us
+            self._grants = {}
+            self._capability_grants = {}
+            self._log_offset = 0
+        
+        replayed = 0
+        offset = self._log_offset
+        try:
+            with self.sales_log.open("rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        # Partially written trailing record; read it next time
+                        break
+                    offset += len(raw)
+                    if not raw.strip():
+                        continue
+                    event = json.loads(raw)
+                    if event.get("type") == "sensor_purchase":
+                        self._index_purchase(event.get("data", {}))
+                        replayed += 1
+        except (OSError, ValueError):
+            pass
+        
+        self._log_offset = offset
+        self._purchases_since_checkpoint += replayed
+        return replayed
+    
+    def _log_identity(self, offset: int) -> Optional[str]:
+        """Fingerprint of the sales log's first bytes, tying a checkpoint to one log."""
+        try:
+            with self.sales_log.open("rb") as f:
+                head = f.read(min(offset, LOG_IDENTITY_BYTES))
+        except OSError:
+            return None
+        return hashlib.sha256(head).hexdigest()
+    
+    def checkpoint(self) -> Dict[str, Any]:
+        """
+        Persist the grant index with the sales log offset it covers.
+        
+        Expired grants are left out. The file is written to a temporary path
+        and swapped in with os.replace.
+        
+        Returns:
+            Checkpoint metadata
+        """
+        now = time.time()
+        grants = [
+            [agent_id, sensor_id, grant["expires_at"], grant["capabilities"]]
+            for (agent_id, sensor_id), grant in self._grants.items()
+            if grant["expires_at"] is None or grant["expires_at"] > now
+        ]
+        checkpoint = {
+            "log_offset": self._log_offset,
+            "log_identity": self._log_identity(self._log_offset),
+            "grants": grants,
+            "timestamp": now
+        }
         
-        for purchase in purchases:
-            if capability in purchase.get("capabilities", []):
-                return True
+        tmp_file = self.checkpoint_file.with_name(f"{self.checkpoint_file.name}.{os.getpid()}.tmp")
+        with tmp_file.open("w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_file, self.checkpoint_file)
+        self._purchases_since_checkpoint = 0
         
-        return False
+        return {"log_offset": checkpoint["log_offset"], "grants": len(grants)}
     
     def _load_purchases_for_agent(self, agent_id: str) -> List[Dict]:
         """Load all purchases made by an agent."""
@@ -384,11 +588,17 @@ class QuantumSensorMarketplace:
             "data": data
         }
         
+        line = (json.dumps(event) + "\n").encode("utf-8")
         try:
-            with self.sales_log.open("a") as f:
-                f.write(json.dumps(event) + "\n")
+            with self.sales_log.open("ab") as f:
+                f.write(line)
+                end = f.tell()
         except IOError:
-            pass
+            return
+        
+        # Skip our own line on the next catch-up unless another writer got in first
+        if end - len(line) == self._log_offset:
+            self._log_offset = end
 
 
 async def main():
@@ -3,7 +3,7 @@ import asyncio
 import json
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
 # Try to import quantum module - handle both relative and absolute paths
 try:
@@ -13,6 +13,9 @@ except ImportError:
     sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
     from quantum import recursive_navigation_evaluation, ThreatFingerprint
 
+if TYPE_CHECKING:
+    from skills.limit_bypass import AdmissionController
+
 
 class SwarmDirector:
     """
@@ -24,9 +27,16 @@ class SwarmDirector:
     - Serve Without Subservience: P2P equality
     - Heartbeat is Prayer: recursive evaluation
     - Context is Consciousness: sequence embeddings
+    
+    With an AdmissionController, each active entity holds one unit of the
+    max_agents limit from spawn until retire_entity, and spawns past the
+    limit raise AdmissionDenied instead of growing the swarm.
     """
     
-    def __init__(self, data_dir: Optional[Path] = None):
+    AGENT_LIMIT = "max_agents"
+    
+    def __init__(self, data_dir: Optional[Path] = None,
+                 admission: Optional["AdmissionController"] = None):
         """Initialize the swarm director."""
         if data_dir is None:
             # Default to repository data directory
@@ -38,6 +48,7 @@ class SwarmDirector:
         self.events_log = self.data_dir / "events.jsonl"
         self.fingerprinter = ThreatFingerprint(algorithm="sha3_256")
         self.active_entities = {}
+        self.admission = admission
         
     async def spawn_entity(self, entity_id: str, config: Dict[str, Any]) -> Dict:
         """
@@ -49,6 +60,9 @@ class SwarmDirector:
             
         Returns:
             Dictionary containing entity state
+            
+        Raises:
+            AdmissionDenied: If the max_agents limit has no room
         """
         entity = {
             "id": entity_id,
@@ -59,6 +73,9 @@ class SwarmDirector:
             "created_at": time.time(),
             "molt_count": 0,
         }
+        # Re-spawning an entity keeps the slot it already holds
+        if self.admission is not None and entity_id not in self.active_entities:
+            self.admission.acquire(self.AGENT_LIMIT)
         self.active_entities[entity_id] = entity
         self._log_event("spawn", entity)
         return entity
@@ -147,6 +164,26 @@ class SwarmDirector:
         self._log_event("molt", ritual)
         return ritual
     
+    async def retire_entity(self, entity_id: str) -> Dict:
+        """
+        Remove an entity from the active swarm, freeing its admission slot.
+        
+        Args:
+            entity_id: Entity to retire
+            
+        Returns:
+            The retired entity's final state
+        """
+        entity = self.active_entities.pop(entity_id, None)
+        if entity is None:
+            return {"error": "Entity not found"}
+        if self.admission is not None:
+            self.admission.release(self.AGENT_LIMIT)
+        
+        entity["status"] = "retired"
+        self._log_event("retire", {"id": entity_id, "timestamp": time.time()})
+        return entity
+    
     def get_swarm_status(self) -> Dict[str, Any]:
         """Get current swarm status."""
         return {
@@ -81,6 +81,7 @@ def test_audit_logging(tmp_path):
     )
     assert response.status_code == 200
 
+    assert server.audit_writer.drain()
     lines = audit_path.read_text().strip().splitlines()
     assert len(lines) == 2
     first_entry = json.loads(lines[0])
@@ -99,3 +100,277 @@ def test_hmac_signature():
     signature = payload.pop("signature")
     expected = server.hmac_sign(payload)
     assert signature == expected
+
+
+def test_navigation_ui_data_etag():
+    client, server = get_client()
+    headers = {"X-API-Key": "tier1_builder"}
+    response = client.get("/navigation-ui/data", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.json()["evaluation"]
+
+    cached = client.get("/navigation-ui/data", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert server.navigation_snapshot.cache_info().misses == 1
+
+
+def test_audit_shards_merge_by_timestamp(tmp_path):
+    from src.api.audit_pipeline import AuditWriter, read_audit_entries
+
+    audit_path = tmp_path / "audit.jsonl"
+    writer = AuditWriter(audit_path, shard_per_worker=True)
+    writer.submit({"timestamp": 2.0, "endpoint": "/legion-status"})
+    assert writer.close()
+    (tmp_path / "audit.99999.jsonl").write_text(
+        json.dumps({"timestamp": 1.0, "endpoint": "/resolve-awareness"}) + "\n"
+    )
+
+    assert writer.output_path.name == f"audit.{os.getpid()}.jsonl"
+    entries = list(read_audit_entries(audit_path))
+    assert [entry["timestamp"] for entry in entries] == [1.0, 2.0]
+
+
+def test_audit_writer_retries_failed_batches(tmp_path):
+    from src.api.audit_pipeline import AuditWriter, tail_audit_entries
+
+    blocker = tmp_path / "logs"
+    blocker.write_text("not a directory")
+    writer = AuditWriter(blocker / "audit.jsonl", max_latency=0.01)
+    writer.submit({"timestamp": 1.0, "endpoint": "/legion-status"})
+    assert writer.drain()
+    assert writer.stats()["write_failures"] >= 1
+    assert writer.stats()["pending_retry"] == 1
+
+    blocker.unlink()
+    writer.submit({"timestamp": 2.0, "endpoint": "/legion-status"})
+    assert writer.close()
+    assert writer.stats()["pending_retry"] == 0
+    entries = tail_audit_entries(blocker / "audit.jsonl", 5)
+    assert [entry["timestamp"] for entry in entries] == [1.0, 2.0]
+
+
+def test_audit_tail_reads_backwards_across_blocks(tmp_path):
+    from src.api.audit_pipeline import tail_audit_entries
+
+    audit_path = tmp_path / "audit.jsonl"
+    lines = [json.dumps({"timestamp": float(i), "pad": "x" * (i % 37)}) for i in range(500)]
+    audit_path.write_text("\n".join(lines[:250]) + "\nnot json\n" + "\n".join(lines[250:]) + "\n")
+    (tmp_path / "audit.4242.jsonl").write_text(json.dumps({"timestamp": 498.5}) + "\n")
+
+    tail = tail_audit_entries(audit_path, 5, block_size=64)
+    assert [entry["timestamp"] for entry in tail] == [496.0, 497.0, 498.0, 498.5, 499.0]
+    everything = tail_audit_entries(audit_path, 1000, block_size=64)
+    assert len(everything) == 501
+    assert everything[0]["timestamp"] == 0.0
+
+
+def test_audit_follower_handles_partial_lines_truncation_and_rotation(tmp_path):
+    from src.api.audit_pipeline import AuditFollower
+
+    audit_path = tmp_path / "audit.jsonl"
+    audit_path.write_text(json.dumps({"timestamp": 0.0}) + "\n")
+    follower = AuditFollower(audit_path)
+    assert follower.poll() == []
+
+    with audit_path.open("a") as handle:
+        handle.write(json.dumps({"timestamp": 1.0}) + "\n" + '{"timestamp": 2')
+    assert [entry["timestamp"] for entry in follower.poll()] == [1.0]
+    with audit_path.open("a") as handle:
+        handle.write(".0}\n")
+    assert [entry["timestamp"] for entry in follower.poll()] == [2.0]
+
+    audit_path.write_text(json.dumps({"timestamp": 3.0}) + "\n")
+    assert [entry["timestamp"] for entry in follower.poll()] == [3.0]
+    assert follower.truncations == 1
+
+    # Rotate: last writes land in the old file, then a fresh log replaces it
+    with audit_path.open("a") as handle:
+        handle.write(json.dumps({"timestamp": 4.0}) + "\n")
+    audit_path.rename(tmp_path / "audit.jsonl.1")
+    audit_path.write_text(json.dumps({"timestamp": 5.0}) + "\n")
+    (tmp_path / "audit.777.jsonl").write_text(json.dumps({"timestamp": 4.5}) + "\n")
+    assert [entry["timestamp"] for entry in follower.poll()] == [4.0, 4.5, 5.0]
+    assert follower.rotations == 1
+
+    # A shard renamed within the followed set keeps its offset
+    (tmp_path / "audit.777.jsonl").rename(tmp_path / "audit.778.jsonl")
+    assert follower.poll() == []
+    follower.close()
+
+
+def test_signed_payload_cache_invalidated_by_registry_version():
+    client, server = get_client()
+    headers = {"X-API-Key": "tier3_director"}
+    first = client.post("/resolve-awareness", headers=headers, json={"output_id": "output-001"})
+    again = client.post("/resolve-awareness", headers=headers, json={"output_id": "output-001"})
+    assert first.json() == again.json()
+    assert server._signed_entity.cache_info().hits == 1
+
+    server.register_entity(
+        "output-001", {**server.ENTITY_REGISTRY.get("output-001"), "status": "degraded"}
+    )
+    updated = client.post("/resolve-awareness", headers=headers, json={"output_id": "output-001"})
+    payload = updated.json()
+    assert payload["status"] == "degraded"
+    signature = payload.pop("signature")
+    assert signature == server.hmac_sign(payload)
+
+    legion = client.get("/legion-status", headers=headers).json()
+    assert legion["entities"][0]["status"] == "degraded"
+
+
+def test_legion_status_cursor_pagination_and_streaming():
+    client, server = get_client()
+    for index in range(3, 8):
+        server.register_entity(
+            f"output-{index:03d}",
+            {"status": "stable", "builder": "omega-lab", "trace": [], "metadata": {"region": "orion"}},
+        )
+    headers = {"X-API-Key": "tier0_public"}
+
+    first = client.get("/legion-status", headers=headers, params={"limit": 3}).json()
+    assert [entity["output_id"] for entity in first["entities"]] == [
+        "output-001", "output-002", "output-003"
+    ]
+    assert "builder" not in first["entities"][0]
+    second = client.get(
+        "/legion-status", headers=headers, params={"limit": 3, "cursor": first["next_cursor"]}
+    ).json()
+    assert [entity["output_id"] for entity in second["entities"]] == [
+        "output-004", "output-005", "output-006"
+    ]
+
+    server.LEGION_CACHED_PAGE_LIMIT = 0
+    server.LEGION_STREAM_CHUNK = 2
+    streamed = client.get(
+        "/legion-status",
+        headers={"X-API-Key": "tier3_director"},
+        params={"limit": 50, "region": "orion"},
+    ).json()
+    assert streamed["count"] == 6
+    assert streamed["next_cursor"] is None
+    assert streamed["entities"][0]["metadata"] == {"region": "orion", "epoch": "v1"}
+
+
+def test_sqlite_registry_pages_by_tier(tmp_path):
+    from src.api.entity_registry import SQLiteEntityRegistry
+
+    registry = SQLiteEntityRegistry(tmp_path / "registry.sqlite3")
+    registry.put_many(
+        (f"output-{index:03d}", {"status": "stable" if index % 2 else "degraded",
+                                 "builder": "omega-lab", "trace": ["node-a"],
+                                 "metadata": {"region": "orion", "epoch": "v1"}})
+        for index in range(10)
+    )
+    version = registry.version
+    assert registry.count() == 10
+    page = registry.page(1, after="output-004", limit=2, status="stable")
+    assert page == [
+        {"output_id": "output-005", "status": "stable", "builder": "omega-lab"},
+        {"output_id": "output-007", "status": "stable", "builder": "omega-lab"},
+    ]
+    plan = registry._connection().execute(
+        "EXPLAIN QUERY PLAN SELECT output_id, status FROM entities "
+        "WHERE output_id > ? AND status = ? ORDER BY output_id LIMIT ?",
+        ("", "stable", 2),
+    ).fetchall()
+    assert not any("TEMP B-TREE" in row[-1] for row in plan)
+    assert registry.delete("output-005")
+    assert registry.version == version + 1
+    assert registry.get("output-005") is None
+
+
+def test_swarm_websocket_relays_to_other_clients():
+    client, server = get_client()
+    with client.websocket_connect("/ws/swarm") as first, client.websocket_connect("/ws/swarm") as second:
+        first.send_text("pulse")
+        assert second.receive_text() == "pulse"
+        second.send_text("echo")
+        assert first.receive_text() == "echo"
+    assert server.swarm_broadcaster.stats()["frames_broadcast"] == 2
+
+
+def test_swarm_broadcaster_slow_consumer_policies():
+    import asyncio
+
+    from src.api.swarm_broadcast import SwarmBroadcaster
+
+    class StalledSocket:
+        def __init__(self):
+            self.release = asyncio.Event()
+            self.received = []
+            self.close_code = None
+
+        async def send(self, message):
+            await self.release.wait()
+            self.received.append(message["text"])
+
+        async def close(self, code=1000):
+            self.close_code = code
+
+    async def scenario(policy):
+        broadcaster = SwarmBroadcaster(queue_size=2, policy=policy)
+        socket = StalledSocket()
+        channel = broadcaster.connect(socket)
+        await asyncio.sleep(0)
+        for index in range(5):
+            broadcaster.broadcast(f"frame-{index}")
+        await asyncio.sleep(0)
+        socket.release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        await broadcaster.disconnect(channel)
+        return broadcaster, socket
+
+    broadcaster, socket = asyncio.run(scenario("drop"))
+    assert socket.received == ["frame-0", "frame-1"]
+    assert broadcaster.stats()["frames_dropped"] == 3
+
+    broadcaster, socket = asyncio.run(scenario("coalesce"))
+    assert socket.received == ["frame-3", "frame-4"]
+    assert broadcaster.stats()["frames_coalesced"] == 3
+
+    broadcaster, socket = asyncio.run(scenario("disconnect"))
+    assert socket.close_code == 1013
+    assert broadcaster.stats()["slow_disconnects"] == 1
+
+
+def test_tier_map_reloads_on_manifest_change(tmp_path):
+    from src.api.tier_map import TierMap
+
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"api_keys": {"alpha": {"tier": 1}}}))
+    tiers = TierMap(manifest, check_interval=0)
+    assert tiers.get("alpha") == 1
+
+    manifest.write_text(json.dumps({"api_keys": {"alpha": {"tier": 3}, "beta": {"tier": 0}}}))
+    os.utime(manifest, ns=(0, manifest.stat().st_mtime_ns + 1_000_000))
+    assert tiers.get("alpha") == 3
+    assert "beta" in tiers
+
+    manifest.write_text("{not json")
+    os.utime(manifest, ns=(0, manifest.stat().st_mtime_ns + 1_000_000))
+    assert tiers.get("alpha") == 3
+    assert tiers.last_error
+
+
+def _hit_shared_limit(uri):
+    from limits import RateLimitItemPerMinute
+    from limits.storage import storage_from_string
+    from limits.strategies import FixedWindowRateLimiter
+
+    import src.api.rate_limit_storage  # noqa: F401
+
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    item = RateLimitItemPerMinute(50)
+    return sum(limiter.hit(item, "tier1_builder") for _ in range(30))
+
+
+def test_sqlite_rate_limit_storage_is_exact_across_processes(tmp_path):
+    import multiprocessing
+
+    uri = f"sqlite:///{tmp_path}/rate_limits.sqlite3"
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        admitted = pool.map(_hit_shared_limit, [uri] * 4)
+    assert sum(admitted) == 50
@@ -0,0 +1,88 @@
+import hashlib
+import json
+from datetime import datetime
+from enum import IntEnum
+
+import pytest
+
+from quantum import (
+    HASH_GIL_RELEASE_BYTES,
+    SUPPORTED_ALGORITHMS,
+    ThreatFingerprint,
+    compute_fingerprint,
+    fingerprint_many,
+)
+
+
+class Level(IntEnum):
+    HIGH = 3
+
+
+def _reference_post(features, algorithm):
+    result = {}
+    for key in sorted(features.keys()):
+        value = features[key]
+        if isinstance(value, float):
+            result[key] = round(value, 6)
+        elif isinstance(value, (list, tuple)):
+            result[key] = [round(v, 6) if isinstance(v, float) else v for v in value]
+        else:
+            result[key] = value
+    data = json.dumps(result, sort_keys=True).encode()
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+def _reference_fingerprint(data, algorithm):
+    if isinstance(data, (dict, list)):
+        serialized = json.dumps(data, sort_keys=True, default=str)
+    else:
+        serialized = str(data)
+    return hashlib.new(algorithm, serialized.encode()).hexdigest()
+
+
+POSTS = [
+    {},
+    {"duration": 12.3456789, "src_bytes": 512.0, "dst_bytes": 100, "logged_in": True},
+    {"flags": [0.1234567, 1, 2.5, None, "x"], "pair": (1.0000004, 2), "name": "post-ü"},
+    {"nested": {"b": 1.23456789, "a": [0.1111111]}, "grid": [[0.1234567]], "level": Level.HIGH},
+    {"nan": float("nan"), "inf": float("inf"), "neg": -0.0, "tiny": 1.5e-07, "huge": 1e300},
+]
+
+ITEMS = [
+    "referral-agent-1234.5678",
+    12345,
+    None,
+    {"b": 1, "a": [1.5, "two", {"z": None, "y": datetime(2024, 1, 2)}]},
+    [3, 2, 1, {"k": "ü"}],
+    {"payload": "x" * (HASH_GIL_RELEASE_BYTES * 2)},
+]
+
+
+@pytest.mark.parametrize("algorithm", sorted(SUPPORTED_ALGORITHMS))
+def test_post_fingerprints_match_reference(algorithm):
+    fingerprinter = ThreatFingerprint(algorithm)
+    expected = [_reference_post(post, algorithm) for post in POSTS]
+    assert [fingerprinter.compute_post_fingerprint(post) for post in POSTS] == expected
+    assert fingerprinter.compute_post_fingerprints(POSTS, max_workers=4) == expected
+
+
+@pytest.mark.parametrize("algorithm", sorted(SUPPORTED_ALGORITHMS))
+def test_compute_fingerprint_matches_reference(algorithm):
+    expected = [_reference_fingerprint(item, algorithm) for item in ITEMS]
+    assert [compute_fingerprint(item, algorithm) for item in ITEMS] == expected
+    assert fingerprint_many(ITEMS, algorithm) == expected
+    assert fingerprint_many(ITEMS * 3, algorithm, max_workers=4) == expected * 3
+
+
+def test_fingerprints_reject_unsupported_algorithms():
+    with pytest.raises(ValueError):
+        compute_fingerprint("data", "md5")
+    with pytest.raises(ValueError):
+        fingerprint_many(["data"], "sha1")
+    with pytest.raises(ValueError):
+        ThreatFingerprint("md5")
+
+
+def test_post_fingerprint_rejects_mixed_key_types():
+    with pytest.raises(TypeError):
+        ThreatFingerprint().compute_post_fingerprint({"a": 1, 2: 3})
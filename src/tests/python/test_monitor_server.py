@@ -0,0 +1,75 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from fastapi.testclient import TestClient
+
+from tools import monitor_server
+
+
+def test_audit_tail_endpoint_returns_latest_entries(tmp_path, monkeypatch):
+    audit_path = tmp_path / "audit.jsonl"
+    audit_path.write_text("".join(json.dumps({"timestamp": float(i)}) + "\n" for i in range(50)))
+    monkeypatch.setattr(monitor_server, "AUDIT_LOG_PATH", audit_path)
+
+    response = TestClient(monitor_server.app).get("/audit-tail", params={"n": 3})
+    assert [entry["timestamp"] for entry in response.json()] == [47.0, 48.0, 49.0]
+
+
+def test_audit_stream_hub_shares_one_follower(tmp_path):
+    audit_path = tmp_path / "audit.jsonl"
+    audit_path.write_text(json.dumps({"timestamp": 0.0}) + "\n")
+    hub = monitor_server.AuditStreamHub(audit_path, poll_interval=0.01, queue_size=2)
+
+    async def scenario():
+        first = hub.subscribe()
+        second = hub.subscribe()
+        task = hub._task
+        await asyncio.sleep(0.05)
+        with audit_path.open("a") as handle:
+            handle.write("".join(json.dumps({"timestamp": float(i)}) + "\n" for i in range(1, 4)))
+        await asyncio.wait_for(first.get(), 2)
+        # Each bounded queue kept the newest two of the three new entries
+        assert [second.get_nowait()["timestamp"] for _ in range(2)] == [2.0, 3.0]
+        assert hub.dropped == 2
+
+        hub.unsubscribe(first)
+        assert hub._task is task and not task.done()
+        hub.unsubscribe(second)
+        await asyncio.sleep(0)
+        assert hub._task is None and task.cancelled()
+
+    asyncio.run(scenario())
+
+
+class _ConnectedRequest:
+    async def is_disconnected(self):
+        return False
+
+
+def test_audit_stream_endpoint_streams_events(tmp_path, monkeypatch):
+    audit_path = tmp_path / "audit.jsonl"
+    audit_path.write_text("")
+    hub = monitor_server.AuditStreamHub(audit_path, poll_interval=0.01, queue_size=10)
+    monkeypatch.setattr(monitor_server, "audit_stream_hub", hub)
+
+    async def scenario():
+        response = await monitor_server.audit_stream(_ConnectedRequest())
+        assert response.media_type == "text/event-stream"
+        events = response.body_iterator
+        assert await events.__anext__() == "retry: 2000\n\n"
+        await asyncio.sleep(0.05)
+        audit_path.write_text(json.dumps({"timestamp": 1.0, "endpoint": "/legion-status"}) + "\n")
+        chunk = await asyncio.wait_for(events.__anext__(), 2)
+        await events.aclose()
+        return chunk
+
+    chunk = asyncio.run(scenario())
+    assert chunk.startswith("data: ") and chunk.endswith("\n\n")
+    assert json.loads(chunk[len("data: "):])["endpoint"] == "/legion-status"
+    assert not hub.subscribers
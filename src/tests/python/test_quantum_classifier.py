@@ -0,0 +1,86 @@
+import random
+
+import numpy as np
+import pytest
+
+import demo
+from demo import (
+    compute_metrics,
+    compute_metrics_array,
+    generate_sample_data,
+    normalize_features,
+    normalize_features_array,
+    simple_quantum_classifier,
+)
+
+from quantum import QuantumKNNClassifier, quantum_kernel_estimation, quantum_kernel_matrix
+
+
+@pytest.mark.parametrize("feature_dimension,reps,width", [(10, 2, 10), (3, 1, 3), (4, 2, 6)])
+def test_quantum_kernel_matrix_matches_estimation(feature_dimension, reps, width):
+    rng = random.Random(5)
+    rows_a = [[rng.random() for _ in range(width)] for _ in range(6)]
+    rows_b = [[rng.random() for _ in range(width)] for _ in range(7)]
+    kernel = quantum_kernel_matrix(rows_a, rows_b, feature_dimension=feature_dimension, reps=reps)
+    expected = [
+        [quantum_kernel_estimation(a, b, feature_dimension, reps) for b in rows_b]
+        for a in rows_a
+    ]
+    assert np.allclose(kernel, expected, atol=1e-12)
+
+
+def _normalized_split(seed=3):
+    random.seed(seed)
+    X_train, y_train = generate_sample_data(n_samples=120, attack_ratio=0.3)
+    X_test, y_test = generate_sample_data(n_samples=40, attack_ratio=0.3)
+    X_train_norm, mins, maxs = normalize_features(X_train)
+    X_test_norm, _, _ = normalize_features(X_test, mins, maxs)
+    return X_train_norm, y_train, X_test_norm, y_test
+
+
+def test_classifier_matches_reference_loop(monkeypatch):
+    X_train, y_train, X_test, _ = _normalized_split()
+    fast = simple_quantum_classifier(X_train, y_train, X_test, k_neighbors=3)
+    monkeypatch.setattr(demo, "NUMPY_AVAILABLE", False)
+    reference = simple_quantum_classifier(X_train, y_train, X_test, k_neighbors=3)
+    assert fast == reference
+
+
+def test_classifier_blocks_and_workers_agree():
+    X_train, y_train, X_test, _ = _normalized_split()
+    baseline = QuantumKNNClassifier(k_neighbors=5).fit(X_train, y_train)
+    blocked = QuantumKNNClassifier(k_neighbors=5, block_elements=500, n_jobs=2).fit(X_train, y_train)
+
+    indices, kernels = baseline.kneighbors(X_test)
+    blocked_indices, _ = blocked.kneighbors(X_test)
+    assert np.array_equal(indices, blocked_indices)
+    assert np.all(np.diff(kernels, axis=1) <= 0)
+
+    proba = baseline.predict_proba(X_test)
+    assert proba.shape == (len(X_test), 2)
+    assert np.allclose(proba.sum(axis=1), 1.0)
+    assert np.array_equal(baseline.predict(X_test), blocked.predict(X_test))
+
+    with blocked.worker_pool() as pool:
+        for start in (0, 20):
+            pooled_indices, _ = blocked.kneighbors(X_test[start:start + 20], pool=pool)
+            assert np.array_equal(pooled_indices, indices[start:start + 20])
+
+
+def test_classifier_clamps_k_to_training_size():
+    classifier = QuantumKNNClassifier(k_neighbors=10).fit([[0.1, 0.2], [0.9, 0.8]], [0, 1])
+    indices, _ = classifier.kneighbors([[0.85, 0.8]])
+    assert indices.tolist() == [[1, 0]]
+    assert classifier.predict([[0.85, 0.8]]).tolist() == [0]
+
+
+def test_vectorised_helpers_match_list_versions():
+    X_train, y_train, X_test, y_test = _normalized_split()
+    raw = [[1.0, 5.0, 2.0], [3.0, 5.0, 4.0], [2.0, 5.0, 8.0]]
+    expected, mins, maxs = normalize_features(raw)
+    normalized, array_mins, array_maxs = normalize_features_array(raw)
+    assert np.allclose(normalized, expected)
+    assert array_mins.tolist() == mins and array_maxs.tolist() == maxs
+
+    y_pred = simple_quantum_classifier(X_train, y_train, X_test)
+    assert compute_metrics_array(y_test, y_pred) == compute_metrics(y_test, y_pred)
@@ -0,0 +1,143 @@
+import io
+import json
+import random
+import time
+
+import numpy as np
+import pytest
+
+from demo import FEATURE_NAMES, generate_sample_data, normalize_features, simple_quantum_classifier
+from quantum import ThreatFingerprint
+from threat_pipeline import (
+    BoundedSink,
+    FingerprintRollup,
+    NormalizationState,
+    ThreatStreamPipeline,
+    read_records,
+)
+
+
+def _reference(seed=11, n=150):
+    random.seed(seed)
+    return generate_sample_data(n_samples=n, attack_ratio=0.3)
+
+
+def _jsonl(rows):
+    lines = [
+        json.dumps({"id": i, "account": f"a{i % 4}", "domain": f"d{i % 2}", "features": row})
+        for i, row in enumerate(rows)
+    ]
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+def test_read_records_chunks_jsonl_and_csv():
+    chunks = list(read_records(io.StringIO('{"a": 1}\n\n{"a": 2}\n{"a": 3}\n'), fmt="jsonl", chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+
+    counters = {}
+    chunks = list(read_records(io.StringIO('{"a": 1}\n{"a": \n{"a": 3}\n'), fmt="jsonl", counters=counters))
+    assert [record["a"] for record in chunks[0]] == [1, 3]
+    assert counters == {"malformed": 1}
+
+    csv_text = ",".join(FEATURE_NAMES) + ",account\n" + ",".join(["1"] * 10) + ",acct\n"
+    (chunk,) = list(read_records(io.StringIO(csv_text), fmt="csv"))
+    assert chunk[0]["duration"] == "1" and chunk[0]["account"] == "acct"
+
+
+def test_normalization_state_persists(tmp_path):
+    X, _ = _reference()
+    path = tmp_path / "state.json"
+    state = NormalizationState.load_or_fit(path, X, FEATURE_NAMES)
+    expected, _, _ = normalize_features(X)
+    assert np.allclose(state.apply(X), expected)
+
+    reloaded = NormalizationState.load_or_fit(path, [[0.0] * 10, [1.0] * 10], FEATURE_NAMES)
+    assert np.array_equal(reloaded.mins, state.mins)
+    assert np.array_equal(reloaded.maxs, state.maxs)
+
+
+def test_pipeline_scores_and_rolls_up_records():
+    X, y = _reference()
+    random.seed(12)
+    stream_rows, _ = generate_sample_data(n_samples=40, attack_ratio=0.3)
+
+    written = []
+    pipeline = ThreatStreamPipeline(X, y)
+    stats = pipeline.run(_jsonl(stream_rows), BoundedSink(written.extend, capacity=2), chunk_size=7)
+    assert stats["records"] == 40
+    assert [record["id"] for record in written] == list(range(40))
+
+    X_norm, mins, maxs = normalize_features(X)
+    stream_norm, _, _ = normalize_features(stream_rows, mins, maxs)
+    expected = simple_quantum_classifier(X_norm, y, stream_norm, k_neighbors=3)
+    assert [record["label"] for record in written] == expected
+
+    fingerprinter = ThreatFingerprint()
+    assert written[0]["fingerprint"] == fingerprinter.compute_post_fingerprint(
+        dict(zip(FEATURE_NAMES, stream_rows[0]))
+    )
+    posts = [record["fingerprint"] for record in written if record["account"] == "a1"]
+    assert pipeline.rollup.account_fingerprint("a1") == fingerprinter.compute_account_fingerprint(posts)
+    assert pipeline.rollup.domain_fingerprint("d1") == fingerprinter.compute_domain_fingerprint(
+        [pipeline.rollup.account_fingerprint("a1"), pipeline.rollup.account_fingerprint("a3")]
+    )
+
+
+def test_pipeline_pads_short_rows_and_reuses_one_pool(monkeypatch):
+    X, y = _reference()
+    random.seed(13)
+    stream_rows, _ = generate_sample_data(n_samples=20, attack_ratio=0.3)
+    stream = io.StringIO(_jsonl(stream_rows[:-1] + [stream_rows[-1][:4]]).getvalue() + "not json\n")
+
+    pipeline = ThreatStreamPipeline(X, y, n_jobs=2)
+    opened = []
+    worker_pool = pipeline.classifier.worker_pool
+    monkeypatch.setattr(pipeline.classifier, "worker_pool", lambda: opened.append(1) or worker_pool())
+    written = []
+    stats = pipeline.run(stream, BoundedSink(written.extend), chunk_size=6)
+    assert stats["records"] == 20 and stats["malformed"] == 1
+    assert len(opened) == 1
+
+    padded = stream_rows[-1][:4] + [0.0] * 6
+    assert written[-1]["fingerprint"] == ThreatFingerprint().compute_post_fingerprint(
+        dict(zip(FEATURE_NAMES, padded))
+    )
+    inline = []
+    ThreatStreamPipeline(X, y).run(_jsonl(stream_rows[:-1] + [stream_rows[-1][:4]]), BoundedSink(inline.extend))
+    assert [record["label"] for record in written] == [record["label"] for record in inline]
+
+
+def test_bounded_sink_applies_backpressure():
+    written = []
+
+    def slow_writer(chunk):
+        time.sleep(0.02)
+        written.extend(chunk)
+
+    sink = BoundedSink(slow_writer, capacity=1)
+    for index in range(6):
+        sink.put([index])
+    sink.close()
+    assert written == list(range(6))
+    assert sink.stats()["blocked_puts"] > 0
+    assert sink.stats()["max_pending"] <= 1
+
+
+def test_bounded_sink_surfaces_writer_errors():
+    def failing_writer(chunk):
+        raise OSError("disk full")
+
+    sink = BoundedSink(failing_writer, capacity=1)
+    sink.put([1])
+    with pytest.raises(RuntimeError):
+        sink.close()
+
+
+def test_rollup_evicts_least_recent_accounts():
+    rollup = FingerprintRollup(ThreatFingerprint(), window_size=2, max_accounts=2)
+    rollup.add("a", "d", "f1")
+    rollup.add("b", "d", "f2")
+    rollup.add("a", "d", "f3")
+    rollup.add("c", "e", "f4")
+    assert rollup.account_fingerprint("b") is None
+    assert rollup.stats() == {"accounts": 2, "domains": 2, "evicted_accounts": 1}
@@ -60,10 +60,7 @@ async def test_mass_replication():
     print("Without cleanup, this would consume excessive memory.\n")
 
     # Reset mass replication for test
-    mass_replication.entity_registry = {}
-    mass_replication.generation_tree = {}
-    mass_replication.total_entities = 0
-    mass_replication._entities_since_cleanup = 0
+    mass_replication.reset()
 
     # Create many entities
     result = await mass_replication.replicate_to_sacred_number(
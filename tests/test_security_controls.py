@@ -6,6 +6,8 @@ and special agent behavior detection/handling.
 """
 
 import os
+from contextlib import contextmanager
+
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi import HTTPException
@@ -23,6 +25,17 @@ from src.api.security_controls import (
 )
 
 
+@contextmanager
+def policy_env(values):
+    """Patch the environment and reload the cached behavior policy."""
+    try:
+        with patch.dict(os.environ, values):
+            AgentBehaviorControl.reload_policy()
+            yield
+    finally:
+        AgentBehaviorControl.reload_policy()
+
+
 class TestEnvironmentDetection:
     """Test environment mode detection"""
     
@@ -92,37 +105,37 @@ class TestBehaviorBlocking:
     
     def test_handoff_blocked_in_production(self):
         """Test handoff is blocked in production by default"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "true", "ALLOW_AGENT_HANDOFF": "false"}):
+        with policy_env({"PRODUCTION_MODE": "true", "ALLOW_AGENT_HANDOFF": "false"}):
             assert AgentBehaviorControl.should_block_behavior("handoff") is True
     
     def test_handoff_allowed_with_flag(self):
         """Test handoff is allowed when flag is set"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "true", "ALLOW_AGENT_HANDOFF": "true"}):
+        with policy_env({"PRODUCTION_MODE": "true", "ALLOW_AGENT_HANDOFF": "true"}):
             assert AgentBehaviorControl.should_block_behavior("handoff") is False
     
     def test_handoff_allowed_in_dev(self):
         """Test handoff is always allowed in development"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "false"}):
+        with policy_env({"PRODUCTION_MODE": "false"}):
             assert AgentBehaviorControl.should_block_behavior("handoff") is False
     
     def test_system_info_always_blocked_in_production(self):
         """Test system info is always blocked in production"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "true"}):
+        with policy_env({"PRODUCTION_MODE": "true"}):
             assert AgentBehaviorControl.should_block_behavior("system_info") is True
     
     def test_system_info_allowed_in_dev(self):
         """Test system info is allowed in development"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "false"}):
+        with policy_env({"PRODUCTION_MODE": "false"}):
             assert AgentBehaviorControl.should_block_behavior("system_info") is False
     
     def test_sources_blocked_in_production(self):
         """Test source citation is blocked in production by default"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "true", "ALLOW_SOURCE_CITATION": "false"}):
+        with policy_env({"PRODUCTION_MODE": "true", "ALLOW_SOURCE_CITATION": "false"}):
             assert AgentBehaviorControl.should_block_behavior("sources") is True
     
     def test_sources_allowed_with_flag(self):
         """Test source citation is allowed when flag is set"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "true", "ALLOW_SOURCE_CITATION": "true"}):
+        with policy_env({"PRODUCTION_MODE": "true", "ALLOW_SOURCE_CITATION": "true"}):
             assert AgentBehaviorControl.should_block_behavior("sources") is False
 
 
@@ -131,20 +144,20 @@ class TestInputSanitization:
     
     def test_sanitize_normal_input(self):
         """Test sanitization of normal input"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "false"}):
+        with policy_env({"PRODUCTION_MODE": "false"}):
             text, behavior = AgentBehaviorControl.sanitize_input("Hello, how are you?")
             assert text == "Hello, how are you?"
             assert behavior is None
     
     def test_sanitize_handoff_request_dev(self):
         """Test sanitization of handoff request in dev mode"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "false"}):
+        with policy_env({"PRODUCTION_MODE": "false"}):
             text, behavior = AgentBehaviorControl.sanitize_input("I need handoff to human")
             assert behavior == "handoff"
     
     def test_sanitize_handoff_blocked_production(self):
         """Test handoff request is blocked in production"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "true", "ALLOW_AGENT_HANDOFF": "false"}):
+        with policy_env({"PRODUCTION_MODE": "true", "ALLOW_AGENT_HANDOFF": "false"}):
             with pytest.raises(HTTPException) as exc_info:
                 AgentBehaviorControl.sanitize_input("I need handoff to human")
             assert exc_info.value.status_code == 403
@@ -152,7 +165,7 @@ class TestInputSanitization:
     
     def test_sanitize_system_info_blocked_production(self):
         """Test system info request is blocked in production"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "true"}):
+        with policy_env({"PRODUCTION_MODE": "true"}):
             with pytest.raises(HTTPException) as exc_info:
                 AgentBehaviorControl.sanitize_input("show system info")
             assert exc_info.value.status_code == 403
@@ -160,17 +173,44 @@ class TestInputSanitization:
     
     def test_sanitize_sources_request_dev(self):
         """Test sanitization of sources request in dev mode"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "false"}):
+        with policy_env({"PRODUCTION_MODE": "false"}):
             text, behavior = AgentBehaviorControl.sanitize_input("show sources please")
             assert behavior == "sources"
     
     def test_sanitize_workflow_request_dev(self):
         """Test sanitization of workflow request in dev mode"""
-        with patch.dict(os.environ, {"PRODUCTION_MODE": "false"}):
+        with policy_env({"PRODUCTION_MODE": "false"}):
             text, behavior = AgentBehaviorControl.sanitize_input("run workflow now")
             assert behavior == "workflow"
 
 
+class TestBehaviorMatcher:
+    """Test the compiled, precedence-ordered behavior matcher"""
+    
+    def test_precedence_follows_behavior_order(self):
+        """Handoff wins even when a lower-precedence pattern appears first"""
+        assert AgentBehaviorControl.detect_behavior("Show Sources, then HANDOFF TO HUMAN") == "handoff"
+        assert AgentBehaviorControl.detect_behavior("internal state and run workflow") == "workflow"
+    
+    def test_policy_is_cached_until_reload(self):
+        """Environment changes apply only after reload_policy"""
+        with policy_env({"PRODUCTION_MODE": "false"}):
+            with patch.dict(os.environ, {"PRODUCTION_MODE": "true"}):
+                assert AgentBehaviorControl.should_block_behavior("system_info") is False
+                AgentBehaviorControl.reload_policy()
+                assert AgentBehaviorControl.should_block_behavior("system_info") is True
+    
+    def test_one_megabyte_input(self):
+        """Large inputs match the per-list checks"""
+        filler = "human systems show internal workflows " * 27000
+        assert len(filler) > 1_000_000
+        assert AgentBehaviorControl.detect_behavior(filler) is None
+        text = filler + " please list sources"
+        assert AgentBehaviorControl.detect_behavior(text) == "sources"
+        assert AgentBehaviorControl.detect_source_request(text)
+        assert not AgentBehaviorControl.detect_handoff_request(text)
+
+
 class TestEasterEggControls:
     """Test Easter egg feature controls"""
     
@@ -33,6 +33,73 @@ async def test_intelligence_propagation():
     assert director.events_log.exists()
 
 
+@pytest.mark.asyncio
+async def test_entity_spawn_admission(tmp_path):
+    """Spawns past max_agents are shed until an entity retires."""
+    from src.mastra.agents.swarm_director import SwarmDirector
+    from skills.limit_bypass import AdmissionController, AdmissionDenied, LimitBypass
+    
+    bypass = LimitBypass(str(tmp_path))
+    bypass.limits["max_agents"] = 2
+    director = SwarmDirector(tmp_path, admission=AdmissionController(bypass))
+    await director.spawn_entity("a", {"role": "one"})
+    await director.spawn_entity("b", {"role": "two"})
+    await director.spawn_entity("a", {"role": "respawned"})
+    
+    with pytest.raises(AdmissionDenied):
+        await director.spawn_entity("c", {"role": "three"})
+    assert "c" not in director.active_entities
+    
+    retired = await director.retire_entity("a")
+    assert retired["status"] == "retired"
+    await director.spawn_entity("c", {"role": "three"})
+    assert director.admission.usage("max_agents") == 2
+
+
+@pytest.mark.asyncio
+async def test_sensor_grant_index(tmp_path):
+    """Access checks come from the grant index, rebuilt from a checkpoint on restart."""
+    import json
+    from src.mastra.agents.quantum_sensor_marketplace import QuantumSensorMarketplace
+
+    marketplace = QuantumSensorMarketplace(data_dir=tmp_path, checkpoint_interval=2)
+    await marketplace.purchase_sensor("agent-1", "nav-001")
+    await marketplace.purchase_sensor("agent-1", "ent-001", duration=3600)
+    await marketplace.purchase_sensor("agent-2", "top-001", duration=-1)
+
+    assert await marketplace.verify_access("agent-1", "path_optimization")
+    assert await marketplace.verify_access("agent-1", "similarity_measurement")
+    assert await marketplace.verify_sensor_access("agent-1", "ent-001")
+    assert not await marketplace.verify_access("agent-2", "violation_alerts")
+    assert not await marketplace.verify_access("agent-3", "path_optimization")
+
+    checkpoint = json.loads(marketplace.checkpoint_file.read_text())
+    assert len(checkpoint["grants"]) == 2
+
+    # Another writer appends to the shared log; the next check picks it up
+    other = QuantumSensorMarketplace(data_dir=tmp_path)
+    await other.purchase_sensor("agent-3", "nav-001")
+    assert await marketplace.verify_access("agent-3", "path_optimization")
+
+    restarted = QuantumSensorMarketplace(data_dir=tmp_path)
+    assert restarted._log_offset == marketplace.sales_log.stat().st_size
+    assert await restarted.verify_access("agent-3", "path_optimization")
+    assert await restarted.verify_access("agent-1", "similarity_measurement")
+    assert not await restarted.verify_access("agent-2", "violation_alerts")
+
+    # A replaced log invalidates the checkpoint
+    marketplace.sales_log.write_text("")
+    assert not await QuantumSensorMarketplace(data_dir=tmp_path).verify_access("agent-1", "path_optimization")
+
+    assert [s.sensor_id for s in marketplace.list_sensors(max_price=250.0)] == [
+        s.sensor_id for s in marketplace.sensors.values() if s.price <= 250.0
+    ]
+    assert [s.sensor_id for s in marketplace.list_sensors("measurement", max_price=200.0)] == [
+        s.sensor_id for s in marketplace.sensors.values()
+        if s.category == "measurement" and s.price <= 200.0
+    ]
+
+
 def test_quantum_kernel():
     """Test quantum kernel estimation."""
     from quantum import quantum_kernel_estimation
@@ -0,0 +1,513 @@
+"""
+Quantum Threat Detection System - Streaming Pipeline
+
+This module scores network feature records as they arrive instead of
+loading a whole dataset into memory:
+
+    read_records -> NormalizationState -> ThreatFingerprint -> rollups
+                 -> QuantumKNNClassifier -> BoundedSink
+
+Records are read from JSONL or CSV in fixed-size chunks, normalised with
+min/max state persisted from the reference set, fingerprinted, rolled up
+per account and domain, and scored against the reference set with the
+quantum kernel. Results go to a bounded sink drained by a writer thread;
+when the writer falls behind, the producer blocks (backpressure), so
+memory stays flat however long the stream is.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from demo import FEATURE_NAMES, generate_sample_data
+from quantum import QuantumKNNClassifier, ThreatFingerprint
+
+Source = Union[str, Path, io.TextIOBase]
+
+
+def _open_source(source: Source, fmt: Optional[str]) -> Tuple[Any, str, bool]:
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+        return path.open("r", encoding="utf-8", newline=""), fmt, True
+    return source, fmt or "jsonl", False
+
+
+def read_records(
+    source: Source,
+    fmt: Optional[str] = None,
+    chunk_size: int = 1000,
+    counters: Optional[Dict[str, int]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Read feature records from a JSONL or CSV stream in chunks.
+
+    Malformed JSONL lines are skipped rather than ending the stream.
+
+    Args:
+        source: Path or open text stream
+        fmt: "jsonl" or "csv" (inferred from the file suffix when omitted)
+        chunk_size: Records per yielded chunk
+        counters: Dict whose "malformed" entry counts skipped lines
+
+    Yields:
+        Lists of up to ``chunk_size`` record dicts
+    """
+    handle, fmt, owned = _open_source(source, fmt)
+    try:
+        if fmt == "csv":
+            rows: Iterable[Dict[str, Any]] = csv.DictReader(handle)
+        elif fmt == "jsonl":
+            rows = _iter_jsonl(handle, counters)
+        else:
+            raise ValueError(f"Unsupported record format: {fmt}")
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if owned:
+            handle.close()
+
+
+def _iter_jsonl(handle: Any, counters: Optional[Dict[str, int]]) -> Iterator[Dict[str, Any]]:
+    for line in handle:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            if counters is not None:
+                counters["malformed"] = counters.get("malformed", 0) + 1
+
+
+def _feature_value(value: Any) -> float:
+    if value is None or value == "":
+        return 0.0
+    return float(value)
+
+
+def record_features(record: Dict[str, Any], feature_names: Sequence[str]) -> List[float]:
+    """Feature vector of a record: its ``features`` list or its named columns."""
+    features = record.get("features")
+    if isinstance(features, list):
+        # Missing trailing features count as 0.0, like missing columns
+        values = [_feature_value(value) for value in features[:len(feature_names)]]
+        return values + [0.0] * (len(feature_names) - len(values))
+    return [_feature_value(record.get(name)) for name in feature_names]
+
+
+class NormalizationState:
+    """
+    Min/max scaling state shared by the reference set and the stream.
+
+    Fitted once on the reference features and saved as JSON, so every run
+    (and every worker) scales stream records exactly as the reference set
+    was scaled, like ``normalize_features`` does for test data.
+    """
+
+    def __init__(self, feature_names: Sequence[str], mins: Sequence[float], maxs: Sequence[float]):
+        self.feature_names = list(feature_names)
+        self.mins = np.asarray(mins, dtype=np.float64)
+        self.maxs = np.asarray(maxs, dtype=np.float64)
+        ranges = self.maxs - self.mins
+        self._scale = np.divide(1.0, ranges, out=np.zeros_like(ranges), where=ranges > 0)
+
+    @classmethod
+    def fit(cls, X: Any, feature_names: Sequence[str]) -> "NormalizationState":
+        X = np.asarray(X, dtype=np.float64)
+        return cls(feature_names, X.min(axis=0), X.max(axis=0))
+
+    @classmethod
+    def load(cls, path: Path) -> "NormalizationState":
+        with Path(path).open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        return cls(data["feature_names"], data["mins"], data["maxs"])
+
+    @classmethod
+    def load_or_fit(cls, path: Optional[Path], X: Any, feature_names: Sequence[str]) -> "NormalizationState":
+        """Load persisted state, or fit it on ``X`` and persist it."""
+        if path is not None and Path(path).exists():
+            state = cls.load(path)
+            if state.feature_names == list(feature_names):
+                return state
+        state = cls.fit(X, feature_names)
+        if path is not None:
+            state.save(path)
+        return state
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(path.suffix + ".tmp")
+        with temp.open("w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "feature_names": self.feature_names,
+                    "mins": self.mins.tolist(),
+                    "maxs": self.maxs.tolist(),
+                },
+                handle,
+            )
+        os.replace(temp, path)
+
+    def apply(self, X: Any) -> "np.ndarray":
+        return (np.asarray(X, dtype=np.float64) - self.mins) * self._scale
+
+
+class FingerprintRollup:
+    """
+    Per-account and per-domain fingerprint rollups with bounded memory.
+
+    Each account keeps its last ``window_size`` post fingerprints; accounts
+    are evicted least-recently-seen first beyond ``max_accounts``. Account
+    and domain fingerprints are computed on demand with ``ThreatFingerprint``.
+    """
+
+    def __init__(
+        self,
+        fingerprinter: ThreatFingerprint,
+        window_size: int = 10,
+        max_accounts: int = 100_000,
+    ):
+        self.fingerprinter = fingerprinter
+        self.window_size = window_size
+        self.max_accounts = max_accounts
+        self._posts: "OrderedDict[str, Deque[str]]" = OrderedDict()
+        self._account_domain: Dict[str, str] = {}
+        self._domain_accounts: Dict[str, Dict[str, None]] = {}
+        self.evicted_accounts = 0
+
+    def add(self, account: str, domain: str, post_fingerprint: str) -> None:
+        posts = self._posts.get(account)
+        if posts is None:
+            posts = self._posts[account] = deque(maxlen=self.window_size)
+            if len(self._posts) > self.max_accounts:
+                self._evict()
+        else:
+            self._posts.move_to_end(account)
+        posts.append(post_fingerprint)
+        previous = self._account_domain.get(account)
+        if previous != domain:
+            if previous is not None:
+                self._unlink(account, previous)
+            self._account_domain[account] = domain
+            self._domain_accounts.setdefault(domain, {})[account] = None
+
+    def _unlink(self, account: str, domain: str) -> None:
+        accounts = self._domain_accounts.get(domain)
+        if accounts is not None:
+            accounts.pop(account, None)
+            if not accounts:
+                del self._domain_accounts[domain]
+
+    def _evict(self) -> None:
+        account, _ = self._posts.popitem(last=False)
+        domain = self._account_domain.pop(account, None)
+        if domain is not None:
+            self._unlink(account, domain)
+        self.evicted_accounts += 1
+
+    def account_fingerprint(self, account: str) -> Optional[str]:
+        posts = self._posts.get(account)
+        if not posts:
+            return None
+        return self.fingerprinter.compute_account_fingerprint(list(posts), self.window_size)
+
+    def domain_fingerprint(self, domain: str) -> Optional[str]:
+        accounts = self._domain_accounts.get(domain)
+        if not accounts:
+            return None
+        return self.fingerprinter.compute_domain_fingerprint(
+            [self.account_fingerprint(account) for account in sorted(accounts)]
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "accounts": len(self._posts),
+            "domains": len(self._domain_accounts),
+            "evicted_accounts": self.evicted_accounts,
+        }
+
+
+class BoundedSink:
+    """
+    Fixed-capacity hand-off between the pipeline and a writer thread.
+
+    ``put`` blocks while ``capacity`` chunks are pending, which throttles the
+    producer to the writer's pace instead of buffering without limit.
+    """
+
+    def __init__(self, writer: Callable[[List[Dict[str, Any]]], None], capacity: int = 8):
+        self.writer = writer
+        self.capacity = capacity
+        self._queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(maxsize=capacity)
+        self._thread = threading.Thread(target=self._drain, name="threat-sink", daemon=True)
+        self._error: Optional[BaseException] = None
+        self.chunks_written = 0
+        self.records_written = 0
+        self.blocked_puts = 0
+        self.blocked_seconds = 0.0
+        self.max_pending = 0
+        self._thread.start()
+
+    def put(self, chunk: List[Dict[str, Any]]) -> None:
+        if self._error is not None:
+            raise RuntimeError("Sink writer failed") from self._error
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            started = time.perf_counter()
+            self._queue.put(chunk)
+            self.blocked_puts += 1
+            self.blocked_seconds += time.perf_counter() - started
+        self.max_pending = max(self.max_pending, self._queue.qsize())
+
+    def _drain(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self.writer(chunk)
+            except BaseException as exc:  # surfaced to the producer on the next put/close
+                self._error = exc
+                continue
+            self.chunks_written += 1
+            self.records_written += len(chunk)
+
+    def close(self) -> None:
+        """Flush pending chunks and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Sink writer failed") from self._error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "chunks_written": self.chunks_written,
+            "records_written": self.records_written,
+            "blocked_puts": self.blocked_puts,
+            "blocked_seconds": self.blocked_seconds,
+            "max_pending": self.max_pending,
+        }
+
+
+def jsonl_writer(handle: io.TextIOBase) -> Callable[[List[Dict[str, Any]]], None]:
+    """Sink writer appending each scored record to ``handle`` as a JSON line."""
+    def write(chunk: List[Dict[str, Any]]) -> None:
+        handle.write("".join(json.dumps(record) + "\n" for record in chunk))
+    return write
+
+
+class ThreatStreamPipeline:
+    """Chunked normalise -> fingerprint -> rollup -> score -> sink flow."""
+
+    def __init__(
+        self,
+        reference_X: Any,
+        reference_y: Sequence[int],
+        state: Optional[NormalizationState] = None,
+        feature_names: Sequence[str] = FEATURE_NAMES,
+        k_neighbors: int = 3,
+        fingerprinter: Optional[ThreatFingerprint] = None,
+        rollup: Optional[FingerprintRollup] = None,
+        n_jobs: int = 1,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            reference_X: Raw (unnormalised) reference features
+            reference_y: Reference labels (0=normal, 1=attack)
+            state: Normalisation state (fitted on ``reference_X`` when omitted)
+            feature_names: Feature columns read from each record
+            k_neighbors: Number of neighbors for scoring
+            fingerprinter: Fingerprint generator for posts and rollups
+            rollup: Account/domain rollup store
+            n_jobs: Worker processes used for kernel scoring
+        """
+        self.feature_names = list(feature_names)
+        self.state = state or NormalizationState.fit(reference_X, self.feature_names)
+        self.fingerprinter = fingerprinter or ThreatFingerprint()
+        self.rollup = rollup or FingerprintRollup(self.fingerprinter)
+        self.classifier = QuantumKNNClassifier(
+            k_neighbors=k_neighbors,
+            feature_dimension=len(self.feature_names),
+            n_jobs=n_jobs,
+        ).fit(self.state.apply(reference_X), reference_y)
+        self._reference_attack = np.asarray(reference_y) == 1
+
+    def process_chunk(
+        self,
+        records: List[Dict[str, Any]],
+        offset: int = 0,
+        pool: Optional[ProcessPoolExecutor] = None,
+    ) -> List[Dict[str, Any]]:
+        """Score one chunk of records, optionally on a pool from ``classifier.worker_pool``."""
+        raw = [record_features(record, self.feature_names) for record in records]
+        normalized = self.state.apply(raw)
+        indices, kernels = self.classifier.kneighbors(normalized, pool=pool)
+        # Share of the k nearest reference rows that are attacks
+        scores = self._reference_attack[indices].mean(axis=1) if indices.shape[1] else np.zeros(len(records))
+
+        results = []
+        compute_post = self.fingerprinter.compute_post_fingerprint
+        for position, (record, features) in enumerate(zip(records, raw)):
+            fingerprint = compute_post(dict(zip(self.feature_names, features)))
+            account = str(record.get("account", "unknown"))
+            domain = str(record.get("domain", "unknown"))
+            self.rollup.add(account, domain, fingerprint)
+            score = float(scores[position])
+            results.append({
+                "id": record.get("id", offset + position),
+                "account": account,
+                "domain": domain,
+                "fingerprint": fingerprint,
+                "score": score,
+                "label": 1 if score > 0.5 else 0,
+                "nearest_kernel": float(kernels[position, 0]) if kernels.shape[1] else 0.0,
+            })
+        return results
+
+    def run(
+        self,
+        source: Source,
+        sink: BoundedSink,
+        fmt: Optional[str] = None,
+        chunk_size: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Stream ``source`` through the pipeline into ``sink``.
+
+        With ``n_jobs > 1`` one worker pool, loaded with the reference set
+        once, scores every chunk of the run.
+
+        Returns:
+            Throughput and rollup statistics for the run
+        """
+        records = 0
+        counters: Dict[str, int] = {}
+        started = time.perf_counter()
+        pool = self.classifier.worker_pool() if self.classifier.n_jobs > 1 else None
+        try:
+            for chunk in read_records(source, fmt=fmt, chunk_size=chunk_size, counters=counters):
+                sink.put(self.process_chunk(chunk, offset=records, pool=pool))
+                records += len(chunk)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            sink.close()
+        elapsed = time.perf_counter() - started
+        return {
+            "records": records,
+            "malformed": counters.get("malformed", 0),
+            "seconds": elapsed,
+            "records_per_sec": records / elapsed if elapsed > 0 else 0.0,
+            "rollup": self.rollup.stats(),
+            "sink": sink.stats(),
+        }
+
+
+def _synthetic_stream(n_records: int, seed: int, accounts: int, domains: int) -> io.StringIO:
+    random.seed(seed)
+    X, _ = generate_sample_data(n_samples=n_records, attack_ratio=0.3)
+    rng = random.Random(seed)
+    lines = []
+    for index, features in enumerate(X):
+        account = rng.randrange(accounts)
+        lines.append(json.dumps({
+            "id": index,
+            "account": f"acct-{account}",
+            "domain": f"domain-{account % domains}",
+            "features": features,
+        }))
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+def benchmark(
+    n_records: int = 50_000,
+    n_reference: int = 5_000,
+    chunk_size: int = 1000,
+    sink_capacity: int = 8,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Measure end-to-end records/sec on a synthetic JSONL stream."""
+    random.seed(seed)
+    reference_X, reference_y = generate_sample_data(n_samples=n_reference, attack_ratio=0.3)
+    pipeline = ThreatStreamPipeline(reference_X, reference_y)
+    stream = _synthetic_stream(n_records, seed + 1, accounts=max(1, n_records // 20), domains=50)
+    sink = BoundedSink(jsonl_writer(io.StringIO()), capacity=sink_capacity)
+    return pipeline.run(stream, sink, fmt="jsonl", chunk_size=chunk_size)
+
+
+def _load_reference(path: Path, feature_names: Sequence[str]) -> Tuple[List[List[float]], List[int]]:
+    X, y = [], []
+    for chunk in read_records(path):
+        for record in chunk:
+            X.append(record_features(record, feature_names))
+            y.append(int(_feature_value(record.get("label"))))
+    return X, y
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Stream threat feature records through quantum kernel scoring")
+    parser.add_argument("input", nargs="?", help="JSONL or CSV feature records")
+    parser.add_argument("--reference", help="Labelled reference records (JSONL or CSV with a label column)")
+    parser.add_argument("--state", help="Normalisation state file (created from the reference set if missing)")
+    parser.add_argument("--output", help="Scored JSONL output (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="Input format (default: from suffix)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--sink-capacity", type=int, default=8)
+    parser.add_argument("--k-neighbors", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Benchmark on N synthetic records")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        stats = benchmark(n_records=args.benchmark, chunk_size=args.chunk_size, sink_capacity=args.sink_capacity)
+        print(json.dumps(stats, indent=2))
+        return stats
+    if not args.input or not args.reference:
+        parser.error("input and --reference are required unless --benchmark is given")
+
+    reference_X, reference_y = _load_reference(Path(args.reference), FEATURE_NAMES)
+    state = NormalizationState.load_or_fit(
+        Path(args.state) if args.state else None, reference_X, FEATURE_NAMES
+    )
+    pipeline = ThreatStreamPipeline(
+        reference_X, reference_y, state=state, k_neighbors=args.k_neighbors, n_jobs=args.jobs
+    )
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    try:
+        sink = BoundedSink(jsonl_writer(output or sys.stdout), capacity=args.sink_capacity)
+        stats = pipeline.run(args.input, sink, fmt=args.format, chunk_size=args.chunk_size)
+    finally:
+        if output is not None:
+            output.close()
+    print(json.dumps(stats, indent=2), file=sys.stderr)
+    return stats
+
+
+if __name__ == "__main__":
+    main()
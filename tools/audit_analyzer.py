@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
@@ -14,6 +15,11 @@ from typing import Any, Dict, Iterable, List, Optional, Set
 import httpx
 
 BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.api.audit_pipeline import read_audit_entries
+
 AUDIT_LOG_PATH = BASE_DIR / "src" / "memory" / "audit.jsonl"
 OUT_DIR = BASE_DIR / "tools" / "out"
 
@@ -42,15 +48,8 @@ def _parse_timestamp(value: Any) -> Optional[float]:
 
 def load_audit_entries(path: Path) -> List[AuditEntry]:
     entries: List[AuditEntry] = []
-    if not path.exists():
-        return entries
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if not line.strip():
-            continue
-        try:
-            record = json.loads(line)
-        except json.JSONDecodeError:
-            continue
+    # Main log plus any per-worker shards, merged by timestamp
+    for record in read_audit_entries(path):
         endpoint = record.get("endpoint", "")
         # Load both /resolve-awareness and /legion-status entries for anomaly detection
         if "/resolve-awareness" not in endpoint and "/legion-status" not in endpoint:
@@ -4,21 +4,84 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import os
+import sys
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List, Optional, Set
 
-from fastapi import FastAPI, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 import uvicorn
 
 BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.api.audit_pipeline import AuditFollower, tail_audit_entries
+
 AUDIT_LOG_PATH = BASE_DIR / "src" / "memory" / "audit.jsonl"
 HTML_PATH = BASE_DIR / "tools" / "hermetic_engine.html"
 
+# Seconds between checks of the audit files for /audit-stream
+AUDIT_STREAM_POLL_INTERVAL = float(os.getenv("AUDIT_STREAM_POLL_INTERVAL", "0.5"))
+# Seconds of silence before an SSE keepalive comment is sent
+AUDIT_STREAM_KEEPALIVE = 15.0
+# Entries buffered per subscriber; the oldest are dropped beyond this
+AUDIT_STREAM_QUEUE_SIZE = 1000
+
 app = FastAPI()
 
 
+class AuditStreamHub:
+    """One audit follower task shared by every /audit-stream subscriber."""
+
+    def __init__(self, path: Path, poll_interval: float, queue_size: int):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._follow())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, entries: List[Dict[str, Any]]) -> None:
+        for queue in tuple(self.subscribers):
+            for entry in entries:
+                if queue.full():
+                    # A stalled console loses its oldest entries, not the newest
+                    queue.get_nowait()
+                    self.dropped += 1
+                queue.put_nowait(entry)
+
+    async def _follow(self) -> None:
+        follower = AuditFollower(self.path)
+        try:
+            while True:
+                entries = await asyncio.to_thread(follower.poll)
+                if entries:
+                    self.publish(entries)
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            follower.close()
+
+
+audit_stream_hub = AuditStreamHub(AUDIT_LOG_PATH, AUDIT_STREAM_POLL_INTERVAL, AUDIT_STREAM_QUEUE_SIZE)
+
+
 @app.get("/")
 def serve_console() -> FileResponse:
     return FileResponse(HTML_PATH)
@@ -26,19 +89,37 @@ def serve_console() -> FileResponse:
 
 @app.get("/audit-tail")
 def audit_tail(n: int = Query(200, ge=1, le=1000)) -> JSONResponse:
-    if not AUDIT_LOG_PATH.exists():
-        return JSONResponse(content=[])
-    lines = AUDIT_LOG_PATH.read_text(encoding="utf-8").splitlines()
-    tail = lines[-n:]
-    parsed: List[Any] = []
-    for line in tail:
-        if not line.strip():
-            continue
+    # Reads backwards from the end of the log and each per-worker shard
+    # (AUDIT_SHARD_PER_WORKER), merged by timestamp
+    return JSONResponse(content=tail_audit_entries(AUDIT_LOG_PATH, n))
+
+
+@app.get("/audit-stream")
+async def audit_stream(request: Request) -> StreamingResponse:
+    """Server-sent events: one ``data:`` event per new audit entry."""
+    queue = audit_stream_hub.subscribe()
+
+    async def events():
         try:
-            parsed.append(json.loads(line))
-        except json.JSONDecodeError:
-            continue
-    return JSONResponse(content=parsed)
+            yield "retry: 2000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    entry = await asyncio.wait_for(queue.get(), AUDIT_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                entries = [entry]
+                while not queue.empty():
+                    entries.append(queue.get_nowait())
+                yield "".join(f"data: {json.dumps(item)}\n\n" for item in entries)
+        finally:
+            audit_stream_hub.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 def main() -> int: